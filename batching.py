@@ -0,0 +1,105 @@
+import threading
+
+
+def estimate_row_bytes(rows, sample=16):
+    """Approximate bytes per row on the wire, from the first few rows of a batch"""
+    head = rows[:sample]
+    if not head:
+        return 0
+    return sum(len(str(v)) + 3 for row in head for v in row) / len(head)
+
+
+class BatchController:
+    """Sizes the INSERT statements and transactions for one table.
+
+    Statement size starts at the configured batch size and is then tuned from the
+    measured latency of each statement: it grows while statements finish well under
+    ``target_seconds`` and halves when they run long. It never exceeds the byte budget
+    derived from the server's max_allowed_packet, using a running estimate of the
+    table's row width. Several statements share one transaction, which is committed
+    once ``commit_seconds`` of insert time has accumulated. Pipelined writer
+    threads may report statements concurrently.
+    """
+
+    def __init__(self, rows, max_bytes, target_seconds=0.25, commit_seconds=1.0, min_rows=50, max_rows=50000):
+        self.rows = rows
+        self.max_bytes = max_bytes
+        self.target_seconds = target_seconds
+        self.commit_seconds = commit_seconds
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.row_bytes = None
+        self.latency = None
+        self.pending = 0  # statements since the last commit
+        self._uncommitted = 0.0
+        self._lock = threading.Lock()
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.statements = 0
+        self.commits = 0
+        self.total_rows = 0
+        self.insert_seconds = 0.0
+
+    def sample(self, batch):
+        width = estimate_row_bytes(batch)
+        if width:
+            self.row_bytes = width if self.row_bytes is None else 0.8 * self.row_bytes + 0.2 * width
+
+    def limit(self):
+        """Rows to send in the next statement"""
+        if self.row_bytes:
+            return max(self.min_rows, min(self.rows, int(self.max_bytes // self.row_bytes)))
+        return self.rows
+
+    def observe(self, rows, seconds):
+        with self._lock:
+            self._observe(rows, seconds)
+
+    def _observe(self, rows, seconds):
+        self.statements += 1
+        self.total_rows += rows
+        self.insert_seconds += seconds
+        self.pending += 1
+        self._uncommitted += seconds
+        self.latency = seconds if self.latency is None else 0.8 * self.latency + 0.2 * seconds
+        if rows < self.rows:
+            return  # a short tail batch says nothing about the size limit
+        if seconds < self.target_seconds / 2:
+            self.rows = min(self.max_rows, int(self.rows * 1.5))
+        elif seconds > self.target_seconds * 2:
+            self.rows = max(self.min_rows, self.rows // 2)
+
+    def should_commit(self):
+        return self._uncommitted >= self.commit_seconds
+
+    def committed(self):
+        with self._lock:
+            self.commits += 1
+            self.pending = 0
+            self._uncommitted = 0.0
+
+    def summary(self):
+        return {
+            "statements": self.statements,
+            "commits": self.commits,
+            "rows": self.total_rows,
+            "insert_seconds": self.insert_seconds,
+            "batch_rows": self.limit(),
+            "row_bytes": round(self.row_bytes or 0),
+            "latency_ms": round((self.latency or 0) * 1000, 1),
+        }
+
+
+def merge_summaries(a, b):
+    """Combine the summaries of one table loaded by several workers"""
+    if not a:
+        return dict(b)
+    merged = {k: a[k] + b[k] for k in ("statements", "commits", "rows", "insert_seconds")}
+    merged.update({k: max(a[k], b[k]) for k in ("batch_rows", "row_bytes", "latency_ms")})
+    if "queued" in a or "queued" in b:
+        # Pipelined loads also carry InsertPipeline.summary()
+        for k in ("queued", "queue_depth", "producer_wait", "writer_wait", "pipeline_seconds"):
+            merged[k] = a.get(k, 0) + b.get(k, 0)
+        merged["queue_max"] = max(a.get("queue_max", 0), b.get("queue_max", 0))
+    return merged
@@ -0,0 +1,238 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import wraps
+from importlib import metadata
+
+from batching import estimate_row_bytes
+from columns import to_rows
+from config import DB_CONFIG
+from data_generation import DataGenerator, SchemaManager
+from domains import DOMAINS
+from sinks import NullSink, SQLiteSink
+from specs import compile_builder
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+SINKS = ["null", "sqlite", "mysql"]
+
+# Tables faster than this in the baseline are too noisy to flag on their own
+MIN_SECONDS = 0.1
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MiB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1)
+
+
+class TableMeter:
+    """Time and volume of one table's batches: building the column values, assembling them into tuples"""
+
+    def __init__(self):
+        self.rows = 0
+        self.bytes = 0
+        self.build_seconds = 0.0
+        self.assemble_seconds = 0.0
+        self.peak_rss_mb = None
+
+    def assemble(self, *columns):
+        started = time.perf_counter()
+        rows = to_rows(*columns)
+        self.assemble_seconds += time.perf_counter() - started
+        return rows
+
+    def wrap(self, build):
+        @wraps(build)
+        def timed(*args):
+            started = time.perf_counter()
+            rows = build(*args)
+            self.build_seconds += time.perf_counter() - started
+            self.rows += len(rows)
+            self.bytes += int(estimate_row_bytes(rows) * len(rows))
+            self.peak_rss_mb = peak_rss_mb()
+            return rows
+        return timed
+
+
+def _mysql_generator(domain, rows, seed, pool_size):
+    import mysql.connector
+    database = f"benchmark_{domain}"
+    conn = mysql.connector.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS {database}")
+    cursor.execute(f"CREATE DATABASE {database}")
+    cursor.execute(f"USE {database}")
+    for sql in SchemaManager.get_schema(domain):
+        cursor.execute(sql)
+    cursor.close()
+    return DataGenerator(conn, rows, pool_size=pool_size or None, seed=seed)
+
+
+def run_case(domain, rows, sink, seed=42, pool_size=0):
+    """Generate one domain into one sink and measure it; runs in a fresh process so peak RSS is its own"""
+    scratch = tempfile.TemporaryDirectory()
+    target = None
+    if sink == "mysql":
+        gen = _mysql_generator(domain, rows, seed, pool_size)
+    else:
+        target = NullSink() if sink == "null" else SQLiteSink(os.path.join(scratch.name, f"{domain}.db"),
+                                                                SchemaManager.get_schema(domain))
+        gen = DataGenerator(None, rows, pool_size=pool_size or None, seed=seed, sink=target)
+    meters = {}
+    for table in DOMAINS[domain]:
+        meters[table.name] = meter = TableMeter()
+        gen.builders[table.name] = meter.wrap(compile_builder(table, gen, assemble=meter.assemble))
+    started = time.perf_counter()
+    try:
+        gen.generate(domain)
+        if isinstance(target, SQLiteSink):
+            # Index builds are part of the load
+            target.finish()
+    finally:
+        if gen.conn is not None:
+            gen.conn.close()
+    seconds = time.perf_counter() - started
+    scratch.cleanup()
+    tables = {}
+    for name, span in gen.scheduler.timeline.items():
+        m = meters[name]
+        wall = span["end"] - span["start"]
+        tables[name] = {
+            "rows": m.rows,
+            "seconds": round(wall, 4),
+            "rows_per_s": round(m.rows / wall) if wall else 0,
+            "bytes_per_s": round(m.bytes / wall) if wall else 0,
+            "peak_rss_mb": m.peak_rss_mb,
+            # Value generation, tuple assembly, and everything after the batch is built (keys, driver, sink)
+            "generate_s": round(m.build_seconds - m.assemble_seconds, 4),
+            "assemble_s": round(m.assemble_seconds, 4),
+            "io_s": round(max(wall - m.build_seconds, 0.0), 4),
+        }
+    total_rows = sum(t["rows"] for t in tables.values())
+    total_bytes = sum(m.bytes for m in meters.values())
+    return {
+        "domain": domain, "rows": rows, "sink": sink,
+        "seconds": round(seconds, 4),
+        "total_rows": total_rows,
+        "rows_per_s": round(total_rows / seconds) if seconds else 0,
+        "bytes_per_s": round(total_bytes / seconds) if seconds else 0,
+        "peak_rss_mb": peak_rss_mb(),
+        "tables": tables,
+    }
+
+
+def run_suite(domains, row_counts, sinks, seed=42, pool_size=0, repeat=1):
+    """Run every (domain, rows, sink) case `repeat` times and keep the fastest run of each"""
+    cases = []
+    context = multiprocessing.get_context("spawn")
+    for domain in domains:
+        for rows in row_counts:
+            for sink in sinks:
+                best = None
+                for _ in range(repeat):
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                        try:
+                            result = executor.submit(run_case, domain, rows, sink, seed, pool_size).result()
+                        except Exception as e:
+                            print(f"Skipping {domain}/{rows}/{sink}: {e}")
+                            break
+                    if best is None or result["seconds"] < best["seconds"]:
+                        best = result
+                if best is not None:
+                    print(f"{domain:<12}{rows:>9}  {sink:<7}{best['seconds']:>9.2f}s{best['rows_per_s']:>12} rows/s"
+                          f"{best['bytes_per_s'] / 2 ** 20:>9.1f} MiB/s  peak {best['peak_rss_mb']} MiB")
+                    cases.append(best)
+    return {"meta": environment(seed, pool_size, repeat), "cases": cases}
+
+
+def environment(seed, pool_size, repeat):
+    """What the numbers depend on, so two result files can be checked for comparability"""
+    versions = {}
+    for package in ("numpy", "faker", "mysql-connector-python", "pyarrow"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "packages": versions,
+        "seed": seed,
+        "pool_size": pool_size,
+        "repeat": repeat,
+    }
+
+
+def _case_key(case):
+    return case["domain"], case["rows"], case["sink"]
+
+
+def compare(results, baseline, threshold):
+    """Regressions of rows/s against a baseline result file: (label, old, new) where new < old * (1 - threshold)"""
+    previous = {_case_key(c): c for c in baseline["cases"]}
+    regressions = []
+    for case in results["cases"]:
+        old = previous.get(_case_key(case))
+        if old is None:
+            continue
+        label = "/".join(str(k) for k in _case_key(case))
+        pairs = [(label, old, case)]
+        pairs += [(f"{label}/{name}", old["tables"][name], t) for name, t in case["tables"].items()
+                  if name in old["tables"] and old["tables"][name]["seconds"] >= MIN_SECONDS]
+        for name, before, after in pairs:
+            if after["rows_per_s"] < before["rows_per_s"] * (1 - threshold):
+                regressions.append((name, before["rows_per_s"], after["rows_per_s"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generation and load throughput per domain")
+    parser.add_argument("--domains", nargs="+", default=list(DOMAINS), choices=list(DOMAINS))
+    parser.add_argument("--rows", nargs="+", type=int, default=[1000, 10000])
+    parser.add_argument("--sinks", nargs="+", default=["null", "sqlite"], choices=SINKS,
+                        help="null: generation only; sqlite: a scratch SQLite file (sinks.SQLiteSink); mysql: a scratch "
+                             "benchmark_<domain> database on the server in config.DB_CONFIG")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--pool-size", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case; the fastest one is kept")
+    parser.add_argument("--output", default="benchmark.json", help="Where to write the results")
+    parser.add_argument("--baseline", help="Earlier result file to compare rows/s against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Allowed slowdown against the baseline before a case counts as a regression")
+    args = parser.parse_args()
+
+    results = run_suite(args.domains, args.rows, args.sinks, args.seed, args.pool_size, max(1, args.repeat))
+    with open(args.output, "w") as fh:
+        json.dump(results, fh, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(results, json.load(fh), args.threshold)
+        if not regressions:
+            print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+            return
+        print(f"Regressions beyond {args.threshold:.0%} against {args.baseline}:")
+        for name, old, new in regressions:
+            print(f"  {name:<40}{old:>12} -> {new:>12} rows/s ({new / old - 1:+.0%})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
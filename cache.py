@@ -0,0 +1,205 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from importlib import metadata
+
+import pyarrow.parquet as pq
+
+from config import DATA_GENERATION_CONFIG
+
+# The code that decides generated values; editing any of these files invalidates every entry
+VALUE_MODULES = ("columns.py", "specs.py", "domains.py", "uniques.py", "pools.py", "distributions.py",
+                 "data_generation.py")
+ENTRY_FILE = "entry.json"
+
+
+def generator_version():
+    """Digest of the value-generating source and of the Faker and NumPy releases"""
+    digest = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in VALUE_MODULES:
+        with open(os.path.join(here, name), "rb") as fh:
+            digest.update(fh.read())
+    for package in ("faker", "numpy"):
+        try:
+            digest.update(metadata.version(package).encode())
+        except metadata.PackageNotFoundError:
+            pass
+    return digest.hexdigest()[:16]
+
+
+def dataset_key(domain, rows, seed, schema, pool_size=0, anchor=None, version=None, skew=""):
+    """Content address of a seeded dataset: a hash of everything its rows depend on.
+
+    `anchor` is the run's date anchor; "this year" style columns move with it,
+    so a dataset is only reused on the day it was generated for. `skew` is the
+    run's --skew in distributions.format_skew form.
+    """
+    fields = {"domain": domain, "rows": rows, "seed": seed, "pool_size": pool_size or 0,
+              "anchor": anchor.isoformat() if anchor is not None else None, "skew": skew or "",
+              "schema": list(schema), "version": version or generator_version()}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+
+
+def table_parts(directory, table):
+    return sorted(glob.glob(os.path.join(directory, table, "part-*.parquet")))
+
+
+def table_columns(directory, table):
+    parts = table_parts(directory, table)
+    return pq.read_schema(parts[0]).names if parts else []
+
+
+def table_batches(directory, table, batch_rows=10000):
+    """Row tuples of a stored table, `batch_rows` at a time, as Python values the drivers accept"""
+    for part in table_parts(directory, table):
+        yield from part_batches(part, batch_rows)
+
+
+def part_batches(part, batch_rows=10000):
+    for batch in pq.ParquetFile(part).iter_batches(batch_size=batch_rows):
+        yield list(zip(*[column.to_pylist() for column in batch.columns]))
+
+
+def table_shards(directory, table):
+    """(shard, first key, rows) of each part of a stored table. Parts are the shards of the run that
+    generated it, whose keys start at 1 and run on from part to part."""
+    shards, first = [], 1
+    for part in table_parts(directory, table):
+        rows = pq.ParquetFile(part).metadata.num_rows
+        shards.append((int(os.path.basename(part)[len("part-"):-len(".parquet")]), first, rows))
+        first += rows
+    return shards
+
+
+def read_entry(directory):
+    with open(os.path.join(directory, ENTRY_FILE)) as fh:
+        return json.load(fh)
+
+
+def _size(directory):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(directory) for name in names)
+
+
+class DatasetCache:
+    """Seeded datasets kept on disk as Parquet, one directory per content key.
+
+    Each entry holds ``<table>/part-NNNNN.parquet`` files in the ParquetSink
+    layout and an ``entry.json`` describing them. An entry is written under a
+    temporary name and renamed once complete, so a reader never sees half of
+    one and two runs building the same dataset do not clash. Every use touches
+    ``entry.json``; its mtime orders the least recently used entries, which
+    are evicted first once the cache outgrows ``max_bytes``.
+    """
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = root or DATA_GENERATION_CONFIG["cache_dir"]
+        self.max_bytes = max_bytes if max_bytes is not None else int(DATA_GENERATION_CONFIG["cache_max_gb"] * 2 ** 30)
+
+    def path(self, key):
+        return os.path.join(self.root, key)
+
+    def get(self, key):
+        """The entry's description, marked as just used, or None on a miss"""
+        directory = self.path(key)
+        try:
+            entry = read_entry(directory)
+        except (OSError, ValueError):
+            return None
+        os.utime(os.path.join(directory, ENTRY_FILE))
+        return entry
+
+    def build(self, key, info, fill):
+        """Add an entry; fill(directory) writes its tables there. Returns the entry's description."""
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=self.root)
+        try:
+            fill(staging)
+            tables = {name: sum(pq.ParquetFile(part).metadata.num_rows for part in table_parts(staging, name))
+                      for name in sorted(os.listdir(staging))}
+            entry = {**info, "key": key, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                     "tables": tables, "bytes": _size(staging)}
+            with open(os.path.join(staging, ENTRY_FILE), "w") as fh:
+                json.dump(entry, fh, indent=2)
+            try:
+                os.rename(staging, self.path(key))
+            except OSError:
+                # Another run stored the same dataset first; theirs is identical
+                shutil.rmtree(staging)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.prune(self.max_bytes, keep=key)
+        return self.get(key)
+
+    def entries(self):
+        """Every complete entry, most recently used first, with its `last_used` time"""
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for name in os.listdir(self.root):
+            if name.startswith("."):
+                continue
+            try:
+                entry = read_entry(self.path(name))
+                entry["last_used"] = os.path.getmtime(os.path.join(self.path(name), ENTRY_FILE))
+            except (OSError, ValueError):
+                continue
+            entries.append(entry)
+        return sorted(entries, key=lambda e: e["last_used"], reverse=True)
+
+    def remove(self, key):
+        shutil.rmtree(self.path(key), ignore_errors=True)
+
+    def prune(self, max_bytes=None, older_than=None, keep=None):
+        """Evict the least recently used entries until the cache fits in `max_bytes`, and any unused
+        for `older_than` seconds; `keep` is never evicted. Returns the evicted entries."""
+        removed, total, full = [], 0, False
+        now = time.time()
+        for entry in self.entries():
+            # Once an entry does not fit, every less recently used one goes too
+            full = full or max_bytes is not None and total + entry["bytes"] > max_bytes
+            if entry["key"] != keep and (full or older_than is not None and now - entry["last_used"] > older_than):
+                self.remove(entry["key"])
+                removed.append(entry)
+            else:
+                total += entry["bytes"]
+        return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List and prune the cache of generated datasets")
+    parser.add_argument("--cache-dir", help=f"Cache directory (default {DATA_GENERATION_CONFIG['cache_dir']})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Show the entries, most recently used first")
+    prune = commands.add_parser("prune", help="Evict entries")
+    prune.add_argument("--max-gb", type=float, help="Evict least recently used entries until the cache fits")
+    prune.add_argument("--older-than", type=float, metavar="DAYS", help="Evict entries unused for DAYS")
+    prune.add_argument("--all", action="store_true", help="Empty the cache")
+    args = parser.parse_args()
+
+    cache = DatasetCache(args.cache_dir)
+    if args.command == "list":
+        entries = cache.entries()
+        print(f"{'key':<14}{'domain':<12}{'rows':>10}{'seed':>12}{'pool':>7}{'anchor':>12}{'MiB':>9}  last used")
+        for e in entries:
+            print(f"{e['key'][:12]:<14}{e['domain']:<12}{e['rows']:>10}{e['seed']:>12}{e['pool_size']:>7}"
+                  f"{(e['anchor'] or '')[:10]:>12}{e['bytes'] / 2 ** 20:>9.1f}  "
+                  f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(e['last_used']))}")
+        print(f"{len(entries)} entries, {sum(e['bytes'] for e in entries) / 2 ** 20:.1f} MiB "
+              f"of {cache.max_bytes / 2 ** 20:.0f} MiB in {cache.root}")
+        return
+    if not (args.all or args.max_gb is not None or args.older_than is not None):
+        parser.error("prune needs --max-gb, --older-than or --all")
+    removed = cache.prune(0 if args.all else None if args.max_gb is None else int(args.max_gb * 2 ** 30),
+                          None if args.older_than is None else args.older_than * 86400)
+    print(f"Removed {len(removed)} entries, {sum(e['bytes'] for e in removed) / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
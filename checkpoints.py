@@ -0,0 +1,83 @@
+JOB_DDL = """
+CREATE TABLE IF NOT EXISTS _generation_job (
+    id TINYINT PRIMARY KEY,
+    domain VARCHAR(50),
+    seed BIGINT,
+    row_limit BIGINT,
+    pool_size INT,
+    anchor DATETIME,
+    skew TEXT,
+    status VARCHAR(20),
+    started_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+)
+"""
+
+SHARD_DDL = """
+CREATE TABLE IF NOT EXISTS _generation_shards (
+    table_name VARCHAR(64),
+    shard INT,
+    first_id BIGINT,
+    rows_total BIGINT,
+    rows_done BIGINT DEFAULT 0,
+    PRIMARY KEY (table_name, shard)
+)
+"""
+
+
+class JobManifest:
+    """Progress of a seeded generation job, kept in the target database.
+
+    The job row holds everything that determines the data (seed, row count,
+    pool size, date anchor, skew). Each table shard has a row with its first key and
+    the number of rows committed so far, which is updated inside the same
+    transaction as the rows themselves, so after a crash the manifest matches
+    what is in the tables exactly. Seeded values are a function of the row
+    index, so a resumed run regenerates the rest of each shard from there.
+    """
+
+    def __init__(self, connection):
+        self.conn = connection
+        self.cursor = connection.cursor()
+
+    def create(self):
+        self.cursor.execute(JOB_DDL)
+        self.cursor.execute(SHARD_DDL)
+        # Job tables written before --skew existed lack its column
+        self.cursor.execute("SHOW COLUMNS FROM _generation_job LIKE 'skew'")
+        if not self.cursor.fetchall():
+            self.cursor.execute("ALTER TABLE _generation_job ADD COLUMN skew TEXT AFTER anchor")
+
+    def job(self):
+        self.cursor.execute("SELECT domain, seed, row_limit, pool_size, anchor, skew, status FROM _generation_job WHERE id = 1")
+        row = self.cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip(("domain", "seed", "row_limit", "pool_size", "anchor", "skew", "status"), row))
+
+    def start(self, domain, seed, row_limit, pool_size, anchor, skew=""):
+        """Record a new job; `skew` is its --skew in distributions.format_skew form"""
+        self.cursor.execute("DELETE FROM _generation_shards")
+        self.cursor.execute("REPLACE INTO _generation_job (id, domain, seed, row_limit, pool_size, anchor, skew, status) "
+                            "VALUES (1, %s, %s, %s, %s, %s, %s, 'running')", (domain, seed, row_limit, pool_size, anchor, skew))
+        self.conn.commit()
+
+    def shards(self, table):
+        """{shard: (first_id, rows_done)} for a table, empty if it was never started"""
+        self.cursor.execute("SELECT shard, first_id, rows_done FROM _generation_shards WHERE table_name = %s", (table,))
+        return {shard: (int(first_id), int(done)) for shard, first_id, done in self.cursor.fetchall()}
+
+    def add_shards(self, table, shards):
+        """Record a table's shards as (index, first_id, rows_total) before any of its rows are inserted"""
+        self.cursor.executemany("INSERT INTO _generation_shards (table_name, shard, first_id, rows_total) VALUES (%s, %s, %s, %s)",
+                                [(table, *shard) for shard in shards])
+        self.conn.commit()
+
+    def advance(self, table, shard, rows_done):
+        """Move a shard's checkpoint; the caller commits it together with the rows"""
+        self.cursor.execute("UPDATE _generation_shards SET rows_done = %s WHERE table_name = %s AND shard = %s",
+                            (rows_done, table, shard))
+
+    def finish(self):
+        self.cursor.execute("UPDATE _generation_job SET status = 'done' WHERE id = 1")
+        self.conn.commit()
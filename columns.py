@@ -0,0 +1,187 @@
+import zlib
+import numpy as np
+from datetime import date, datetime
+
+
+def _start_of_year(today):
+    return date(today.year, 1, 1)
+
+
+def _start_of_decade(today):
+    return date(today.year - today.year % 10, 1, 1)
+
+
+def _start_of_century(today):
+    return date(today.year - today.year % 100, 1, 1)
+
+
+class ColumnEngine:
+    """Vectorized column generators backed by a NumPy Generator.
+
+    Every method returns a whole column for ``n`` rows at once. Columns stay
+    as NumPy arrays until ``to_rows`` converts them to Python values and zips
+    them into the row tuples the database driver expects.
+    """
+
+    def __init__(self, seed=None, now=None):
+        self.rng = np.random.default_rng(seed)
+        # Fixed reference time for the "this year/decade" ranges; None follows the clock
+        self.now = now
+
+    def uniform(self, low, high, n, decimals=None):
+        values = self.rng.uniform(low, high, n)
+        return values.round(decimals) if decimals is not None else values
+
+    def normal(self, mean, std, n, low=None, high=None, decimals=None):
+        values = self.rng.normal(mean, std, n)
+        if low is not None or high is not None:
+            values = np.clip(values, low, high)
+        return values.round(decimals) if decimals is not None else values
+
+    def integers(self, low, high, n):
+        """Inclusive on both ends, like ``random.randint``"""
+        return self.rng.integers(low, high, n, endpoint=True)
+
+    def choice(self, values, n):
+        """Uniform picks from a fixed list of categories or parent IDs"""
+        if isinstance(values, range):
+            # Contiguous key range: sample arithmetically, no ID list needed
+            return values.start + self.indexes(len(values), n)
+        pool = values if isinstance(values, np.ndarray) else np.asarray(values, dtype=object)
+        return pool[self.indexes(len(pool), n)]
+
+    def indexes(self, size, n):
+        """Positions in [0, size), for sampling from pools and lists"""
+        return self.rng.integers(0, size, n)
+
+    def skewed(self, values, skew, n):
+        """Picks from categories or parent IDs weighted by a distributions.Skew instead of uniformly"""
+        positions = skew.positions(self, len(values), n)
+        if isinstance(values, range):
+            return values.start + positions
+        pool = values if isinstance(values, np.ndarray) else np.asarray(values, dtype=object)
+        return pool[positions]
+
+    def weighted_indexes(self, table, n):
+        """Positions drawn by the weights of a distributions.AliasTable"""
+        units = self.rng.random((2, n))
+        return table.pick(units[0], units[1])
+
+    def booleans(self, n, p_true=0.5):
+        return self.rng.random(n) < p_true
+
+    def constant(self, value, n):
+        return [value] * n
+
+    def datetimes(self, start, end, n):
+        low = np.datetime64(start, 's').astype(np.int64)
+        high = np.datetime64(end, 's').astype(np.int64)
+        return self.integers(low, high, n).astype('datetime64[s]')
+
+    def dates(self, start, end, n):
+        low = np.datetime64(start, 'D').astype(np.int64)
+        high = np.datetime64(end, 'D').astype(np.int64)
+        return self.integers(low, high, n).astype('datetime64[D]')
+
+    # Vectorized equivalents of the Faker date providers used by the generators
+
+    def _now(self):
+        return self.now if self.now is not None else datetime.now()
+
+    def datetime_this_year(self, n):
+        now = self._now()
+        return self.datetimes(_start_of_year(now.date()), now, n)
+
+    def datetime_this_decade(self, n):
+        now = self._now()
+        return self.datetimes(_start_of_decade(now.date()), now, n)
+
+    def date_this_year(self, n):
+        today = self._now().date()
+        return self.dates(_start_of_year(today), today, n)
+
+    def date_this_decade(self, n):
+        today = self._now().date()
+        return self.dates(_start_of_decade(today), today, n)
+
+    def date_this_century(self, n):
+        today = self._now().date()
+        return self.dates(_start_of_century(today), today, n)
+
+    def date_of_birth(self, n, minimum_age=0, maximum_age=115):
+        today = np.datetime64(self._now().date(), 'D')
+        oldest = today - np.timedelta64(int((maximum_age + 1) * 365.25), 'D') + 1
+        youngest = today - np.timedelta64(int(minimum_age * 365.25), 'D')
+        return self.dates(oldest, youngest, n)
+
+
+class CounterEngine(ColumnEngine):
+    """Random-access columns from a counter-based (Philox) generator.
+
+    Value ``j`` of the ``k``-th column drawn from an engine positioned at row
+    ``start`` is a pure function of ``(key, k, start + j)``: the Philox key is
+    derived from the stream key and column number, and the row index is the
+    counter. Any row range can therefore be regenerated on its own, without
+    the rows before it. Builders must draw their columns in the same order for
+    every batch, and call ``at`` to position a fresh engine per batch.
+    """
+
+    def __init__(self, key, start=0, now=None):
+        super().__init__(now=now)
+        self.key = tuple(zlib.crc32(str(k).encode()) if not isinstance(k, int) else k for k in key)
+        self.start = start
+        self.column = 0
+
+    def at(self, start):
+        return CounterEngine(self.key, start, self.now)
+
+    def _words(self, n):
+        """Four uint64 words per row for the next column"""
+        philox_key = np.random.SeedSequence(self.key[0], spawn_key=self.key[1:] + (self.column,)).generate_state(2, np.uint64)
+        self.column += 1
+        return np.random.Philox(key=philox_key, counter=self.start).random_raw(4 * n).reshape(n, 4)
+
+    def _unit(self, n, word=0):
+        return (self._words(n)[:, word] >> np.uint64(11)) * (1.0 / (1 << 53))
+
+    def uniform(self, low, high, n, decimals=None):
+        values = low + (high - low) * self._unit(n)
+        return values.round(decimals) if decimals is not None else values
+
+    def normal(self, mean, std, n, low=None, high=None, decimals=None):
+        # Box-Muller on two words of the row's block, so each row costs one counter step
+        words = (self._words(n)[:, :2] >> np.uint64(11)) * (1.0 / (1 << 53))
+        values = mean + std * np.sqrt(-2.0 * np.log1p(-words[:, 0])) * np.cos(2 * np.pi * words[:, 1])
+        if low is not None or high is not None:
+            values = np.clip(values, low, high)
+        return values.round(decimals) if decimals is not None else values
+
+    def integers(self, low, high, n):
+        if isinstance(n, tuple):
+            # (k, n) with k <= 4: k values per row, one from each word of the row's block
+            k, n = n
+            units = (self._words(n)[:, :k].T >> np.uint64(11)) * (1.0 / (1 << 53))
+        else:
+            units = self._unit(n)
+        span = int(high) - int(low) + 1
+        return np.minimum((units * span).astype(np.int64), span - 1) + low
+
+    def indexes(self, size, n):
+        return self.integers(0, size - 1, n)
+
+    def weighted_indexes(self, table, n):
+        # Column and coin from two words of the row's block, so each row costs one counter step
+        units = (self._words(n)[:, :2] >> np.uint64(11)) * (1.0 / (1 << 53))
+        return table.pick(units[:, 0], units[:, 1])
+
+    def booleans(self, n, p_true=0.5):
+        return self._unit(n) < p_true
+
+    def seeds(self, n):
+        """Per-row seeds for sequential generators such as Faker"""
+        return self._words(n)[:, 0].tolist()
+
+
+def to_rows(*columns):
+    """Zip columns into row tuples, converting NumPy scalars to Python types"""
+    return list(zip(*[c.tolist() if isinstance(c, np.ndarray) else c for c in columns]))
@@ -15,7 +15,16 @@ DOMAINS = ['ecommerce', 'fintech', 'healthcare', 'education', 'logistics', 'hr']
 DATA_GENERATION_CONFIG = {
     "batch_size": 500,
     "max_rows": 10000,
-    "min_rows": 10
+    "min_rows": 10,
+    # Adaptive INSERT sizing: batch_size is the starting statement size, tuned towards
+    # target_batch_seconds per statement; a transaction is committed every commit_seconds
+    "target_batch_seconds": 0.25,
+    "commit_seconds": 1.0,
+    # Pipelined mode (--writers): statements queued between generation and the writer threads
+    "pipeline_depth": 4,
+    # Seeded datasets kept as Parquet and reused by identical runs (cache.py), least recently used evicted first
+    "cache_dir": os.getenv("DATASET_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "analytics_datasets")),
+    "cache_max_gb": float(os.getenv("DATASET_CACHE_MAX_GB", 10))
 }
 
 STREAMLIT_CONFIG = {
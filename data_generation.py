@@ -1,10 +1,32 @@
 import argparse
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 import mysql.connector
 from mysql.connector import Error
 from faker import Faker
 import random
 import sys
-from datetime import datetime, timedelta
+import time
+import numpy as np
+from datetime import date, datetime, timedelta
+from columns import ColumnEngine, CounterEngine
+from pools import FakerPool
+from uniques import UniqueValues
+from checkpoints import JobManifest
+from cache import DatasetCache, dataset_key, part_batches, read_entry, table_batches, table_columns, table_parts, table_shards
+from sinks import ParquetSink, SQLiteSink
+from batching import BatchController, merge_summaries
+from pipeline import InsertPipeline
+from scheduler import TableScheduler
+from profiling import Profiler
+import streaming
+from specs import Choice, compile_builder
+from distributions import Weights, format_skew, parse_skew
+from domains import DOMAINS, DOMAIN_NAMES
+from config import DATA_GENERATION_CONFIG
+import infile
 
 # Database Configuration
 # In a real production environment, use environment variables for credentials
@@ -16,806 +38,902 @@ DB_CONFIG = {
 
 fake = Faker()
 
+# Target table and column list of the INSERT statements used by DataGenerator
+INSERT_TARGET = re.compile(r"\s*INSERT INTO\s+(\w+)\s*\(([^)]*)\)")
+
 class SchemaManager:
+    """DDL, keys and foreign-key graph of each domain, all derived from the table specs in domains.py"""
+
     @staticmethod
     def get_available_domains():
-        return ['ecommerce', 'fintech', 'healthcare', 'education', 'logistics', 'hr']
+        return list(DOMAINS)
+
+    @staticmethod
+    def get_tables(domain):
+        return DOMAINS.get(domain, [])
+
+    @staticmethod
+    def get_table(domain, name):
+        return next(t for t in SchemaManager.get_tables(domain) if t.name == name)
 
     @staticmethod
     def get_schema(domain):
-        schemas = {
-            'ecommerce': [
-                """CREATE TABLE IF NOT EXISTS categories (
-                    category_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    name VARCHAR(100), 
-                    description TEXT,
-                    slug VARCHAR(150),
-                    is_active BOOLEAN DEFAULT TRUE,
-                    created_at DATETIME,
-                    updated_at DATETIME
-                )""",
-                """CREATE TABLE IF NOT EXISTS products (
-                    product_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    category_id INT, 
-                    sku VARCHAR(50) UNIQUE,
-                    name VARCHAR(255), 
-                    description TEXT,
-                    price DECIMAL(10,2), 
-                    cost_price DECIMAL(10,2), 
-                    currency VARCHAR(10) DEFAULT 'USD',
-                    stock_level INT, 
-                    weight_kg DECIMAL(5,2),
-                    dimensions_cm VARCHAR(100),
-                    vendor_name VARCHAR(150),
-                    is_digital BOOLEAN DEFAULT FALSE,
-                    created_at DATETIME,
-                    FOREIGN KEY (category_id) REFERENCES categories(category_id)
-                )""",
-                """CREATE TABLE IF NOT EXISTS customers (
-                    customer_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    first_name VARCHAR(100), 
-                    last_name VARCHAR(100), 
-                    email VARCHAR(255) UNIQUE, 
-                    phone_number VARCHAR(50),
-                    gender VARCHAR(20),
-                    birth_date DATE,
-                    address_line1 VARCHAR(255),
-                    city VARCHAR(100),
-                    state VARCHAR(100),
-                    postal_code VARCHAR(50),
-                    country VARCHAR(100),
-                    join_date DATETIME, 
-                    last_login DATETIME,
-                    loyalty_tier VARCHAR(50),
-                    marketing_opt_in BOOLEAN
-                )""",
-                """CREATE TABLE IF NOT EXISTS orders (
-                    order_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    customer_id INT, 
-                    order_date DATETIME, 
-                    status VARCHAR(50), 
-                    payment_method VARCHAR(100),
-                    payment_status VARCHAR(50),
-                    subtotal DECIMAL(12,2),
-                    tax_amount DECIMAL(12,2),
-                    shipping_cost DECIMAL(12,2),
-                    discount_amount DECIMAL(12,2),
-                    total_amount DECIMAL(12,2),
-                    shipping_address TEXT, 
-                    billing_address TEXT,
-                    ip_address VARCHAR(50),
-                    user_agent TEXT,
-                    FOREIGN KEY (customer_id) REFERENCES customers(customer_id)
-                )""",
-                """CREATE TABLE IF NOT EXISTS order_items (
-                    item_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    order_id INT, 
-                    product_id INT, 
-                    quantity INT, 
-                    unit_price DECIMAL(10,2), 
-                    total_price DECIMAL(12,2), 
-                    discount_applied DECIMAL(10,2),
-                    return_status VARCHAR(50) DEFAULT 'None',
-                    FOREIGN KEY (order_id) REFERENCES orders(order_id), 
-                    FOREIGN KEY (product_id) REFERENCES products(product_id)
-                )"""
-            ],
-            'fintech': [
-                """CREATE TABLE IF NOT EXISTS branches (
-                    branch_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    branch_code VARCHAR(50) UNIQUE,
-                    name VARCHAR(150), 
-                    address VARCHAR(255),
-                    city VARCHAR(100),
-                    state VARCHAR(100),
-                    zip_code VARCHAR(50),
-                    phone VARCHAR(50),
-                    manager_name VARCHAR(150),
-                    opened_date DATE,
-                    vault_capacity DECIMAL(15,2)
-                )""",
-                """CREATE TABLE IF NOT EXISTS customers (
-                    customer_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    branch_id INT, 
-                    first_name VARCHAR(100), 
-                    last_name VARCHAR(100), 
-                    email VARCHAR(255),
-                    phone VARCHAR(50),
-                    national_id VARCHAR(100) UNIQUE,
-                    dob DATE, 
-                    address VARCHAR(255),
-                    employment_status VARCHAR(100),
-                    annual_income DECIMAL(15,2),
-                    kyc_status VARCHAR(50), 
-                    risk_score INT, 
-                    credit_score INT,
-                    created_at DATETIME,
-                    FOREIGN KEY (branch_id) REFERENCES branches(branch_id)
-                )""",
-                """CREATE TABLE IF NOT EXISTS accounts (
-                    account_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    customer_id INT, 
-                    account_number VARCHAR(50) UNIQUE,
-                    account_type VARCHAR(100), 
-                    currency VARCHAR(10),
-                    balance DECIMAL(15,2), 
-                    overdraft_limit DECIMAL(15,2),
-                    interest_rate DECIMAL(5,2),
-                    open_date DATE, 
-                    status VARCHAR(50), 
-                    last_activity DATETIME,
-                    FOREIGN KEY (customer_id) REFERENCES customers(customer_id)
-                )""",
-                """CREATE TABLE IF NOT EXISTS transactions (
-                    txn_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    account_id INT, 
-                    txn_reference VARCHAR(100) UNIQUE,
-                    txn_type VARCHAR(50), 
-                    category VARCHAR(100),
-                    amount DECIMAL(15,2), 
-                    fee_amount DECIMAL(10,2),
-                    currency VARCHAR(10),
-                    txn_date DATETIME, 
-                    merchant_name VARCHAR(150), 
-                    merchant_city VARCHAR(100),
-                    merchant_country VARCHAR(100),
-                    channel VARCHAR(50),
-                    status VARCHAR(50),
-                    ip_address VARCHAR(50),
-                    device_id VARCHAR(150),
-                    FOREIGN KEY (account_id) REFERENCES accounts(account_id)
-                )"""
-            ],
-            'healthcare': [
-                """CREATE TABLE IF NOT EXISTS departments (
-                    dept_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    name VARCHAR(150), 
-                    floor_number INT,
-                    wing VARCHAR(100),
-                    phone_extension VARCHAR(50),
-                    head_doctor VARCHAR(150),
-                    bed_capacity INT,
-                    is_emergency_unit BOOLEAN
-                )""",
-                """CREATE TABLE IF NOT EXISTS doctors (
-                    doctor_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    dept_id INT, 
-                    first_name VARCHAR(100), 
-                    last_name VARCHAR(100), 
-                    email VARCHAR(255),
-                    phone VARCHAR(50),
-                    license_number VARCHAR(100),
-                    specialty VARCHAR(150), 
-                    qualification VARCHAR(150),
-                    years_experience INT,
-                    consultation_fee DECIMAL(10,2),
-                    join_date DATE, 
-                    is_active BOOLEAN,
-                    FOREIGN KEY (dept_id) REFERENCES departments(dept_id)
-                )""",
-                """CREATE TABLE IF NOT EXISTS patients (
-                    patient_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    first_name VARCHAR(100), 
-                    last_name VARCHAR(100), 
-                    dob DATE, 
-                    gender VARCHAR(20),
-                    blood_group VARCHAR(10), 
-                    height_cm DECIMAL(5,2),
-                    weight_kg DECIMAL(5,2),
-                    allergies TEXT,
-                    chronic_conditions TEXT,
-                    emergency_contact_name VARCHAR(150),
-                    emergency_contact_phone VARCHAR(50),
-                    insurance_provider VARCHAR(150),
-                    insurance_policy_no VARCHAR(100),
-                    address TEXT
-                )""",
-                """CREATE TABLE IF NOT EXISTS appointments (
-                    appt_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    patient_id INT, 
-                    doctor_id INT, 
-                    appt_date DATETIME, 
-                    duration_minutes INT,
-                    type VARCHAR(50), 
-                    status VARCHAR(50), 
-                    reason_for_visit TEXT, 
-                    diagnosis_notes TEXT,
-                    symptoms TEXT,
-                    FOREIGN KEY (patient_id) REFERENCES patients(patient_id), 
-                    FOREIGN KEY (doctor_id) REFERENCES doctors(doctor_id)
-                )"""
-            ],
-            'education': [
-                """CREATE TABLE IF NOT EXISTS departments (
-                    dept_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    name VARCHAR(150), 
-                    code VARCHAR(50),
-                    building_name VARCHAR(150),
-                    office_number VARCHAR(50),
-                    budget DECIMAL(15,2),
-                    start_date DATE,
-                    dean_name VARCHAR(150)
-                )""",
-                """CREATE TABLE IF NOT EXISTS professors (
-                    prof_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    dept_id INT, 
-                    first_name VARCHAR(100),
-                    last_name VARCHAR(100),
-                    email VARCHAR(255),
-                    phone VARCHAR(50),
-                    title VARCHAR(100), 
-                    specialization VARCHAR(150),
-                    salary DECIMAL(10,2),
-                    tenure_status BOOLEAN,
-                    hire_date DATE, 
-                    office_hours TEXT,
-                    FOREIGN KEY (dept_id) REFERENCES departments(dept_id)
-                )""",
-                """CREATE TABLE IF NOT EXISTS students (
-                    student_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    first_name VARCHAR(100), 
-                    last_name VARCHAR(100), 
-                    email VARCHAR(255),
-                    phone VARCHAR(50),
-                    dob DATE,
-                    gender VARCHAR(20),
-                    enrollment_year INT,
-                    major VARCHAR(150),
-                    minor VARCHAR(150),
-                    gpa DECIMAL(3,2),
-                    credits_earned INT,
-                    status VARCHAR(50),
-                    address TEXT
-                )""",
-                """CREATE TABLE IF NOT EXISTS courses (
-                    course_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    dept_id INT, 
-                    prof_id INT, 
-                    code VARCHAR(50),
-                    name VARCHAR(150), 
-                    description TEXT,
-                    credits INT, 
-                    capacity INT,
-                    semester VARCHAR(50),
-                    schedule_days VARCHAR(100),
-                    room_number VARCHAR(50),
-                    FOREIGN KEY (dept_id) REFERENCES departments(dept_id), 
-                    FOREIGN KEY (prof_id) REFERENCES professors(prof_id)
-                )"""
-            ],
-            'logistics': [
-                """CREATE TABLE IF NOT EXISTS warehouses (
-                    warehouse_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    code VARCHAR(50),
-                    name VARCHAR(150),
-                    address VARCHAR(255),
-                    city VARCHAR(100),
-                    country VARCHAR(100),
-                    latitude DECIMAL(10,8),
-                    longitude DECIMAL(11,8),
-                    capacity_sqft INT, 
-                    temperature_controlled BOOLEAN,
-                    manager_name VARCHAR(150),
-                    operating_hours VARCHAR(150)
-                )""",
-                """CREATE TABLE IF NOT EXISTS drivers (
-                    driver_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    first_name VARCHAR(100),
-                    last_name VARCHAR(100),
-                    license_number VARCHAR(100) UNIQUE,
-                    license_expiry DATE,
-                    phone VARCHAR(50),
-                    email VARCHAR(255),
-                    rating DECIMAL(3,2),
-                    total_trips INT,
-                    employment_type VARCHAR(50), 
-                    status VARCHAR(50)
-                )""",
-                """CREATE TABLE IF NOT EXISTS vehicles (
-                    vehicle_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    warehouse_id INT, 
-                    vin VARCHAR(100) UNIQUE,
-                    make VARCHAR(100),
-                    model VARCHAR(100),
-                    year INT,
-                    vehicle_type VARCHAR(100), 
-                    license_plate VARCHAR(50), 
-                    fuel_type VARCHAR(50),
-                    max_load_kg DECIMAL(10,2),
-                    mileage_km DECIMAL(10,2),
-                    last_service_date DATE,
-                    status VARCHAR(50), 
-                    FOREIGN KEY (warehouse_id) REFERENCES warehouses(warehouse_id)
-                )""",
-                """CREATE TABLE IF NOT EXISTS shipments (
-                    shipment_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    warehouse_id INT, 
-                    tracking_number VARCHAR(100) UNIQUE,
-                    sender_name VARCHAR(150),
-                    sender_address TEXT,
-                    recipient_name VARCHAR(150),
-                    recipient_address TEXT,
-                    recipient_phone VARCHAR(50),
-                    weight_kg DECIMAL(10,2), 
-                    volume_m3 DECIMAL(10,2),
-                    cargo_type VARCHAR(100),
-                    priority VARCHAR(50),
-                    status VARCHAR(50), 
-                    create_date DATETIME, 
-                    estimated_delivery DATETIME,
-                    actual_delivery DATETIME,
-                    FOREIGN KEY (warehouse_id) REFERENCES warehouses(warehouse_id)
-                )"""
-            ],
-            'hr': [
-                """CREATE TABLE IF NOT EXISTS departments (
-                    dept_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    name VARCHAR(150), 
-                    description TEXT,
-                    location VARCHAR(150),
-                    cost_center_code VARCHAR(50),
-                    budget_yearly DECIMAL(15,2),
-                    head_count_limit INT,
-                    created_at DATE
-                )""",
-                """CREATE TABLE IF NOT EXISTS jobs (
-                    job_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    title VARCHAR(150), 
-                    job_code VARCHAR(50),
-                    min_salary DECIMAL(10,2), 
-                    max_salary DECIMAL(10,2),
-                    level VARCHAR(50), 
-                    requirements TEXT,
-                    is_remote_allowed BOOLEAN
-                )""",
-                """CREATE TABLE IF NOT EXISTS employees (
-                    emp_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    first_name VARCHAR(100), 
-                    last_name VARCHAR(100), 
-                    email VARCHAR(255) UNIQUE, 
-                    phone VARCHAR(50),
-                    ssn VARCHAR(50),
-                    dob DATE,
-                    gender VARCHAR(20),
-                    marital_status VARCHAR(50),
-                    hire_date DATE, 
-                    dept_id INT, 
-                    job_id INT, 
-                    manager_id INT, 
-                    employment_status VARCHAR(50), 
-                    salary DECIMAL(10,2), 
-                    currency VARCHAR(10),
-                    address TEXT,
-                    FOREIGN KEY (dept_id) REFERENCES departments(dept_id), 
-                    FOREIGN KEY (job_id) REFERENCES jobs(job_id)
-                )""",
-                """CREATE TABLE IF NOT EXISTS attendance (
-                    att_id INT AUTO_INCREMENT PRIMARY KEY, 
-                    emp_id INT, 
-                    date DATE, 
-                    check_in TIME, 
-                    check_out TIME, 
-                    hours_worked DECIMAL(4,2),
-                    status VARCHAR(50), 
-                    location_ip VARCHAR(50),
-                    FOREIGN KEY (emp_id) REFERENCES employees(emp_id)
-                )"""
-            ]
-        }
-        return schemas.get(domain, [])
+        keys = SchemaManager.get_primary_keys(domain)
+        return [table.ddl(keys) for table in SchemaManager.get_tables(domain)]
+
+    @staticmethod
+    def get_primary_keys(domain):
+        """Map each table of a domain to its AUTO_INCREMENT primary key column"""
+        return {table.name: table.pk for table in SchemaManager.get_tables(domain)}
+
+    @staticmethod
+    def check_skew(domain, skew, row_limit=None):
+        """Raise ValueError unless every skewed column is a foreign key or a categorical column of the domain.
+
+        Weights per parent key must match the parent's row count for `row_limit`;
+        without one (appends and streams, where parents grow) they are refused.
+        """
+        tables = {table.name: table for table in SchemaManager.get_tables(domain)}
+        for key, dist in skew.items():
+            table_name, _, column_name = key.partition(".")
+            table = tables.get(table_name)
+            column = next((c for c in table.columns if c.name == column_name), None) if table else None
+            if column is None:
+                raise ValueError(f"{key}: no such {domain} column")
+            if isinstance(column.gen, Choice):
+                try:
+                    dist.over(column.gen.values)
+                except ValueError as e:
+                    raise ValueError(f"{key}: {e}") from None
+            elif column.gen is not None or not column.references:
+                raise ValueError(f"{key} is neither a foreign key nor a categorical column")
+            elif table.fanout and column.parent == table.fanout[0]:
+                raise ValueError(f"{key} follows its parent rows one by one and cannot be skewed")
+            elif isinstance(dist, Weights):
+                if dist.weights is None:
+                    raise ValueError(f"{key}: weights by name only apply to categorical columns")
+                parent = tables[column.parent]
+                if row_limit is None or parent.fanout:
+                    raise ValueError(f"{key}: the number of {parent.name} keys is not known up front; "
+                                     "use zipf or powerlaw instead of weights")
+                keys = parent.row_count(row_limit)
+                if len(dist.weights) != keys:
+                    raise ValueError(f"{key}: {len(dist.weights)} weights for {keys} rows of {parent.name}")
+
+    @staticmethod
+    def get_dependencies(domain):
+        """Map each table of a domain to the set of tables its foreign keys reference"""
+        return {table.name: set(table.parents) - {table.name} for table in SchemaManager.get_tables(domain)}
 
 class DataGenerator:
-    def __init__(self, connection, row_limit):
+    def __init__(self, connection, row_limit, pool_size=None, bulk_load=False, seed=None, workers=1, db_config=None, now=None,
+                 client_keys=False, resumable=False, sink=None, writers=0, table_concurrency=1, profiler=None,
+                 summary=None, skew=None):
         self.conn = connection
-        self.cursor = connection.cursor()
+        # No connection: write tables to a file sink, or plan a virtual dataset whose
+        # rows are computed on demand by rows()
+        self.cursor = connection.cursor() if connection is not None else None
+        self.sink = sink
         self.row_limit = row_limit
-        self.batch_size = 500
+        # Rows per generated batch; also the starting size of each table's INSERT statements
+        self.batch_size = DATA_GENERATION_CONFIG["batch_size"]
+        self.controllers = {}
+        self.batch_stats = {}
+        self._max_bytes = None
+        # Pipelined mode: INSERTs run on `writers` threads while the next statements are generated
+        self.writers = writers
+        # Tables whose foreign-key parents are loaded run concurrently, each on its own connection
+        self.table_concurrency = table_concurrency
+        self.scheduler = None
+        # --profile: a Profiler collecting per table, column, statement, commit and ID query timings
+        self.profiler = profiler
+        # A RunSummary recording row counts, samples and column stats of every batch written in this
+        # process (shards loaded by --workers processes are not recorded)
+        self.summary = summary
+        # --skew: {"table.column": distributions.Skew} for foreign keys and categories not drawn uniformly
+        self.skew = skew or {}
+        self.pool_size = pool_size
+        # Client-side keys: reserve each table's primary key range up front, insert explicit
+        # IDs and sample foreign keys from the reserved ranges instead of scanning parents
+        self.client_keys = client_keys or seed is not None or sink is not None
+        self.key_ranges = {}
+        # With a seed every value is derived from (seed, table, column, row) by a
+        # counter-based generator, so any row range can be generated independently:
+        # shards need no coordination and the data is identical for any --workers.
+        self.seed = seed
+        self.workers = workers
+        self.shard_rows = 10000
+        self.db_config = db_config
+        self.domain = None
+        # Per table: (build, args, ends, first_id), enough to regenerate any row range
+        self.plans = {}
+        # Index of the first row of the table being built among all of its rows (its first key - 1),
+        # so seeded values and UNIQUE columns continue after rows that are already there
+        self.row_base = 0
+        # --append: key ranges added by this run, per table
+        self.added = {}
+        self.builders = {}
+        # Seeded runs can checkpoint each commit to a manifest in the target database
+        self.resumable = resumable and seed is not None and connection is not None
+        self.manifest = JobManifest(connection) if self.resumable else None
+        # Seeded runs anchor "this year"-style date ranges to the start of the day
+        self.now = now or (datetime.combine(date.today(), datetime.min.time()) if seed is not None else None)
+        self.fake = fake if seed is None else Faker()
+        # LOAD DATA LOCAL INFILE instead of executemany; rows per loaded file
+        self.bulk_load = bulk_load
+        self.infile_rows = 50000
+        self._infile_checked = False
+        self.cols = ColumnEngine(now=self.now)
+        # UNIQUE columns encode the row index, so values cannot collide within a run or across shards
+        self.uniques = UniqueValues(seed if seed is not None else np.random.SeedSequence().entropy)
+        # Optional Faker value pools shared by every table in the run
+        self.pool = FakerPool(Faker() if seed is not None else fake, pool_size, seed) if pool_size else None
 
-    def _truncate(self, value, length):
-        """Helper to truncate strings to fit database columns"""
-        if isinstance(value, str) and len(value) > length:
-            return value[:length]
-        return value
+    def _faker_column(self, provider, n, width=None, *args):
+        """Faker values for a whole column, sampled from the shared pool when one is configured"""
+        if self.pool is not None:
+            values = self.pool.values(provider, *args) if width is None else self.pool.truncated(provider, width, *args)
+            return values[self.cols.indexes(len(values), n)]
+        values = self._fake_rows(getattr(self.fake, provider), n, *args)
+        if width is None:
+            return values
+        return [v[:width] for v in values]
 
-    def _batch_insert(self, query, data):
-        if not data: return
-        for i in range(0, len(data), self.batch_size):
-            try:
-                self.cursor.executemany(query, data[i:i + self.batch_size])
+    def _fake_rows(self, make, n, *args):
+        """Call a Faker provider once per row; seeded runs reseed Faker from the row's counter first"""
+        if self.seed is None:
+            return [make(*args) for _ in range(n)]
+        values = []
+        for row_seed in self.cols.seeds(n):
+            self.fake.seed_instance(row_seed)
+            values.append(make(*args))
+        return values
+
+    def _batches(self, start, stop, build, *args, ends=None, base=0):
+        """Yield batches of at most batch_size rows, each built on demand by build(start, n, *args).
+
+        With a seed the counter-based engine is positioned at the batch's first row;
+        `ends` maps units to rows when each unit expands to several rows, and
+        `base` is the number of table rows before unit 0.
+        """
+        self.row_base = base
+        for i in range(start, stop, self.batch_size):
+            if self.seed is not None:
+                self.cols = self.cols.at(base + _row_offset(ends, i))
+            yield build(i, min(self.batch_size, stop - i), *args)
+
+    def _engine(self, *key):
+        """ColumnEngine for a named stream, addressable by row when a seed is set"""
+        if self.seed is None:
+            return self.cols
+        return CounterEngine((self.seed, *key), now=self.now)
+
+    def _seed_table(self, table):
+        self.cols = self._engine(table)
+
+    def _load(self, query, total, build, *args, sizes=None):
+        """Generate `total` units with build(start, n, *args) and insert them.
+
+        A unit is one row, except when `sizes` gives the number of rows each unit
+        expands to (order_items is built per order).
+        """
+        if not self.client_keys:
+            return self._batch_insert(query, self._batches(0, total, build, *args))
+        table = INSERT_TARGET.match(query).group(1)
+        pk = SchemaManager.get_primary_keys(self.domain)[table]
+        query = _with_primary_key(query, pk)
+        rows = total if sizes is None else int(sizes.sum())
+        ends = np.cumsum(sizes, dtype=np.int64) if sizes is not None else None
+        # A resumed table keeps the key range recorded by the run that started it
+        resumed = self.manifest.shards(table) if self.manifest is not None else {}
+        if self.conn is None:
+            # Nothing else allocates keys in a file or virtual dataset, so they start at 1
+            first_id = 1
+            self.key_ranges[table] = range(1, rows + 1)
+        elif resumed:
+            first_id = resumed[0][0]
+            self.key_ranges[table] = range(first_id, first_id + rows)
+        else:
+            first_id = self._reserve_keys(table, pk, rows)
+        self.plans[table] = (build, args, ends, first_id)
+        if self.scheduler is not None:
+            self.scheduler.keyed(table)
+        if self.conn is None:
+            if self.sink is None:
+                return
+            self.sink.prepare(table)
+        layout = []
+        for index, start in enumerate(range(0, total, self.shard_rows)):
+            stop = min(start + self.shard_rows, total)
+            offset = _row_offset(ends, start)
+            layout.append((index, start, stop, first_id + offset, _row_offset(ends, stop) - offset))
+        if self.manifest is not None and not resumed:
+            self.manifest.add_shards(table, [(index, first, size) for index, _, _, first, size in layout])
+        shards = []
+        for index, start, stop, first, size in layout:
+            done = resumed.get(index, (first, 0))[1]
+            if done < size:
+                shards.append((index, start, stop, first, done))
+        if self.workers > 1 and len(shards) > 1:
+            settings = dict(row_limit=self.row_limit, pool_size=self.pool_size, bulk_load=self.bulk_load,
+                            seed=self.seed, db_config=self.db_config, now=self.now, client_keys=True,
+                            resumable=self.resumable, sink=self.sink, writers=self.writers, skew=self.skew)
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(shards)), initializer=_init_worker,
+                                     initargs=(settings, self.domain, query, build.__name__, args, ends,
+                                               self.profiler is not None)) as executor:
+                for stats, timings in executor.map(_run_shard, shards):
+                    self._record_stats(table, stats)
+                    if timings:
+                        self.profiler.merge(timings)
+        else:
+            for shard in shards:
+                self._load_shard(query, build, args, ends, *shard)
+
+    def _load_shard(self, query, build, args, ends, index, start, stop, first_id, done=0):
+        table = INSERT_TARGET.match(query).group(1)
+        if self.seed is not None:
+            self._seed_table(table)
+        # After `done` committed rows, restart at the unit holding the next row and drop its finished rows
+        row = _row_offset(ends, start) + done
+        begin = _unit_at(ends, row)
+        skip = row - _row_offset(ends, begin)
+        base = first_id - _row_offset(ends, start) - 1
+        batches = _number_rows(self._batches(begin, stop, build, *args, ends=ends, base=base), first_id + done - skip)
+        if self.sink is not None:
+            columns = [c.strip() for c in INSERT_TARGET.match(query).group(2).split(',')]
+            self.sink.write(table, index, columns, self._observed(table, columns, _skip_rows(batches, skip)))
+            return None
+        checkpoint = None
+        if self.manifest is not None:
+            checkpoint = lambda rows: self.manifest.advance(table, index, done + rows)
+        return self._batch_insert(query, _skip_rows(batches, skip), checkpoint)
+
+    def _observed(self, table, columns, batches):
+        """`batches`, recorded in the run summary as they pass when there is one"""
+        if self.summary is None:
+            return batches
+        return self.summary.observe(table, columns, batches)
+
+    def rows(self, table, start, stop):
+        """Rows start..stop (0-based, keys included) of a seeded run's table, computed without the rows before them"""
+        build, args, ends, first_id = self.plans[table]
+        # Regenerate the units covering the range, then trim to the requested rows
+        first, last = _unit_at(ends, start), _unit_at(ends, stop - 1) + 1
+        offset = _row_offset(ends, first)
+        self._seed_table(table)
+        result = []
+        for batch in _number_rows(self._batches(first, last, build, *args, ends=ends, base=first_id - 1), first_id + offset):
+            result.extend(batch)
+        return result[start - offset:stop - offset]
+
+    def plan(self, domain):
+        """Lay out a seeded virtual dataset without a database; rows() then pages through it"""
+        self.generate(domain)
+
+    def _reserve_keys(self, table, pk, rows):
+        """Claim the next `rows` primary keys of a table for explicit assignment"""
+        self.cursor.execute(f"SELECT COALESCE(MAX({pk}), 0) + 1 FROM {table}")
+        first_id = int(self.cursor.fetchone()[0])
+        # Move AUTO_INCREMENT past the range so concurrent writers cannot take these keys
+        self.cursor.execute(f"ALTER TABLE {table} AUTO_INCREMENT = {first_id + rows}")
+        self.key_ranges[table] = range(first_id, first_id + rows)
+        return first_id
+
+    def _batch_insert(self, query, batches, checkpoint=None):
+        """Insert batches; checkpoint(rows), when given, runs in each transaction with the rows inserted so far"""
+        started = time.perf_counter()
+        table, columns = INSERT_TARGET.match(query).groups()
+        batches = self._observed(table, [c.strip() for c in columns.split(',')], batches)
+        if self.bulk_load and self._local_infile_allowed(query):
+            self._bulk_load(query, batches, checkpoint)
+            if self.profiler is not None:
+                self.profiler.add("batch_insert", table, time.perf_counter() - started)
+            return None
+        ctl = self._controller(table)
+        statements = self._statements(ctl, batches)
+        if self.writers:
+            stats = self._pipelined_insert(query, ctl, statements, checkpoint)
+        else:
+            inserted = 0
+            for rows in statements:
+                inserted += self._execute_batch(query, rows, ctl, checkpoint)
+                if ctl.should_commit():
+                    self._commit(ctl, checkpoint, inserted, table=table)
+            if ctl.pending:
+                self._commit(ctl, checkpoint, inserted, table=table)
+            stats = ctl.summary()
+        ctl.reset_counters()
+        self._record_stats(table, stats)
+        if self.profiler is not None:
+            self.profiler.add("batch_insert", table, time.perf_counter() - started, stats["rows"])
+        return stats
+
+    def _statements(self, ctl, batches):
+        """Regroup generated batches into statements sized by the controller,
+        so only about one statement's worth of rows is held in memory"""
+        pending = []
+        for batch in batches:
+            if not batch: continue
+            ctl.sample(batch)
+            pending.extend(batch)
+            while len(pending) >= ctl.limit():
+                n = ctl.limit()
+                yield pending[:n]
+                pending = pending[n:]
+        if pending:
+            yield pending
+
+    def _pipelined_insert(self, query, ctl, statements, checkpoint=None):
+        """Generate statements on this thread while writer threads insert the ones already queued"""
+        # A checkpoint counts rows in commit order, which only a single writer keeps
+        writers = self.writers if checkpoint is None and self.db_config else 1
+        table = INSERT_TARGET.match(query).group(1)
+        links = [(self.conn, self.cursor)] + [None] * (writers - 1)
+        inserted = [0] * writers
+        uncommitted = [False] * writers
+
+        def write(slot, rows):
+            if links[slot] is None:
+                conn = mysql.connector.connect(**self.db_config)
+                links[slot] = (conn, conn.cursor())
+            conn, cursor = links[slot]
+            inserted[slot] += self._execute_batch(query, rows, ctl, checkpoint, conn, cursor)
+            uncommitted[slot] = True
+            if ctl.should_commit():
+                self._commit(ctl, checkpoint, inserted[slot], conn, table)
+                uncommitted[slot] = False
+
+        pipe = InsertPipeline(write, writers, DATA_GENERATION_CONFIG.get("pipeline_depth", 4))
+        try:
+            for rows in statements:
+                pipe.put(rows)
+            pipe.close()
+            for slot, link in enumerate(links):
+                if uncommitted[slot]:
+                    self._commit(ctl, checkpoint, inserted[slot], link[0], table)
+        finally:
+            pipe.close()
+            for link in links[1:]:
+                if link is not None:
+                    link[0].close()
+        return {**ctl.summary(), **pipe.summary()}
+
+    def _execute_batch(self, query, rows, ctl, checkpoint=None, conn=None, cursor=None):
+        if conn is None:
+            conn, cursor = self.conn, self.cursor
+        started = time.perf_counter()
+        try:
+            cursor.executemany(query, rows)
+        except Error as e:
+            if checkpoint is not None:
+                # A checkpointed run must not skip rows: stop at the last commit so --resume retries from there
+                conn.rollback()
+                raise
+            print(f"Error inserting batch: {e}")
+            # Important: If batch insert fails, we must continue or exit based on logic
+            # Here we continue, but logging would be appropriate in production.
+            return 0
+        seconds = time.perf_counter() - started
+        ctl.observe(len(rows), seconds)
+        if self.profiler is not None:
+            self.profiler.add("statement", INSERT_TARGET.match(query).group(1), seconds, len(rows))
+        return len(rows)
+
+    def _commit(self, ctl, checkpoint, inserted, conn=None, table=None):
+        if checkpoint is not None:
+            checkpoint(inserted)
+        started = time.perf_counter()
+        (self.conn if conn is None else conn).commit()
+        if self.profiler is not None:
+            self.profiler.add("commit", table, time.perf_counter() - started)
+        ctl.committed()
+
+    def _controller(self, table):
+        if table not in self.controllers:
+            if self._max_bytes is None:
+                self.cursor.execute("SELECT @@max_allowed_packet")
+                # Leave headroom for quoting and escaping added by the driver
+                self._max_bytes = int(self.cursor.fetchone()[0]) // 2
+            self.controllers[table] = BatchController(
+                self.batch_size, self._max_bytes,
+                target_seconds=DATA_GENERATION_CONFIG.get("target_batch_seconds", 0.25),
+                commit_seconds=DATA_GENERATION_CONFIG.get("commit_seconds", 1.0))
+        return self.controllers[table]
+
+    def _record_stats(self, table, stats):
+        if stats:
+            self.batch_stats[table] = merge_summaries(self.batch_stats.get(table), stats)
+
+    def report_batching(self):
+        """Print the statement size and commit policy each table settled on"""
+        if not self.batch_stats:
+            return
+        print(f"{'table':<16}{'rows':>10}{'stmts':>8}{'commits':>9}{'rows/stmt':>11}{'bytes/row':>11}{'ms/stmt':>9}{'rows/s':>10}")
+        for table, s in self.batch_stats.items():
+            rate = s["rows"] / s["insert_seconds"] if s["insert_seconds"] else 0
+            print(f"{table:<16}{s['rows']:>10}{s['statements']:>8}{s['commits']:>9}{s['batch_rows']:>11}"
+                  f"{s['row_bytes']:>11}{s['latency_ms']:>9}{rate:>10.0f}")
+        pipelined = {table: s for table, s in self.batch_stats.items() if s.get("queued")}
+        if not pipelined:
+            return
+        # Producer waits mean the database is the bottleneck, writer waits mean generation is
+        print(f"\n{'table':<16}{'queued':>8}{'avg depth':>11}{'max depth':>11}{'gen wait s':>12}{'write wait s':>14}{'wall s':>9}")
+        for table, s in pipelined.items():
+            print(f"{table:<16}{s['queued']:>8}{s['queue_depth'] / s['queued']:>11.1f}{s['queue_max']:>11}"
+                  f"{s['producer_wait']:>12.2f}{s['writer_wait']:>14.2f}{s['pipeline_seconds']:>9.2f}")
+
+    def _local_infile_allowed(self, query):
+        """Probe once with an empty file; fall back to executemany if the server refuses local infile"""
+        if self._infile_checked:
+            return self.bulk_load
+        self._infile_checked = True
+        table, columns = INSERT_TARGET.match(query).groups()
+        fh = infile.open_tsv()
+        fh.close()
+        try:
+            self.cursor.execute(infile.load_data_sql(fh.name, table, columns))
+        except Error as e:
+            if e.errno in infile.LOCAL_INFILE_REFUSED:
+                print(f"LOAD DATA LOCAL INFILE refused by the server ({e.msg}); falling back to batched INSERTs.")
+            else:
+                print(f"LOAD DATA LOCAL INFILE failed ({e}); falling back to batched INSERTs.")
+            self.bulk_load = False
+        finally:
+            os.remove(fh.name)
+        return self.bulk_load
+
+    def _bulk_load(self, query, batches, checkpoint=None):
+        table, columns = INSERT_TARGET.match(query).groups()
+        fh, rows, loaded = infile.open_tsv(), 0, 0
+        for batch in batches:
+            infile.write_tsv(fh, batch)
+            rows += len(batch)
+            if rows >= self.infile_rows:
+                loaded += rows
+                self._load_file(fh, table, columns, checkpoint, loaded)
+                fh, rows = infile.open_tsv(), 0
+        self._load_file(fh, table, columns, checkpoint, loaded + rows)
+
+    def _load_file(self, fh, table, columns, checkpoint=None, inserted=0):
+        """Load one TSV file in its own transaction; `inserted` counts rows loaded so far including this file"""
+        fh.close()
+        try:
+            if os.path.getsize(fh.name):
+                started = time.perf_counter()
+                self.cursor.execute(infile.load_data_sql(fh.name, table, columns))
+                loaded = time.perf_counter()
+                if checkpoint is not None:
+                    checkpoint(inserted)
                 self.conn.commit()
-            except Error as e:
-                print(f"Error inserting batch: {e}")
-                # Important: If batch insert fails, we must continue or exit based on logic
-                # Here we continue, but logging would be appropriate in production.
+                if self.profiler is not None:
+                    self.profiler.add("statement", table, loaded - started)
+                    self.profiler.add("commit", table, time.perf_counter() - loaded)
+        except Error as e:
+            if checkpoint is not None:
+                self.conn.rollback()
+                raise
+            print(f"Error loading batch file into {table}: {e}")
+        finally:
+            os.remove(fh.name)
+
+    def _keys(self, table, col):
+        """Keys child rows may reference: the reserved range with client-side keys, otherwise a scan"""
+        if self.client_keys:
+            return self.key_ranges.get(table, range(0))
+        return self._get_ids(table, col)
 
     def _get_ids(self, table, col):
-        self.cursor.execute(f"SELECT {col} FROM {table}")
-        result = [x[0] for x in self.cursor.fetchall()]
-        if not result:
+        started = time.perf_counter()
+        self.cursor.execute(f"SELECT {col} FROM {table} ORDER BY {col}")
+        # Stream the IDs into a compact int64 array instead of a list of Python ints
+        chunks = []
+        while True:
+            rows = self.cursor.fetchmany(self.batch_size * 20)
+            if not rows: break
+            chunks.append(np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows)))
+        result = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+        if self.profiler is not None:
+            self.profiler.add("ids", table, time.perf_counter() - started, len(result))
+        if not len(result):
             print(f"Warning: No IDs found in {table}. Subsequent tables might fail.")
         return result
 
+    def _schedule(self, steps):
+        """Run {table: step(generator)} once the tables each one references are loaded"""
+        # Concurrent tables need a connection each, opened from db_config
+        concurrency = self.table_concurrency if self.conn is None or self.db_config else 1
+        # Files and virtual datasets check no foreign keys, so a child starts once its parents' keys are
+        # reserved. MySQL checks each one against committed parent rows, and keys are drawn from the
+        # whole parent range, so there a child still waits for its parents to finish.
+        scheduler = TableScheduler(SchemaManager.get_dependencies(self.domain), concurrency, early=self.conn is None)
+        self.scheduler = scheduler
+
+        def run(table, step):
+            def load():
+                gen = self if concurrency == 1 else self._table_generator()
+                started = time.perf_counter()
+                try:
+                    step(gen)
+                finally:
+                    if self.profiler is not None:
+                        # Rows as counted by the table's assembled batches
+                        rows = self.profiler.timings.get(("assemble", table), (0, 0.0, 0))[2]
+                        self.profiler.add("table", table, time.perf_counter() - started, rows)
+                    if gen is not self and gen.conn is not None:
+                        gen.conn.close()
+            return load if self.profiler is None else self.profiler.thread(load)
+
+        scheduler.run({table: run(table, step) for table, step in steps.items()})
+
+    def _table_generator(self):
+        """A generator on its own connection for one concurrently loaded table, sharing this run's keys and pools"""
+        conn = mysql.connector.connect(**self.db_config) if self.conn is not None else None
+        gen = DataGenerator(conn, self.row_limit, bulk_load=self.bulk_load, seed=self.seed, workers=self.workers,
+                            db_config=self.db_config, now=self.now, client_keys=self.client_keys,
+                            resumable=self.resumable, sink=self.sink, writers=self.writers, profiler=self.profiler,
+                            summary=self.summary, skew=self.skew)
+        gen.domain = self.domain
+        gen.shard_rows, gen.infile_rows = self.shard_rows, self.infile_rows
+        gen.pool_size, gen.pool, gen.uniques = self.pool_size, self.pool, self.uniques
+        gen.key_ranges, gen.plans, gen.batch_stats, gen.added = self.key_ranges, self.plans, self.batch_stats, self.added
+        gen.scheduler = self.scheduler
+        return gen
+
+    def report_timeline(self):
+        """Print when each table was ready, started and finished, and the critical path"""
+        if self.scheduler is not None:
+            self.scheduler.report()
+
     def generate(self, domain):
-        method_name = f"generate_{domain}"
-        if hasattr(self, method_name):
-            getattr(self, method_name)()
-        else:
+        self.domain = domain
+        if domain not in DOMAINS:
             print(f"Generator for {domain} not implemented.")
+            return
+        print(f"Populating {DOMAIN_NAMES[domain]} tables...")
+        self._schedule({table.name: (lambda gen, table=table: gen._load_table(table)) for table in DOMAINS[domain]})
 
-    def generate_ecommerce(self):
-        print("Populating Ecommerce tables...")
-        # 1. Categories
-        cats = []
-        for _ in range(20):
-            cats.append((
-                self._truncate(fake.word().title(), 100), 
-                fake.sentence(), 
-                self._truncate(fake.slug(), 150), 
-                True, fake.date_time_this_decade(), fake.date_time_this_year()
-            ))
-        self._batch_insert("INSERT INTO categories (name, description, slug, is_active, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, %s)", cats)
-        cat_ids = self._get_ids('categories', 'category_id')
-
-        # 2. Products
-        if not cat_ids: return
-        prods = []
-        for _ in range(self.row_limit):
-            price = round(random.uniform(10, 2000), 2)
-            prods.append((
-                random.choice(cat_ids), self._truncate(fake.uuid4()[:8].upper(), 50), 
-                self._truncate(fake.catch_phrase(), 255), fake.text(), 
-                price, price * 0.7, 'USD', random.randint(0, 500), random.uniform(0.1, 50.0), 
-                self._truncate(f"{random.randint(10,100)}x{random.randint(10,100)}x{random.randint(10,100)}", 100), 
-                self._truncate(fake.company(), 150),
-                random.choice([True, False]), fake.date_time_this_decade()
-            ))
-        self._batch_insert("INSERT INTO products (category_id, sku, name, description, price, cost_price, currency, stock_level, weight_kg, dimensions_cm, vendor_name, is_digital, created_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)", prods)
-        prod_ids = self._get_ids('products', 'product_id')
-
-        # 3. Customers
-        custs = []
-        for _ in range(self.row_limit):
-            custs.append((
-                self._truncate(fake.first_name(), 100), self._truncate(fake.last_name(), 100), 
-                self._truncate(fake.unique.email(), 255), self._truncate(fake.phone_number(), 50), 
-                random.choice(['Male', 'Female', 'Other']), fake.date_of_birth(minimum_age=18, maximum_age=90), 
-                self._truncate(fake.street_address(), 255), self._truncate(fake.city(), 100), 
-                self._truncate(fake.state(), 100), self._truncate(fake.postcode(), 50), 
-                self._truncate(fake.country(), 100),
-                fake.date_time_this_decade(), fake.date_time_this_year(), 
-                random.choice(['Bronze', 'Silver', 'Gold', 'Platinum']), random.choice([True, False])
-            ))
-        self._batch_insert("""INSERT INTO customers 
-            (first_name, last_name, email, phone_number, gender, birth_date, address_line1, city, state, postal_code, country, join_date, last_login, loyalty_tier, marketing_opt_in) 
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", custs)
-        cust_ids = self._get_ids('customers', 'customer_id')
-
-        # 4. Orders
-        if not cust_ids: return
-        orders = []
-        for _ in range(self.row_limit):
-            subtotal = round(random.uniform(50, 1000), 2)
-            orders.append((
-                random.choice(cust_ids), fake.date_time_this_year(), 
-                random.choice(['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled']),
-                random.choice(['Credit Card', 'PayPal', 'Apple Pay', 'Bank Transfer']), 
-                random.choice(['Paid', 'Pending', 'Failed']),
-                subtotal, round(subtotal * 0.08, 2), round(random.uniform(5, 50), 2), 
-                round(random.uniform(0, 20), 2), subtotal + 50, fake.address(), fake.address(), 
-                fake.ipv4(), fake.user_agent()
-            ))
-        self._batch_insert("""INSERT INTO orders 
-            (customer_id, order_date, status, payment_method, payment_status, subtotal, tax_amount, shipping_cost, discount_amount, total_amount, shipping_address, billing_address, ip_address, user_agent) 
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", orders)
-
-        # 5. Order Items
-        order_ids = self._get_ids('orders', 'order_id')
-        if not order_ids or not prod_ids: return
-        items = []
-        for oid in order_ids:
-            for _ in range(random.randint(1, 4)):
-                pid = random.choice(prod_ids)
-                qty = random.randint(1, 3)
-                u_price = round(random.uniform(10, 100), 2)
-                items.append((oid, pid, qty, u_price, qty * u_price, 0, 'None'))
-        self._batch_insert("INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price, discount_applied, return_status) VALUES (%s, %s, %s, %s, %s, %s, %s)", items)
-
-    def generate_fintech(self):
-        print("Populating Fintech tables...")
-        # 1. Branches
-        branches = []
-        for _ in range(20):
-            branches.append((
-                self._truncate(fake.bothify('BR-####'), 50), self._truncate(fake.company() + " Branch", 150), 
-                self._truncate(fake.street_address(), 255), self._truncate(fake.city(), 100), 
-                self._truncate(fake.state_abbr(), 100), self._truncate(fake.postcode(), 50), 
-                self._truncate(fake.phone_number(), 50), self._truncate(fake.name(), 150), 
-                fake.date_this_century(), random.uniform(1000000, 50000000)
-            ))
-        self._batch_insert("INSERT INTO branches (branch_code, name, address, city, state, zip_code, phone, manager_name, opened_date, vault_capacity) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)", branches)
-        branch_ids = self._get_ids('branches', 'branch_id')
-
-        # 2. Customers
-        if not branch_ids: return
-        custs = []
-        for _ in range(self.row_limit):
-            custs.append((
-                random.choice(branch_ids), self._truncate(fake.first_name(), 100), self._truncate(fake.last_name(), 100), 
-                self._truncate(fake.unique.email(), 255), self._truncate(fake.phone_number(), 50),
-                self._truncate(fake.unique.ssn(), 100), fake.date_of_birth(minimum_age=18), self._truncate(fake.address(), 255), 
-                random.choice(['Employed', 'Self-Employed', 'Unemployed', 'Retired']), random.uniform(30000, 200000),
-                random.choice(['Verified', 'Pending', 'Rejected']), random.randint(1, 100), random.randint(300, 850), fake.date_time_this_decade()
-            ))
-        self._batch_insert("""INSERT INTO customers 
-            (branch_id, first_name, last_name, email, phone, national_id, dob, address, employment_status, annual_income, kyc_status, risk_score, credit_score, created_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", custs)
-        cust_ids = self._get_ids('customers', 'customer_id')
-
-        # 3. Accounts
-        if not cust_ids: return
-        accs = []
-        for cid in custs: 
-            accs.append((
-                random.choice(cust_ids), self._truncate(fake.iban(), 50), 
-                random.choice(['Savings', 'Checking', 'Business', 'Investment']), 'USD',
-                round(random.uniform(0, 100000), 2), round(random.uniform(0, 5000), 2), round(random.uniform(0.1, 5.0), 2),
-                fake.date_this_decade(), 'Active', fake.date_time_this_year()
-            ))
-        self._batch_insert("""INSERT INTO accounts 
-            (customer_id, account_number, account_type, currency, balance, overdraft_limit, interest_rate, open_date, status, last_activity)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", accs)
-        acc_ids = self._get_ids('accounts', 'account_id')
-
-        # 4. Transactions
-        if not acc_ids: return
-        txns = []
-        for _ in range(self.row_limit * 2):
-            amt = round(random.uniform(10, 5000), 2)
-            txns.append((
-                random.choice(acc_ids), self._truncate(fake.uuid4(), 100), 
-                random.choice(['Debit', 'Credit']), random.choice(['Groceries', 'Utilities', 'Travel', 'Dining']),
-                amt, round(amt * 0.01, 2), 'USD', fake.date_time_this_year(), 
-                self._truncate(fake.company(), 150), self._truncate(fake.city(), 100), 
-                self._truncate(fake.country(), 100),
-                random.choice(['Mobile', 'Web', 'ATM', 'POS']), random.choice(['Success', 'Pending', 'Failed']), 
-                fake.ipv4(), fake.mac_address()
-            ))
-        self._batch_insert("""INSERT INTO transactions 
-            (account_id, txn_reference, txn_type, category, amount, fee_amount, currency, txn_date, merchant_name, merchant_city, merchant_country, channel, status, ip_address, device_id)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", txns)
-
-    def generate_healthcare(self):
-        print("Populating Healthcare tables...")
-        # 1. Depts
-        depts = []
-        for name in ['Cardiology', 'Neurology', 'Oncology', 'Pediatrics', 'Orthopedics', 'Emergency', 'Radiology']:
-            depts.append((
-                name, random.randint(1, 10), random.choice(['North', 'South', 'East']), 
-                fake.numerify('###'), fake.name(), random.randint(10, 50), True
-            ))
-        self._batch_insert("INSERT INTO departments (name, floor_number, wing, phone_extension, head_doctor, bed_capacity, is_emergency_unit) VALUES (%s, %s, %s, %s, %s, %s, %s)", depts)
-        dept_ids = self._get_ids('departments', 'dept_id')
-
-        # 2. Doctors
-        if not dept_ids: return
-        docs = []
-        for _ in range(50):
-            docs.append((
-                random.choice(dept_ids), self._truncate(fake.first_name(), 100), self._truncate(fake.last_name(), 100), 
-                self._truncate(fake.email(), 255), self._truncate(fake.phone_number(), 50),
-                self._truncate(fake.license_plate(), 100), self._truncate(fake.job(), 150), "MD", 
-                random.randint(1, 30), round(random.uniform(100, 500), 2),
-                fake.date_this_century(), True
-            ))
-        self._batch_insert("""INSERT INTO doctors 
-            (dept_id, first_name, last_name, email, phone, license_number, specialty, qualification, years_experience, consultation_fee, join_date, is_active)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", docs)
-        doc_ids = self._get_ids('doctors', 'doctor_id')
-
-        # 3. Patients
-        pats = []
-        for _ in range(self.row_limit):
-            pats.append((
-                self._truncate(fake.first_name(), 100), self._truncate(fake.last_name(), 100), 
-                fake.date_of_birth(), random.choice(['Male', 'Female']),
-                random.choice(['A+', 'A-', 'B+', 'O+', 'O-']), random.uniform(150, 200), random.uniform(50, 120),
-                "None", "None", self._truncate(fake.name(), 150), self._truncate(fake.phone_number(), 50), 
-                self._truncate(fake.company(), 150), self._truncate(fake.bothify('POL-####'), 100), fake.address()
-            ))
-        self._batch_insert("""INSERT INTO patients 
-            (first_name, last_name, dob, gender, blood_group, height_cm, weight_kg, allergies, chronic_conditions, emergency_contact_name, emergency_contact_phone, insurance_provider, insurance_policy_no, address)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", pats)
-        pat_ids = self._get_ids('patients', 'patient_id')
-
-        # 4. Appointments
-        if not pat_ids or not doc_ids: return
-        appts = []
-        for _ in range(self.row_limit):
-            appts.append((
-                random.choice(pat_ids), random.choice(doc_ids), fake.date_time_this_year(), random.choice([15, 30, 45, 60]),
-                random.choice(['In-person', 'Video']), random.choice(['Scheduled', 'Completed', 'Cancelled', 'No-show']),
-                fake.sentence(), fake.sentence(), fake.sentence()
-            ))
-        self._batch_insert("""INSERT INTO appointments 
-            (patient_id, doctor_id, appt_date, duration_minutes, type, status, reason_for_visit, diagnosis_notes, symptoms)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""", appts)
-
-    def generate_education(self):
-        print("Populating Education tables...")
-        # 1. Depts
-        depts = []
-        for name in ['Computer Science', 'Mathematics', 'Physics', 'Biology', 'Literature', 'History', 'Engineering']:
-            depts.append((
-                name, name[:3].upper(), fake.building_number() + " Hall", fake.room_number(), 
-                random.uniform(500000, 5000000), fake.date_this_century(), fake.name()
-            ))
-        self._batch_insert("INSERT INTO departments (name, code, building_name, office_number, budget, start_date, dean_name) VALUES (%s, %s, %s, %s, %s, %s, %s)", depts)
-        dept_ids = self._get_ids('departments', 'dept_id')
-
-        # 2. Professors
-        if not dept_ids: return
-        profs = []
-        for _ in range(50):
-            profs.append((
-                random.choice(dept_ids), self._truncate(fake.first_name(), 100), self._truncate(fake.last_name(), 100), 
-                self._truncate(fake.email(), 255), self._truncate(fake.phone_number(), 50),
-                random.choice(['Assistant Prof', 'Associate Prof', 'Professor']), fake.bs(), random.uniform(60000, 150000),
-                random.choice([True, False]), fake.date_this_century(), "Mon-Wed 2-4PM"
-            ))
-        self._batch_insert("""INSERT INTO professors 
-            (dept_id, first_name, last_name, email, phone, title, specialization, salary, tenure_status, hire_date, office_hours)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", profs)
-        prof_ids = self._get_ids('professors', 'prof_id')
-
-        # 3. Students
-        studs = []
-        for _ in range(self.row_limit):
-            studs.append((
-                self._truncate(fake.first_name(), 100), self._truncate(fake.last_name(), 100), 
-                self._truncate(fake.unique.email(), 255), self._truncate(fake.phone_number(), 50),
-                fake.date_of_birth(minimum_age=18, maximum_age=30), random.choice(['Male', 'Female']), random.randint(2020, 2024),
-                self._truncate(fake.job(), 150), "None", random.uniform(2.0, 4.0), random.randint(0, 120), 'Active', fake.address()
-            ))
-        self._batch_insert("""INSERT INTO students 
-            (first_name, last_name, email, phone, dob, gender, enrollment_year, major, minor, gpa, credits_earned, status, address)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", studs)
-
-        # 4. Courses
-        if not prof_ids: return
-        courses = []
-        for _ in range(50):
-            courses.append((
-                random.choice(dept_ids), random.choice(prof_ids), self._truncate(fake.bothify('??-###'), 50), 
-                self._truncate(fake.catch_phrase(), 150),
-                fake.sentence(), random.randint(1, 4), random.randint(20, 100), random.choice(['Fall', 'Spring', 'Summer']),
-                "MWF", fake.room_number()
-            ))
-        self._batch_insert("""INSERT INTO courses 
-            (dept_id, prof_id, code, name, description, credits, capacity, semester, schedule_days, room_number)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", courses)
-
-    def generate_logistics(self):
-        print("Populating Logistics tables...")
-        # 1. Warehouses
-        whs = []
-        for _ in range(10):
-            whs.append((
-                fake.bothify('WH-##'), self._truncate(fake.city() + " Hub", 150), self._truncate(fake.street_address(), 255), 
-                self._truncate(fake.city(), 100), self._truncate(fake.country(), 100),
-                fake.latitude(), fake.longitude(), random.randint(10000, 100000), True, self._truncate(fake.name(), 150), "24/7"
-            ))
-        self._batch_insert("""INSERT INTO warehouses 
-            (code, name, address, city, country, latitude, longitude, capacity_sqft, temperature_controlled, manager_name, operating_hours)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", whs)
-        wh_ids = self._get_ids('warehouses', 'warehouse_id')
-
-        # 2. Drivers
-        drivers = []
-        for _ in range(50):
-            drivers.append((
-                self._truncate(fake.first_name(), 100), self._truncate(fake.last_name(), 100), 
-                self._truncate(fake.bothify('LIC-#####'), 100), fake.date_this_decade(),
-                self._truncate(fake.phone_number(), 50), self._truncate(fake.email(), 255), 
-                random.uniform(3.5, 5.0), random.randint(100, 5000),
-                random.choice(['Full-time', 'Contract']), 'Active'
-            ))
-        self._batch_insert("""INSERT INTO drivers 
-            (first_name, last_name, license_number, license_expiry, phone, email, rating, total_trips, employment_type, status)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", drivers)
-
-        # 3. Vehicles
-        if not wh_ids: return
-        vehs = []
-        for _ in range(50):
-            vehs.append((
-                random.choice(wh_ids), self._truncate(fake.vin(), 100), random.choice(['Ford', 'Mercedes', 'Volvo']), fake.bothify('Model-?'),
-                random.randint(2015, 2024), random.choice(['Truck', 'Van', 'Semi']), self._truncate(fake.license_plate(), 50),
-                random.choice(['Diesel', 'Electric']), random.uniform(1000, 10000), random.uniform(10000, 200000),
-                fake.date_this_year(), 'Available'
-            ))
-        self._batch_insert("""INSERT INTO vehicles 
-            (warehouse_id, vin, make, model, year, vehicle_type, license_plate, fuel_type, max_load_kg, mileage_km, last_service_date, status)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", vehs)
-
-        # 4. Shipments
-        ships = []
-        for _ in range(self.row_limit):
-            ships.append((
-                random.choice(wh_ids), self._truncate(fake.bothify('TRK-#########'), 100), 
-                self._truncate(fake.name(), 150), fake.address(),
-                self._truncate(fake.name(), 150), fake.address(), self._truncate(fake.phone_number(), 50), 
-                random.uniform(1, 500), random.uniform(0.1, 5.0),
-                random.choice(['Fragile', 'General', 'Hazardous']), random.choice(['Standard', 'Express']),
-                random.choice(['Pending', 'In-Transit', 'Delivered']), fake.date_time_this_year(),
-                fake.date_time_this_year(), fake.date_time_this_year()
-            ))
-        self._batch_insert("""INSERT INTO shipments 
-            (warehouse_id, tracking_number, sender_name, sender_address, recipient_name, recipient_address, recipient_phone, weight_kg, volume_m3, cargo_type, priority, status, create_date, estimated_delivery, actual_delivery)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", ships)
-
-    def generate_hr(self):
-        print("Populating HR tables...")
-        # 1. Departments
-        depts = []
-        for _ in range(10):
-            depts.append((
-                self._truncate(fake.job(), 150), fake.bs(), self._truncate(fake.city(), 150), 
-                self._truncate(fake.bothify('CC-###'), 50), 
-                random.uniform(500000, 2000000), random.randint(10, 100), fake.date_this_decade()
-            ))
-        self._batch_insert("INSERT INTO departments (name, description, location, cost_center_code, budget_yearly, head_count_limit, created_at) VALUES (%s, %s, %s, %s, %s, %s, %s)", depts)
-        dept_ids = self._get_ids('departments', 'dept_id')
-
-        # 2. Jobs
-        jobs = []
-        for _ in range(20):
-            jobs.append((
-                self._truncate(fake.job(), 150), self._truncate(fake.bothify('JOB-##'), 50), 
-                random.uniform(40000, 60000), random.uniform(80000, 120000),
-                random.choice(['Entry', 'Mid', 'Senior']), fake.text(), random.choice([True, False])
-            ))
-        self._batch_insert("INSERT INTO jobs (title, job_code, min_salary, max_salary, level, requirements, is_remote_allowed) VALUES (%s, %s, %s, %s, %s, %s, %s)", jobs)
-        job_ids = self._get_ids('jobs', 'job_id')
-
-        # 3. Employees
-        # Check if parent tables are populated
-        if not dept_ids or not job_ids:
-            print("Error: Departments or Jobs failed to generate. Aborting Employee generation.")
+    def _load_table(self, table, rows=None):
+        """Generate and insert one table from its spec (`rows` overrides its row count),
+        with foreign keys drawn from its parents' keys"""
+        keys = SchemaManager.get_primary_keys(self.domain)
+        parents = [self._keys(parent, keys[parent]) for parent in table.parents]
+        empty = [parent for parent, ids in zip(table.parents, parents) if not len(ids)]
+        if empty:
+            print(f"Error: no rows in {', '.join(empty)}. Skipping {table.name}.")
             return
+        build = self._builder(table.name)
+        if table.fanout is None:
+            return self._load(table.insert(), table.row_count(self.row_limit) if rows is None else rows, build, *parents)
+        parent, low, high = table.fanout
+        index = table.parents.index(parent)
+        # When appending, only the parent rows added by this run get child rows
+        parents[index] = units = self.added.get(parent, parents[index])
+        engine = self._engine(table.name, 'fanout')
+        if self.seed is not None and isinstance(units, range):
+            engine = engine.at(units.start - 1)
+        # low..high rows per parent row, drawn up front so each shard knows its row count
+        sizes = engine.integers(low, high, len(units)).astype(np.min_scalar_type(high))
+        return self._load(table.insert(), len(units), build, *parents, sizes, sizes=sizes)
 
-        emps = []
-        for _ in range(self.row_limit):
-            emps.append((
-                self._truncate(fake.first_name(), 100), self._truncate(fake.last_name(), 100), 
-                self._truncate(fake.unique.email(), 255), self._truncate(fake.phone_number(), 50), 
-                self._truncate(fake.ssn(), 50),
-                fake.date_of_birth(minimum_age=20), random.choice(['M', 'F', 'X']), random.choice(['Single', 'Married']),
-                fake.date_this_decade(), random.choice(dept_ids), random.choice(job_ids), 0,
-                random.choice(['FullTime', 'PartTime']), random.uniform(50000, 100000), 'USD', fake.address()
-            ))
-        self._batch_insert("""INSERT INTO employees 
-            (first_name, last_name, email, phone, ssn, dob, gender, marital_status, hire_date, dept_id, job_id, manager_id, employment_status, salary, currency, address)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", emps)
-        
-        emp_ids = self._get_ids('employees', 'emp_id')
+    def append(self, domain, targets, rows, grow_parents=False):
+        """Add `rows` rows to each target table of an existing dataset.
+
+        Only the MIN and MAX of each primary key are read: the rows already
+        there are taken to have dense keys, as this generator writes them, and
+        new foreign keys are drawn from those ranges. With `grow_parents` the
+        scaled ancestors of each target also grow, keeping their current ratio
+        to it; fixed-size lookup tables never do. Tables built per parent row
+        (order items) are added for the new parent rows only.
+        """
+        self.domain = domain
+        tables = {table.name: table for table in DOMAINS[domain]}
+        keys = SchemaManager.get_primary_keys(domain)
+        for name in targets:
+            table = tables[name]
+            if table.fanout:
+                raise ValueError(f"{name} is built per {table.fanout[0]} row; append to {table.fanout[0]} instead")
+            if table.rows is not None:
+                raise ValueError(f"{name} is a lookup table with a fixed {table.rows} rows")
+        spans = {name: self._key_span(name, keys[name]) for name in tables}
+        plan = dict.fromkeys(targets, rows)
+        if grow_parents:
+            for name in targets:
+                for ancestor in _ancestors(tables, name):
+                    if tables[ancestor].rows is None and len(spans[name]):
+                        share = round(rows * len(spans[ancestor]) / len(spans[name]))
+                        plan[ancestor] = max(plan.get(ancestor, 0), share)
+        for name, table in tables.items():
+            if table.fanout and table.fanout[0] in plan:
+                plan[name] = None
+        self.key_ranges.update(spans)
+        print(f"Appending to {DOMAIN_NAMES[domain]} tables: " +
+              ", ".join(f"{name} +{'per ' + table.fanout[0] if plan[name] is None else plan[name]}"
+                        for name, table in tables.items() if name in plan))
+        self._schedule({name: (lambda gen, table=table: gen._append_table(table, plan[table.name]))
+                        for name, table in tables.items() if name in plan})
+
+    def _append_table(self, table, rows):
+        existing = self.key_ranges.get(table.name, range(0))
+        self._load_table(table, rows)
+        added = self.key_ranges.get(table.name, range(0))
+        if added is existing:
+            return  # skipped: a parent has no rows
+        # Children of this table draw from the old and the new keys alike
+        self.added[table.name] = added
+        self.key_ranges[table.name] = range(existing.start if len(existing) else added.start, added.stop)
+
+    def is_empty(self, domain):
+        """Whether none of a domain's tables has rows yet"""
+        return not any(len(self._key_span(table.name, table.pk)) for table in DOMAINS[domain])
+
+    def holds(self, domain, directory):
+        """Whether the database holds exactly a cached dataset: its seed recorded as the last finished
+        job and every table at the entry's row count"""
+        entry = read_entry(directory)
+        manifest = JobManifest(self.conn)
+        manifest.create()
+        job = manifest.job()
+        if job is None or job["status"] != "done" or \
+                (job["domain"], job["seed"], job["row_limit"], job["pool_size"], job["skew"] or "") != \
+                (domain, entry["seed"], entry["rows"], entry["pool_size"], entry.get("skew", "")):
+            return False
+        return all(len(self._key_span(table.name, table.pk)) == entry["tables"].get(table.name, 0)
+                   for table in DOMAINS[domain])
+
+    def restore(self, domain, directory):
+        """Load a dataset stored as Parquet (a DatasetCache entry) instead of generating it, keys included.
 
-        # 4. Attendance
-        if not emp_ids:
-            print("Error: No employees generated. Skipping attendance.")
+        Tables go to the sink, or into MySQL through _batch_insert, so
+        --bulk-load, --writers and --table-concurrency apply as in a generated
+        run. A Parquet sink gets copies of the files. In MySQL the entry's seed
+        is recorded as a job before any row is loaded, and every part as a
+        checkpointed shard, so an interrupted load is finished by --resume like
+        an interrupted run. Once it is done, --append continues the dataset.
+        """
+        self.domain = domain
+        if self.conn is not None:
+            entry = read_entry(directory)
+            self.resumable = True
+            self.manifest = self.manifest or JobManifest(self.conn)
+            self.manifest.create()
+            self.manifest.start(domain, entry["seed"], entry["rows"], entry["pool_size"],
+                                datetime.fromisoformat(entry["anchor"]), entry.get("skew", ""))
+        print(f"Loading {DOMAIN_NAMES[domain]} tables from {directory}...")
+        self._schedule({table.name: (lambda gen, table=table: gen._restore_table(table, directory))
+                        for table in DOMAINS[domain]})
+        if self.conn is not None:
+            self.manifest.finish()
+
+    def _restore_table(self, table, directory):
+        columns = table_columns(directory, table.name)
+        if isinstance(self.sink, ParquetSink):
+            # Already in the sink's layout
+            self.sink.prepare(table.name)
+            for part in table_parts(directory, table.name):
+                shutil.copyfile(part, os.path.join(self.sink.output_dir, table.name, os.path.basename(part)))
+            return
+        if self.sink is not None:
+            self.sink.prepare(table.name)
+            self.sink.write(table.name, 0, columns, self._observed(table.name, columns, table_batches(directory, table.name)))
             return
+        query = f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        if self.manifest is None:
+            return self._batch_insert(query, table_batches(directory, table.name))
+        # The parts are the generated run's shards, so a resumed run regenerates exactly the rows still missing
+        shards = table_shards(directory, table.name)
+        self.manifest.add_shards(table.name, shards)
+        for (index, _, _), part in zip(shards, table_parts(directory, table.name)):
+            self._batch_insert(query, part_batches(part), lambda rows, index=index: self.manifest.advance(table.name, index, rows))
+
+    def _key_span(self, table, pk):
+        """Key range of the rows in a table, from two index lookups instead of a scan"""
+        self.cursor.execute(f"SELECT MIN({pk}), MAX({pk}) FROM {table}")
+        low, high = self.cursor.fetchone()
+        return range(0) if low is None else range(int(low), int(high) + 1)
+
+    def _builder(self, table):
+        """The compiled batch builder of one of the domain's tables, bound to this generator"""
+        if table not in self.builders:
+            self.builders[table] = compile_builder(SchemaManager.get_table(self.domain, table), self)
+        return self.builders[table]
+
+def _with_primary_key(query, pk):
+    """Rewrite an INSERT so its first column is the explicitly assigned primary key"""
+    target = INSERT_TARGET.match(query)
+    query = query[:target.start(2)] + f"{pk}, " + query[target.start(2):]
+    return re.sub(r"VALUES\s*\(", "VALUES (%s, ", query, count=1)
+
+def _ancestors(tables, name):
+    """Every table a table references, directly or through its parents"""
+    found, stack = [], list(tables[name].parents)
+    while stack:
+        parent = stack.pop()
+        if parent != name and parent not in found:
+            found.append(parent)
+            stack.extend(tables[parent].parents)
+    return found
+
+def _row_offset(ends, unit):
+    """Index of the first row of a unit; units are rows unless `ends` (cumulative sizes) is given"""
+    return unit if ends is None or unit == 0 else int(ends[unit - 1])
+
+def _unit_at(ends, row):
+    return row if ends is None else int(np.searchsorted(ends, row, side='right'))
+
+def _skip_rows(batches, count):
+    for batch in batches:
+        if count >= len(batch):
+            count -= len(batch)
+            continue
+        yield batch[count:]
+        count = 0
+
+def _number_rows(batches, first_id):
+    next_id = first_id
+    for batch in batches:
+        yield [(pk, *row) for pk, row in zip(range(next_id, next_id + len(batch)), batch)]
+        next_id += len(batch)
+
+# Shard workers: each process owns one connection and one DataGenerator per table
+_worker = None
+
+def _init_worker(settings, domain, query, build_name, args, ends, profile=False):
+    global _worker
+    conn = mysql.connector.connect(**settings["db_config"]) if settings["sink"] is None else None
+    gen = DataGenerator(conn, **settings, profiler=Profiler() if profile else None)
+    gen.domain = domain
+    _worker = (gen, query, gen._builder(build_name), args, ends)
+
+def _run_shard(shard):
+    """Load one shard; returns its batching stats and, when profiling, the timings collected since the last shard"""
+    gen, query, build, args, ends = _worker
+    stats = gen._load_shard(query, build, args, ends, *shard)
+    if gen.profiler is None:
+        return stats, None
+    timings, gen.profiler.timings = gen.profiler.timings, {}
+    return stats, timings
+
+def _profiled(gen, run, args):
+    """Run the generation, then report and dump what the profiler collected"""
+    if gen.profiler is None:
+        return run()
+    gen.profiler.start()
+    try:
+        run()
+    finally:
+        gen.profiler.stop()
+        gen.profiler.report()
+        gen.profiler.dump(args.profile_stats, args.profile_memory)
+
+def cache_key(domain, rows, seed, pool_size=0, now=None, skew=None):
+    """DatasetCache key of a seeded run of this generator, anchored to today unless `now` is given"""
+    now = now or datetime.combine(date.today(), datetime.min.time())
+    return dataset_key(domain, rows, seed, SchemaManager.get_schema(domain), pool_size, now, skew=format_skew(skew))
+
+def cached_dataset(cache, domain, rows, seed, pool_size=0, now=None, workers=1, table_concurrency=1, profiler=None,
+                   summary=None, skew=None):
+    """Directory of a seeded dataset in the cache, generated into it as Parquet on a miss; and whether it was a hit.
+
+    `summary` records the rows generated on a miss.
+    """
+    now = now or datetime.combine(date.today(), datetime.min.time())
+    schema = SchemaManager.get_schema(domain)
+    key = cache_key(domain, rows, seed, pool_size, now, skew)
+    if cache.get(key) is not None:
+        print(f"Dataset cache hit {key[:12]}: {domain}, {rows} rows, seed {seed}")
+        return cache.path(key), True
+    print(f"Dataset cache miss {key[:12]}; generating it into {cache.root}")
+
+    def fill(directory):
+        gen = DataGenerator(None, rows, pool_size=pool_size, seed=seed, workers=workers, now=now,
+                            sink=ParquetSink(directory, schema), table_concurrency=table_concurrency, profiler=profiler,
+                            summary=summary, skew=skew)
+        gen.generate(domain)
 
-        atts = []
-        for _ in range(self.row_limit):
-            atts.append((
-                random.choice(emp_ids), fake.date_this_year(), "09:00:00", "17:00:00", 8.0, 
-                'Present', fake.ipv4()
-            ))
-        self._batch_insert("INSERT INTO attendance (emp_id, date, check_in, check_out, hours_worked, status, location_ip) VALUES (%s, %s, %s, %s, %s, %s, %s)", atts)
+    cache.build(key, {"domain": domain, "rows": rows, "seed": seed, "pool_size": pool_size or 0,
+                      "anchor": now.isoformat(), "skew": format_skew(skew)}, fill)
+    return cache.path(key), False
+
+def _stream(gen, domain, args):
+    """Run --stream with the generator's dataset, then print what was achieved"""
+    try:
+        profile = streaming.RateProfile(streaming.parse_rate(args.rate), args.ramp,
+                                        streaming.parse_burst(args.burst) if args.burst else None)
+        source = streaming.EventSource(gen, domain, block=max(10000, int(profile.peak * 10)))
+        sink = streaming.open_sink(args.stream_to, gen, domain, int(args.rotate_mb * 2 ** 20), args.rotate_seconds)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return
+    print(f"Streaming {domain} events to {args.stream_to} at {profile.base:g}/s", file=sys.stderr)
+    s = streaming.run_stream(source, sink, profile, args.duration, args.events)
+    print(f"Sent {s['sent']} events in {s['seconds']:.1f}s ({s['rate']:.0f}/s); max lag {s['max_lag_ms']:.1f} ms, "
+          f"{s['missed']} missed behind schedule, {s['failed']} failed", file=sys.stderr)
+
+def _append_targets(domain):
+    """Tables --append grows by default: scaled tables no other table references, or the parent a per-row table is built from"""
+    tables = SchemaManager.get_tables(domain)
+    referenced = {parent for table in tables for parent in table.parents}
+    targets = []
+    for table in tables:
+        if table.name not in referenced and table.rows is None:
+            name = table.fanout[0] if table.fanout else table.name
+            if name not in targets:
+                targets.append(name)
+    return targets
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--domain", type=str)
     parser.add_argument("--rows", type=int)
+    parser.add_argument("--max-rows", type=int, default=DATA_GENERATION_CONFIG["max_rows"],
+                        help="Soft cap on --rows; raise it for large runs (generation streams in batches, so memory stays flat)")
+    parser.add_argument("--bulk-load", action="store_true",
+                        help="Load tables with LOAD DATA LOCAL INFILE (falls back to INSERT if the server refuses)")
+    parser.add_argument("--pool-size", type=int, default=0,
+                        help="Distinct Faker values to pre-build per provider and sample from (0 = call Faker per row)")
+    parser.add_argument("--client-keys", action="store_true",
+                        help="Assign primary keys client-side and sample foreign keys from the reserved ranges (implied by --seed)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for sharded generation; each owns its own connection")
+    parser.add_argument("--writers", type=int, default=0,
+                        help="Pipelined mode: insert on N writer threads (extra ones open their own connection) "
+                             "while the next batches are generated; 0 = generate and insert in turn")
+    parser.add_argument("--table-concurrency", type=int, default=1,
+                        help="Load up to N tables at once, each on its own connection, as soon as the tables "
+                             "their foreign keys reference are loaded")
+    parser.add_argument("--seed", type=int,
+                        help="Master seed; the same seed gives the same data for any --workers value")
+    parser.add_argument("--skew", action="append", metavar="TABLE.COLUMN=SPEC",
+                        help="Draw a foreign key or categorical column by zipf:S (rank r weighted 1/r**S), powerlaw:A "
+                             "(Pareto tail), weights:W1,W2,... (in key or category order) or weights:NAME=W,... "
+                             "instead of uniformly, e.g. orders.customer_id=zipf:1.1; repeat per column")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the domain's last seeded run from its checkpoints, with that run's seed, rows and pool size")
+    parser.add_argument("--append", action="store_true",
+                        help="Add --rows rows to --tables of the existing analytics_<domain> database instead of a full "
+                             "fill; reads only key ranges and continues the recorded seed when there is one")
+    parser.add_argument("--tables",
+                        help="With --append: comma-separated tables to grow (default: the domain's leaf tables, "
+                             "e.g. transactions or attendance)")
+    parser.add_argument("--grow-parents", action="store_true",
+                        help="With --append: also add rows to the tables they reference, in proportion to their size")
+    parser.add_argument("--stream", action="store_true",
+                        help="Send a continuous stream of events at --rate instead of a fill: fintech transactions, "
+                             "ecommerce orders with their items, logistics shipment status updates or hr attendance check-ins")
+    parser.add_argument("--rate", default="1000/s",
+                        help="With --stream: target events per second, as N/s, N/m or N/h")
+    parser.add_argument("--ramp", type=float, default=0.0, metavar="SECONDS",
+                        help="With --stream: rise linearly from 0 to --rate over the first SECONDS")
+    parser.add_argument("--burst", metavar="FACTORxSECONDS/PERIOD",
+                        help="With --stream: run at FACTOR times --rate for the last SECONDS of every PERIOD, e.g. 5x2s/30s")
+    parser.add_argument("--duration", type=float, metavar="SECONDS",
+                        help="With --stream: stop after SECONDS (default: run until interrupted)")
+    parser.add_argument("--events", type=int, help="With --stream: stop after N events")
+    parser.add_argument("--stream-to", default="mysql",
+                        help="With --stream: mysql (the existing analytics_<domain> database), stdout, socket:PATH, "
+                             "tcp:HOST:PORT (NDJSON lines), or files:DIR (NDJSON files rotated by --rotate-mb/--rotate-seconds); "
+                             "without mysql, events reference the --rows dataset of the same --seed")
+    parser.add_argument("--rotate-mb", type=float, default=64.0, help="With --stream-to files: start a new file after MB")
+    parser.add_argument("--rotate-seconds", type=float, default=60.0,
+                        help="With --stream-to files: start a new file after SECONDS")
+    parser.add_argument("--sink", choices=["mysql", "parquet", "sqlite"], default="mysql",
+                        help="Where the tables go: the MySQL database, Parquet files or a SQLite database under --output-dir")
+    parser.add_argument("--output-dir", default="output",
+                        help="Directory for file sinks: Parquet tables go to <dir>/<domain>/<table>/part-*.parquet, "
+                             "SQLite databases to <dir>/<domain>.db")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Generate even when the dataset cache has this --domain/--rows/--seed/--pool-size dataset, "
+                             "and do not store it")
+    parser.add_argument("--cache-dir", help="Dataset cache directory (default DATASET_CACHE_DIR or ~/.cache/analytics_datasets); "
+                                            "list and prune it with cache.py")
+    parser.add_argument("--profile", action="store_true",
+                        help="Report time per table, column generator, INSERT statement, commit and ID query")
+    parser.add_argument("--profile-stats", metavar="FILE",
+                        help="With --profile, also run cProfile and write the merged pstats to FILE")
+    parser.add_argument("--profile-memory", metavar="FILE",
+                        help="With --profile, also trace allocations and write the tracemalloc snapshot to FILE")
+    parser.add_argument("--show-rows", metavar="TABLE:START:STOP",
+                        help="Print rows START..STOP of TABLE from the seeded dataset, computed directly without a database")
     args = parser.parse_args()
 
     domains = SchemaManager.get_available_domains()
@@ -830,22 +948,109 @@ def main():
         sys.exit(1)
 
     row_count = args.rows
-    if not row_count:
+    if not row_count and not args.resume and not (args.stream and args.stream_to == "mysql"):
         try:
-            row_count = int(input("Enter row count (Max 10000): "))
+            row_count = int(input(f"Enter row count (Max {args.max_rows}): "))
         except ValueError:
             print("Invalid number.")
             sys.exit(1)
 
-    if row_count > 10000:
-        row_count = 10000
+    if row_count and row_count > args.max_rows:
+        print(f"Row count capped at {args.max_rows}. Pass --max-rows to raise the limit.")
+        row_count = args.max_rows
+
+    if args.append and (args.sink != "mysql" or args.resume):
+        print("--append adds rows to an existing MySQL dataset; it cannot be combined with --sink or --resume.")
+        sys.exit(1)
+    if args.stream and (args.sink != "mysql" or args.resume or args.append):
+        print("--stream sends events to --stream-to; it cannot be combined with --sink, --resume or --append.")
+        sys.exit(1)
+    try:
+        skew = parse_skew(args.skew or [])
+        # Appends and streams add parent rows, so their key counts are not known here
+        SchemaManager.check_skew(selected_domain, skew, None if args.append or args.stream else row_count)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    targets = args.tables.split(",") if args.tables else _append_targets(selected_domain)
+    unknown = [t for t in targets if t not in SchemaManager.get_primary_keys(selected_domain)]
+    if args.append and unknown:
+        print(f"Unknown {selected_domain} tables: {', '.join(unknown)}")
+        sys.exit(1)
+
+    if args.show_rows:
+        if args.seed is None:
+            print("--show-rows needs --seed (and the --rows and --pool-size of the run to reproduce).")
+            sys.exit(1)
+        try:
+            table, start, stop = args.show_rows.split(":")
+            start, stop = int(start), int(stop)
+        except ValueError:
+            parser.error(f"--show-rows expects TABLE:START:STOP, not {args.show_rows!r}")
+        if table not in SchemaManager.get_primary_keys(selected_domain):
+            parser.error(f"--show-rows: no table {table!r} in {selected_domain}; "
+                         f"choose from {', '.join(SchemaManager.get_primary_keys(selected_domain))}")
+        gen = DataGenerator(None, row_count, pool_size=args.pool_size, seed=args.seed, skew=skew)
+        gen.plan(selected_domain)
+        for row in gen.rows(table, start, stop):
+            print(row)
+        return
+
+    profiler = None
+    if args.profile or args.profile_stats or args.profile_memory:
+        profiler = Profiler(cprofile=bool(args.profile_stats), memory=bool(args.profile_memory))
+
+    seed = args.seed
+    if seed is None and args.workers > 1:
+        seed = random.randrange(2 ** 32)
+        print(f"Sharded run with --workers {args.workers}; using --seed {seed}")
+
+    if args.stream and args.stream_to != "mysql":
+        # Events reference a virtual dataset, so nothing but events may go to stdout
+        gen = DataGenerator(None, row_count, pool_size=args.pool_size, seed=seed, skew=skew)
+        _stream(gen, selected_domain, args)
+        return
+
+    # Fresh runs with an explicit seed reuse (or fill) the dataset cache; random seeds would never be asked for again
+    cache = None
+    if args.seed is not None and not (args.no_cache or args.resume or args.append or args.stream):
+        cache = DatasetCache(args.cache_dir)
+
+    def fill(gen):
+        if cache is None:
+            return gen.generate(selected_domain)
+        directory, _ = cached_dataset(cache, selected_domain, row_count, seed, args.pool_size, workers=args.workers,
+                                      table_concurrency=args.table_concurrency, profiler=gen.profiler, skew=skew)
+        gen.restore(selected_domain, directory)
+
+    if args.sink == "parquet":
+        output_dir = os.path.join(args.output_dir, selected_domain)
+        sink = ParquetSink(output_dir, SchemaManager.get_schema(selected_domain))
+        gen = DataGenerator(None, row_count, pool_size=args.pool_size, seed=seed, workers=args.workers, sink=sink,
+                            table_concurrency=args.table_concurrency, profiler=profiler, skew=skew)
+        _profiled(gen, lambda: fill(gen), args)
+        gen.report_timeline()
+        print(f"Successfully wrote {selected_domain} tables as Parquet to {output_dir}")
+        return
+
+    if args.sink == "sqlite":
+        path = os.path.join(args.output_dir, f"{selected_domain}.db")
+        sink = SQLiteSink(path, SchemaManager.get_schema(selected_domain))
+        gen = DataGenerator(None, row_count, pool_size=args.pool_size, seed=seed, workers=args.workers, sink=sink,
+                            table_concurrency=args.table_concurrency, profiler=profiler, skew=skew)
+        _profiled(gen, lambda: fill(gen), args)
+        sink.finish()
+        gen.report_timeline()
+        print(f"Successfully wrote {selected_domain} tables to the SQLite database {path}")
+        return
 
     conn = None
     try:
         conn = mysql.connector.connect(
             host=DB_CONFIG["host"], 
             user=DB_CONFIG["user"], 
-            password=DB_CONFIG["password"]
+            password=DB_CONFIG["password"],
+            allow_local_infile=args.bulk_load
         )
         cursor = conn.cursor()
         
@@ -856,14 +1061,90 @@ def main():
         schema = SchemaManager.get_schema(selected_domain)
         for sql in schema:
             cursor.execute(sql)
-            
-        gen = DataGenerator(conn, row_count)
-        gen.generate(selected_domain)
+
+        # Seeded runs record a manifest so a killed run can be continued with --resume
+        manifest = JobManifest(conn)
+        manifest.create()
+        pool_size, now = args.pool_size, None
+        db_config = dict(host=DB_CONFIG["host"], user=DB_CONFIG["user"], password=DB_CONFIG["password"],
+                         database=db_name, allow_local_infile=args.bulk_load)
+        if args.append or args.stream:
+            # Same seed and pools as the run that made the data, so new rows continue its
+            # value streams and UNIQUE columns instead of colliding with them; the manifest is left alone
+            job = manifest.job()
+            if job is not None and job["seed"] is not None:
+                seed, pool_size = job["seed"], job["pool_size"]
+                print(f"Continuing the recorded dataset with --seed {seed} --pool-size {pool_size}")
+                if not args.skew and job["skew"]:
+                    skew = parse_skew(job["skew"])
+                    print(f"New rows keep its skew: {job['skew']}")
+            else:
+                print(f"No seeded run recorded in {db_name}; new UNIQUE values may collide with existing rows.")
+        if args.stream:
+            gen = DataGenerator(conn, row_count or 0, pool_size=pool_size, seed=seed, client_keys=True, skew=skew)
+            _stream(gen, selected_domain, args)
+            return
+        if args.append:
+            gen = DataGenerator(conn, row_count, pool_size=pool_size, bulk_load=args.bulk_load, seed=seed,
+                                workers=args.workers, db_config=db_config, client_keys=True, writers=args.writers,
+                                table_concurrency=args.table_concurrency, profiler=profiler, skew=skew)
+            try:
+                _profiled(gen, lambda: gen.append(selected_domain, targets, row_count, args.grow_parents), args)
+            except ValueError as e:
+                print(f"Error: {e}")
+                return
+            gen.report_batching()
+            gen.report_timeline()
+            print(f"Successfully appended {selected_domain} rows to database {db_name}")
+            return
+        if cache is not None:
+            gen = DataGenerator(conn, row_count, pool_size=pool_size, bulk_load=args.bulk_load, seed=seed,
+                                workers=args.workers, db_config=db_config, writers=args.writers,
+                                table_concurrency=args.table_concurrency, profiler=profiler, skew=skew)
+            # Cached rows carry their keys, which only fit tables that are still empty
+            if not gen.is_empty(selected_domain):
+                job = manifest.job()
+                unfinished = job is not None and job["status"] != "done"
+                print(f"Error: {db_name} already has {selected_domain} rows"
+                      + (" from an interrupted run; pass --resume to finish it" if unfinished else "")
+                      + ". Pass --append to add rows to them, or --no-cache to generate a new dataset after them.")
+                sys.exit(1)
+            _profiled(gen, lambda: fill(gen), args)
+            gen.report_batching()
+            gen.report_timeline()
+            print(f"Successfully loaded the cached {selected_domain} dataset into database {db_name}")
+            return
+        if args.resume:
+            job = manifest.job()
+            if job is None:
+                print(f"No checkpointed run found in {db_name}; start one with --seed.")
+                return
+            if job["status"] == "done":
+                print(f"The last run in {db_name} already finished; nothing to resume.")
+                return
+            seed, row_count, pool_size, now = job["seed"], job["row_limit"], job["pool_size"], job["anchor"]
+            skew = parse_skew(job["skew"] or "")
+            print(f"Resuming with --seed {seed} --rows {row_count} --pool-size {pool_size}"
+                  + (f" --skew {job['skew']}" if job["skew"] else ""))
+        elif seed is not None:
+            now = datetime.combine(date.today(), datetime.min.time())
+            manifest.start(selected_domain, seed, row_count, pool_size, now, format_skew(skew))
+
+        gen = DataGenerator(conn, row_count, pool_size=pool_size, bulk_load=args.bulk_load, seed=seed, workers=args.workers,
+                            db_config=db_config, now=now, client_keys=args.client_keys, resumable=seed is not None,
+                            writers=args.writers, table_concurrency=args.table_concurrency, profiler=profiler, skew=skew)
+        _profiled(gen, lambda: gen.generate(selected_domain), args)
+        gen.report_batching()
+        gen.report_timeline()
+        if gen.manifest is not None:
+            gen.manifest.finish()
         
         print(f"Successfully generated complex analytics data for {selected_domain} in database {db_name}")
         
     except Error as e:
         print(f"Critical Database Error: {e}")
+        if seed is not None and not (args.append or args.stream):
+            print("Progress up to the last commit is checkpointed; rerun with --resume to continue.")
     finally:
         if conn and conn.is_connected():
             cursor.close()
@@ -0,0 +1,174 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class AliasTable:
+    """Walker's alias method over k weighted outcomes.
+
+    Building takes a few vectorized passes over the weights; after that a draw
+    is a uniform column, a coin and two array lookups whatever the weights, so
+    a skewed column costs about what a uniform one does.
+    """
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1 or not len(weights) or (weights < 0).any() or not weights.sum() > 0:
+            raise ValueError("weights must be non-negative with a positive total")
+        k = len(weights)
+        prob = weights * (k / weights.sum())
+        alias = np.arange(k, dtype=np.int64)
+        small, large = np.flatnonzero(prob < 1.0), np.flatnonzero(prob >= 1.0)
+        # Vose's pairing, a round at a time: the small columns' deficits are laid end
+        # to end against the large columns' excesses, and each small column takes as
+        # its alias the large one under the start of its deficit. Large columns that
+        # drop below 1 are the small ones of the next round.
+        while len(small) and len(large):
+            deficit = 1.0 - prob[small]
+            owner = np.searchsorted(np.cumsum(prob[large] - 1.0), np.cumsum(deficit) - deficit, side="right")
+            # Only rounding leaves a deficit past the last excess
+            paired = owner < len(large)
+            alias[small[paired]] = large[owner[paired]]
+            prob[large] -= np.bincount(owner[paired], weights=deficit[paired], minlength=len(large))
+            drained = prob[large] < 1.0
+            small, large = large[drained], large[~drained]
+        # What is left over is 1 up to rounding
+        prob[small] = 1.0
+        prob[large] = 1.0
+        self.prob = prob
+        self.alias = alias
+
+    def __len__(self):
+        return len(self.prob)
+
+    def pick(self, units, coins):
+        """Outcomes for uniform `units` (which column) and `coins` (the column or its alias), both in [0, 1)"""
+        k = len(self.prob)
+        column = np.minimum((units * k).astype(np.int64), k - 1)
+        return np.where(coins < self.prob[column], column, self.alias[column])
+
+
+class Skew(ABC):
+    """How a column picks among its candidates, categories or parent keys, instead of uniformly.
+
+    Candidates are taken in order: a category list as written in the domain,
+    parent keys from the lowest, so the oldest parents are the popular ones.
+    """
+    spec = ""
+
+    @abstractmethod
+    def positions(self, cols, size, n):
+        """`n` positions in [0, size) drawn from the ColumnEngine `cols`"""
+
+    def over(self, values):
+        """This skew for a categorical column with the given `values`"""
+        return self
+
+
+class Zipf(Skew):
+    """Candidate of rank r (from 1) weighted 1 / r**s, drawn through an alias table per candidate count"""
+
+    def __init__(self, s):
+        if not s > 0:
+            raise ValueError(f"zipf exponent must be positive, not {s}")
+        self.s = s
+        self.spec = f"zipf:{s:g}"
+        self._tables = {}
+
+    def positions(self, cols, size, n):
+        table = self._tables.get(size)
+        if table is None:
+            table = self._tables[size] = AliasTable(np.arange(1, size + 1, dtype=np.float64) ** -self.s)
+        return cols.weighted_indexes(table, n)
+
+
+class PowerLaw(Skew):
+    """Pareto tail with exponent `a`: candidate i (from 0) gets roughly (i + 1)**-(a + 1) of the draws.
+
+    Drawn by inverting the CDF of a Pareto distribution truncated to the
+    candidates, which needs no table, so it suits parents with millions of keys.
+    """
+
+    def __init__(self, a):
+        if not a > 0:
+            raise ValueError(f"power-law exponent must be positive, not {a}")
+        self.a = a
+        self.spec = f"powerlaw:{a:g}"
+
+    def positions(self, cols, size, n):
+        units = cols.uniform(0.0, 1.0, n)
+        tail = (size + 1.0) ** -self.a
+        x = (1.0 - units * (1.0 - tail)) ** (-1.0 / self.a)
+        return np.minimum(x.astype(np.int64) - 1, size - 1)
+
+
+class Weights(Skew):
+    """Explicit weights, one per candidate in order, or by category name for categorical columns"""
+
+    def __init__(self, weights=None, named=None):
+        self.weights = list(weights) if weights is not None else None
+        self.named = dict(named) if named is not None else None
+        if self.weights is not None:
+            self.spec = "weights:" + ",".join(f"{w:g}" for w in self.weights)
+        else:
+            self.spec = "weights:" + ",".join(f"{name}={w:g}" for name, w in self.named.items())
+        self._table = None
+
+    def over(self, values):
+        if self.named is None:
+            if len(self.weights) != len(values):
+                raise ValueError(f"{len(self.weights)} weights for {len(values)} categories")
+            return self
+        unknown = [name for name in self.named if name not in values]
+        missing = [value for value in values if value not in self.named]
+        if unknown or missing:
+            raise ValueError(f"weights must name each of {', '.join(map(str, values))}"
+                             + (f"; unknown: {', '.join(unknown)}" if unknown else ""))
+        return Weights([self.named[value] for value in values])
+
+    def positions(self, cols, size, n):
+        if self.weights is None:
+            raise ValueError("weights by name only apply to categorical columns")
+        if len(self.weights) != size:
+            raise ValueError(f"{len(self.weights)} weights for {size} parent keys")
+        if self._table is None:
+            self._table = AliasTable(self.weights)
+        return cols.weighted_indexes(self._table, n)
+
+
+def parse_spec(spec):
+    """A Skew from zipf:S, powerlaw:A, weights:W1,W2,... or weights:NAME=W,NAME=W,..."""
+    kind, _, args = spec.partition(":")
+    try:
+        if kind == "zipf":
+            return Zipf(float(args))
+        if kind == "powerlaw":
+            return PowerLaw(float(args))
+        if kind == "weights":
+            items = [item.strip() for item in args.split(",") if item.strip()]
+            if items and all("=" in item for item in items):
+                return Weights(named={name.strip(): float(w) for name, w in (item.rsplit("=", 1) for item in items)})
+            return Weights([float(item) for item in items])
+    except ValueError as e:
+        raise ValueError(f"bad skew {spec!r}: {e}") from None
+    raise ValueError(f"bad skew {spec!r}: expected zipf:S, powerlaw:A or weights:...")
+
+
+def parse_skew(items):
+    """{"table.column": Skew} from TABLE.COLUMN=SPEC items, given as a list or as one string joined by ";" """
+    if isinstance(items, str):
+        items = items.split(";")
+    skew = {}
+    for item in items:
+        if not item.strip():
+            continue
+        column, sep, spec = item.partition("=")
+        if not sep or "." not in column:
+            raise ValueError(f"bad skew {item!r}: expected TABLE.COLUMN=SPEC")
+        skew[column.strip()] = parse_spec(spec.strip())
+    return skew
+
+
+def format_skew(skew):
+    """The ";"-joined form parse_skew reads back, in a stable order for cache keys and manifests"""
+    return ";".join(f"{column}={skew[column].spec}" for column in sorted(skew or {}))
@@ -0,0 +1,351 @@
+from specs import Choice, Column, Derived, Draw, Fake, Sequence, Table, Unique, UniqueEmail, draw
+
+HEALTHCARE_DEPARTMENTS = ['Cardiology', 'Neurology', 'Oncology', 'Pediatrics', 'Orthopedics', 'Emergency', 'Radiology']
+EDUCATION_DEPARTMENTS = ['Computer Science', 'Mathematics', 'Physics', 'Biology', 'Literature', 'History', 'Engineering']
+
+DOMAIN_NAMES = {'ecommerce': 'Ecommerce', 'fintech': 'Fintech', 'healthcare': 'Healthcare',
+                'education': 'Education', 'logistics': 'Logistics', 'hr': 'HR'}
+
+
+def _dimensions(cols, n):
+    return [f"{l}x{w}x{h}" for l, w, h in zip(*cols.integers(10, 100, (3, n)).tolist())]
+
+
+# Tables of each domain in creation order; every parent comes before its children.
+# A column without a generator that references a table samples that table's keys.
+DOMAINS = {
+    'ecommerce': [
+        Table('categories', 'category_id', [
+            Column('name', 'VARCHAR(100)', Fake('word', map=str.title)),
+            Column('description', 'TEXT', Fake('sentence')),
+            Column('slug', 'VARCHAR(150)', Fake('slug')),
+            Column('is_active', 'BOOLEAN', draw('constant', True), default='TRUE'),
+            Column('created_at', 'DATETIME', draw('datetime_this_decade')),
+            Column('updated_at', 'DATETIME', draw('datetime_this_year')),
+        ], rows=20),
+        Table('products', 'product_id', [
+            Column('category_id', 'INT', references='categories'),
+            Column('sku', 'VARCHAR(50)', Unique('hex_code'), unique=True),
+            Column('name', 'VARCHAR(255)', Fake('catch_phrase')),
+            Column('description', 'TEXT', Fake('text')),
+            Column('price', 'DECIMAL(10,2)', draw('uniform', 10, 2000, decimals=2)),
+            Column('cost_price', 'DECIMAL(10,2)', Derived(lambda price: (price * 0.7).round(2), 'price')),
+            Column('currency', 'VARCHAR(10)', draw('constant', 'USD'), default="'USD'"),
+            Column('stock_level', 'INT', draw('integers', 0, 500)),
+            Column('weight_kg', 'DECIMAL(5,2)', draw('uniform', 0.1, 50.0, decimals=2)),
+            Column('dimensions_cm', 'VARCHAR(100)', Draw(_dimensions)),
+            Column('vendor_name', 'VARCHAR(150)', Fake('company')),
+            Column('is_digital', 'BOOLEAN', draw('booleans'), default='FALSE'),
+            Column('created_at', 'DATETIME', draw('datetime_this_decade')),
+        ]),
+        Table('customers', 'customer_id', [
+            Column('first_name', 'VARCHAR(100)', Fake('first_name')),
+            Column('last_name', 'VARCHAR(100)', Fake('last_name')),
+            Column('email', 'VARCHAR(255)', UniqueEmail('first_name', 'last_name'), unique=True),
+            Column('phone_number', 'VARCHAR(50)', Fake('phone_number')),
+            Column('gender', 'VARCHAR(20)', Choice(['Male', 'Female', 'Other'])),
+            Column('birth_date', 'DATE', draw('date_of_birth', minimum_age=18, maximum_age=90)),
+            Column('address_line1', 'VARCHAR(255)', Fake('street_address')),
+            Column('city', 'VARCHAR(100)', Fake('city')),
+            Column('state', 'VARCHAR(100)', Fake('state')),
+            Column('postal_code', 'VARCHAR(50)', Fake('postcode')),
+            Column('country', 'VARCHAR(100)', Fake('country')),
+            Column('join_date', 'DATETIME', draw('datetime_this_decade')),
+            Column('last_login', 'DATETIME', draw('datetime_this_year')),
+            Column('loyalty_tier', 'VARCHAR(50)', Choice(['Bronze', 'Silver', 'Gold', 'Platinum'])),
+            Column('marketing_opt_in', 'BOOLEAN', draw('booleans')),
+        ]),
+        Table('orders', 'order_id', [
+            Column('customer_id', 'INT', references='customers'),
+            Column('order_date', 'DATETIME', draw('datetime_this_year')),
+            Column('status', 'VARCHAR(50)', Choice(['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled'])),
+            Column('payment_method', 'VARCHAR(100)', Choice(['Credit Card', 'PayPal', 'Apple Pay', 'Bank Transfer'])),
+            Column('payment_status', 'VARCHAR(50)', Choice(['Paid', 'Pending', 'Failed'])),
+            Column('subtotal', 'DECIMAL(12,2)', draw('uniform', 50, 1000, decimals=2)),
+            Column('tax_amount', 'DECIMAL(12,2)', Derived(lambda subtotal: (subtotal * 0.08).round(2), 'subtotal')),
+            Column('shipping_cost', 'DECIMAL(12,2)', draw('uniform', 5, 50, decimals=2)),
+            Column('discount_amount', 'DECIMAL(12,2)', draw('uniform', 0, 20, decimals=2)),
+            Column('total_amount', 'DECIMAL(12,2)', Derived(lambda subtotal: subtotal + 50, 'subtotal')),
+            Column('shipping_address', 'TEXT', Fake('address')),
+            Column('billing_address', 'TEXT', Fake('address')),
+            Column('ip_address', 'VARCHAR(50)', Fake('ipv4')),
+            Column('user_agent', 'TEXT', Fake('user_agent')),
+        ]),
+        Table('order_items', 'item_id', [
+            Column('order_id', 'INT', references='orders'),
+            Column('product_id', 'INT', references='products'),
+            Column('quantity', 'INT', draw('integers', 1, 3)),
+            Column('unit_price', 'DECIMAL(10,2)', draw('uniform', 10, 100, decimals=2)),
+            Column('total_price', 'DECIMAL(12,2)', Derived(lambda qty, price: (qty * price).round(2), 'quantity', 'unit_price')),
+            Column('discount_applied', 'DECIMAL(10,2)', draw('constant', 0)),
+            Column('return_status', 'VARCHAR(50)', draw('constant', 'None'), default="'None'"),
+        ], fanout=('orders', 1, 4)),
+    ],
+    'fintech': [
+        Table('branches', 'branch_id', [
+            Column('branch_code', 'VARCHAR(50)', Unique('code', 'BR-', 4), unique=True),
+            Column('name', 'VARCHAR(150)', Fake('company', map=lambda v: v + " Branch")),
+            Column('address', 'VARCHAR(255)', Fake('street_address')),
+            Column('city', 'VARCHAR(100)', Fake('city')),
+            Column('state', 'VARCHAR(100)', Fake('state_abbr')),
+            Column('zip_code', 'VARCHAR(50)', Fake('postcode')),
+            Column('phone', 'VARCHAR(50)', Fake('phone_number')),
+            Column('manager_name', 'VARCHAR(150)', Fake('name')),
+            Column('opened_date', 'DATE', draw('date_this_century')),
+            Column('vault_capacity', 'DECIMAL(15,2)', draw('uniform', 1000000, 50000000, decimals=2)),
+        ], rows=20),
+        Table('customers', 'customer_id', [
+            Column('branch_id', 'INT', references='branches'),
+            Column('first_name', 'VARCHAR(100)', Fake('first_name')),
+            Column('last_name', 'VARCHAR(100)', Fake('last_name')),
+            Column('email', 'VARCHAR(255)', UniqueEmail('first_name', 'last_name')),
+            Column('phone', 'VARCHAR(50)', Fake('phone_number')),
+            Column('national_id', 'VARCHAR(100)', Unique('ssn'), unique=True),
+            Column('dob', 'DATE', draw('date_of_birth', minimum_age=18)),
+            Column('address', 'VARCHAR(255)', Fake('address')),
+            Column('employment_status', 'VARCHAR(100)', Choice(['Employed', 'Self-Employed', 'Unemployed', 'Retired'])),
+            Column('annual_income', 'DECIMAL(15,2)', draw('uniform', 30000, 200000, decimals=2)),
+            Column('kyc_status', 'VARCHAR(50)', Choice(['Verified', 'Pending', 'Rejected'])),
+            Column('risk_score', 'INT', draw('integers', 1, 100)),
+            Column('credit_score', 'INT', draw('integers', 300, 850)),
+            Column('created_at', 'DATETIME', draw('datetime_this_decade')),
+        ]),
+        Table('accounts', 'account_id', [
+            Column('customer_id', 'INT', references='customers'),
+            Column('account_number', 'VARCHAR(50)', Unique('iban'), unique=True),
+            Column('account_type', 'VARCHAR(100)', Choice(['Savings', 'Checking', 'Business', 'Investment'])),
+            Column('currency', 'VARCHAR(10)', draw('constant', 'USD')),
+            Column('balance', 'DECIMAL(15,2)', draw('uniform', 0, 100000, decimals=2)),
+            Column('overdraft_limit', 'DECIMAL(15,2)', draw('uniform', 0, 5000, decimals=2)),
+            Column('interest_rate', 'DECIMAL(5,2)', draw('uniform', 0.1, 5.0, decimals=2)),
+            Column('open_date', 'DATE', draw('date_this_decade')),
+            Column('status', 'VARCHAR(50)', draw('constant', 'Active')),
+            Column('last_activity', 'DATETIME', draw('datetime_this_year')),
+        ]),
+        Table('transactions', 'txn_id', [
+            Column('account_id', 'INT', references='accounts'),
+            Column('txn_reference', 'VARCHAR(100)', Unique('uuid4'), unique=True),
+            Column('txn_type', 'VARCHAR(50)', Choice(['Debit', 'Credit'])),
+            Column('category', 'VARCHAR(100)', Choice(['Groceries', 'Utilities', 'Travel', 'Dining'])),
+            Column('amount', 'DECIMAL(15,2)', draw('uniform', 10, 5000, decimals=2)),
+            Column('fee_amount', 'DECIMAL(10,2)', Derived(lambda amount: (amount * 0.01).round(2), 'amount')),
+            Column('currency', 'VARCHAR(10)', draw('constant', 'USD')),
+            Column('txn_date', 'DATETIME', draw('datetime_this_year')),
+            Column('merchant_name', 'VARCHAR(150)', Fake('company')),
+            Column('merchant_city', 'VARCHAR(100)', Fake('city')),
+            Column('merchant_country', 'VARCHAR(100)', Fake('country')),
+            Column('channel', 'VARCHAR(50)', Choice(['Mobile', 'Web', 'ATM', 'POS'])),
+            Column('status', 'VARCHAR(50)', Choice(['Success', 'Pending', 'Failed'])),
+            Column('ip_address', 'VARCHAR(50)', Fake('ipv4')),
+            Column('device_id', 'VARCHAR(150)', Fake('mac_address')),
+        ], scale=2),
+    ],
+    'healthcare': [
+        Table('departments', 'dept_id', [
+            Column('name', 'VARCHAR(150)', Sequence(HEALTHCARE_DEPARTMENTS)),
+            Column('floor_number', 'INT', draw('integers', 1, 10)),
+            Column('wing', 'VARCHAR(100)', Choice(['North', 'South', 'East'])),
+            Column('phone_extension', 'VARCHAR(50)', Fake('numerify', '###')),
+            Column('head_doctor', 'VARCHAR(150)', Fake('name')),
+            Column('bed_capacity', 'INT', draw('integers', 10, 50)),
+            Column('is_emergency_unit', 'BOOLEAN', draw('constant', True)),
+        ], rows=len(HEALTHCARE_DEPARTMENTS)),
+        Table('doctors', 'doctor_id', [
+            Column('dept_id', 'INT', references='departments'),
+            Column('first_name', 'VARCHAR(100)', Fake('first_name')),
+            Column('last_name', 'VARCHAR(100)', Fake('last_name')),
+            Column('email', 'VARCHAR(255)', Fake('email')),
+            Column('phone', 'VARCHAR(50)', Fake('phone_number')),
+            Column('license_number', 'VARCHAR(100)', Fake('license_plate')),
+            Column('specialty', 'VARCHAR(150)', Fake('job')),
+            Column('qualification', 'VARCHAR(150)', draw('constant', "MD")),
+            Column('years_experience', 'INT', draw('integers', 1, 30)),
+            Column('consultation_fee', 'DECIMAL(10,2)', draw('uniform', 100, 500, decimals=2)),
+            Column('join_date', 'DATE', draw('date_this_century')),
+            Column('is_active', 'BOOLEAN', draw('constant', True)),
+        ], rows=50),
+        Table('patients', 'patient_id', [
+            Column('first_name', 'VARCHAR(100)', Fake('first_name')),
+            Column('last_name', 'VARCHAR(100)', Fake('last_name')),
+            Column('dob', 'DATE', draw('date_of_birth')),
+            Column('gender', 'VARCHAR(20)', Choice(['Male', 'Female'])),
+            Column('blood_group', 'VARCHAR(10)', Choice(['A+', 'A-', 'B+', 'O+', 'O-'])),
+            Column('height_cm', 'DECIMAL(5,2)', draw('uniform', 150, 200, decimals=2)),
+            Column('weight_kg', 'DECIMAL(5,2)', draw('uniform', 50, 120, decimals=2)),
+            Column('allergies', 'TEXT', draw('constant', "None")),
+            Column('chronic_conditions', 'TEXT', draw('constant', "None")),
+            Column('emergency_contact_name', 'VARCHAR(150)', Fake('name')),
+            Column('emergency_contact_phone', 'VARCHAR(50)', Fake('phone_number')),
+            Column('insurance_provider', 'VARCHAR(150)', Fake('company')),
+            Column('insurance_policy_no', 'VARCHAR(100)', Fake('bothify', 'POL-####')),
+            Column('address', 'TEXT', Fake('address')),
+        ]),
+        Table('appointments', 'appt_id', [
+            Column('patient_id', 'INT', references='patients'),
+            Column('doctor_id', 'INT', references='doctors'),
+            Column('appt_date', 'DATETIME', draw('datetime_this_year')),
+            Column('duration_minutes', 'INT', Choice([15, 30, 45, 60])),
+            Column('type', 'VARCHAR(50)', Choice(['In-person', 'Video'])),
+            Column('status', 'VARCHAR(50)', Choice(['Scheduled', 'Completed', 'Cancelled', 'No-show'])),
+            Column('reason_for_visit', 'TEXT', Fake('sentence')),
+            Column('diagnosis_notes', 'TEXT', Fake('sentence')),
+            Column('symptoms', 'TEXT', Fake('sentence')),
+        ]),
+    ],
+    'education': [
+        Table('departments', 'dept_id', [
+            Column('name', 'VARCHAR(150)', Sequence(EDUCATION_DEPARTMENTS)),
+            Column('code', 'VARCHAR(50)', Derived(lambda names: [name[:3].upper() for name in names], 'name')),
+            Column('building_name', 'VARCHAR(150)', Fake('building_number', map=lambda v: v + " Hall")),
+            Column('office_number', 'VARCHAR(50)', Fake('numerify', "Room ###")),
+            Column('budget', 'DECIMAL(15,2)', draw('uniform', 500000, 5000000, decimals=2)),
+            Column('start_date', 'DATE', draw('date_this_century')),
+            Column('dean_name', 'VARCHAR(150)', Fake('name')),
+        ], rows=len(EDUCATION_DEPARTMENTS)),
+        Table('professors', 'prof_id', [
+            Column('dept_id', 'INT', references='departments'),
+            Column('first_name', 'VARCHAR(100)', Fake('first_name')),
+            Column('last_name', 'VARCHAR(100)', Fake('last_name')),
+            Column('email', 'VARCHAR(255)', Fake('email')),
+            Column('phone', 'VARCHAR(50)', Fake('phone_number')),
+            Column('title', 'VARCHAR(100)', Choice(['Assistant Prof', 'Associate Prof', 'Professor'])),
+            Column('specialization', 'VARCHAR(150)', Fake('bs')),
+            Column('salary', 'DECIMAL(10,2)', draw('uniform', 60000, 150000, decimals=2)),
+            Column('tenure_status', 'BOOLEAN', draw('booleans')),
+            Column('hire_date', 'DATE', draw('date_this_century')),
+            Column('office_hours', 'TEXT', draw('constant', "Mon-Wed 2-4PM")),
+        ], rows=50),
+        Table('students', 'student_id', [
+            Column('first_name', 'VARCHAR(100)', Fake('first_name')),
+            Column('last_name', 'VARCHAR(100)', Fake('last_name')),
+            Column('email', 'VARCHAR(255)', UniqueEmail('first_name', 'last_name')),
+            Column('phone', 'VARCHAR(50)', Fake('phone_number')),
+            Column('dob', 'DATE', draw('date_of_birth', minimum_age=18, maximum_age=30)),
+            Column('gender', 'VARCHAR(20)', Choice(['Male', 'Female'])),
+            Column('enrollment_year', 'INT', draw('integers', 2020, 2024)),
+            Column('major', 'VARCHAR(150)', Fake('job')),
+            Column('minor', 'VARCHAR(150)', draw('constant', "None")),
+            Column('gpa', 'DECIMAL(3,2)', draw('uniform', 2.0, 4.0, decimals=2)),
+            Column('credits_earned', 'INT', draw('integers', 0, 120)),
+            Column('status', 'VARCHAR(50)', draw('constant', 'Active')),
+            Column('address', 'TEXT', Fake('address')),
+        ]),
+        Table('courses', 'course_id', [
+            Column('dept_id', 'INT', references='departments'),
+            Column('prof_id', 'INT', references='professors'),
+            Column('code', 'VARCHAR(50)', Fake('bothify', '??-###')),
+            Column('name', 'VARCHAR(150)', Fake('catch_phrase')),
+            Column('description', 'TEXT', Fake('sentence')),
+            Column('credits', 'INT', draw('integers', 1, 4)),
+            Column('capacity', 'INT', draw('integers', 20, 100)),
+            Column('semester', 'VARCHAR(50)', Choice(['Fall', 'Spring', 'Summer'])),
+            Column('schedule_days', 'VARCHAR(100)', draw('constant', "MWF")),
+            Column('room_number', 'VARCHAR(50)', Fake('numerify', "Room ###")),
+        ], rows=50),
+    ],
+    'logistics': [
+        Table('warehouses', 'warehouse_id', [
+            Column('code', 'VARCHAR(50)', Fake('bothify', 'WH-##')),
+            Column('name', 'VARCHAR(150)', Fake('city', map=lambda v: v + " Hub")),
+            Column('address', 'VARCHAR(255)', Fake('street_address')),
+            Column('city', 'VARCHAR(100)', Fake('city')),
+            Column('country', 'VARCHAR(100)', Fake('country')),
+            Column('latitude', 'DECIMAL(10,8)', draw('uniform', -90, 90, decimals=6)),
+            Column('longitude', 'DECIMAL(11,8)', draw('uniform', -180, 180, decimals=6)),
+            Column('capacity_sqft', 'INT', draw('integers', 10000, 100000)),
+            Column('temperature_controlled', 'BOOLEAN', draw('constant', True)),
+            Column('manager_name', 'VARCHAR(150)', Fake('name')),
+            Column('operating_hours', 'VARCHAR(150)', draw('constant', "24/7")),
+        ], rows=10),
+        Table('drivers', 'driver_id', [
+            Column('first_name', 'VARCHAR(100)', Fake('first_name')),
+            Column('last_name', 'VARCHAR(100)', Fake('last_name')),
+            Column('license_number', 'VARCHAR(100)', Unique('code', 'LIC-', 9), unique=True),
+            Column('license_expiry', 'DATE', draw('date_this_decade')),
+            Column('phone', 'VARCHAR(50)', Fake('phone_number')),
+            Column('email', 'VARCHAR(255)', Fake('email')),
+            Column('rating', 'DECIMAL(3,2)', draw('uniform', 3.5, 5.0, decimals=2)),
+            Column('total_trips', 'INT', draw('integers', 100, 5000)),
+            Column('employment_type', 'VARCHAR(50)', Choice(['Full-time', 'Contract'])),
+            Column('status', 'VARCHAR(50)', draw('constant', 'Active')),
+        ], rows=50),
+        Table('vehicles', 'vehicle_id', [
+            Column('warehouse_id', 'INT', references='warehouses'),
+            Column('vin', 'VARCHAR(100)', Unique('vin'), unique=True),
+            Column('make', 'VARCHAR(100)', Choice(['Ford', 'Mercedes', 'Volvo'])),
+            Column('model', 'VARCHAR(100)', Fake('bothify', 'Model-?')),
+            Column('year', 'INT', draw('integers', 2015, 2024)),
+            Column('vehicle_type', 'VARCHAR(100)', Choice(['Truck', 'Van', 'Semi'])),
+            Column('license_plate', 'VARCHAR(50)', Fake('license_plate')),
+            Column('fuel_type', 'VARCHAR(50)', Choice(['Diesel', 'Electric'])),
+            Column('max_load_kg', 'DECIMAL(10,2)', draw('uniform', 1000, 10000, decimals=2)),
+            Column('mileage_km', 'DECIMAL(10,2)', draw('uniform', 10000, 200000, decimals=2)),
+            Column('last_service_date', 'DATE', draw('date_this_year')),
+            Column('status', 'VARCHAR(50)', draw('constant', 'Available')),
+        ], rows=50),
+        Table('shipments', 'shipment_id', [
+            Column('warehouse_id', 'INT', references='warehouses'),
+            Column('tracking_number', 'VARCHAR(100)', Unique('code', 'TRK-', 9), unique=True),
+            Column('sender_name', 'VARCHAR(150)', Fake('name')),
+            Column('sender_address', 'TEXT', Fake('address')),
+            Column('recipient_name', 'VARCHAR(150)', Fake('name')),
+            Column('recipient_address', 'TEXT', Fake('address')),
+            Column('recipient_phone', 'VARCHAR(50)', Fake('phone_number')),
+            Column('weight_kg', 'DECIMAL(10,2)', draw('uniform', 1, 500, decimals=2)),
+            Column('volume_m3', 'DECIMAL(10,2)', draw('uniform', 0.1, 5.0, decimals=2)),
+            Column('cargo_type', 'VARCHAR(100)', Choice(['Fragile', 'General', 'Hazardous'])),
+            Column('priority', 'VARCHAR(50)', Choice(['Standard', 'Express'])),
+            Column('status', 'VARCHAR(50)', Choice(['Pending', 'In-Transit', 'Delivered'])),
+            Column('create_date', 'DATETIME', draw('datetime_this_year')),
+            Column('estimated_delivery', 'DATETIME', draw('datetime_this_year')),
+            Column('actual_delivery', 'DATETIME', draw('datetime_this_year')),
+        ]),
+    ],
+    'hr': [
+        Table('departments', 'dept_id', [
+            Column('name', 'VARCHAR(150)', Fake('job')),
+            Column('description', 'TEXT', Fake('bs')),
+            Column('location', 'VARCHAR(150)', Fake('city')),
+            Column('cost_center_code', 'VARCHAR(50)', Fake('bothify', 'CC-###')),
+            Column('budget_yearly', 'DECIMAL(15,2)', draw('uniform', 500000, 2000000, decimals=2)),
+            Column('head_count_limit', 'INT', draw('integers', 10, 100)),
+            Column('created_at', 'DATE', draw('date_this_decade')),
+        ], rows=10),
+        Table('jobs', 'job_id', [
+            Column('title', 'VARCHAR(150)', Fake('job')),
+            Column('job_code', 'VARCHAR(50)', Fake('bothify', 'JOB-##')),
+            Column('min_salary', 'DECIMAL(10,2)', draw('uniform', 40000, 60000, decimals=2)),
+            Column('max_salary', 'DECIMAL(10,2)', draw('uniform', 80000, 120000, decimals=2)),
+            Column('level', 'VARCHAR(50)', Choice(['Entry', 'Mid', 'Senior'])),
+            Column('requirements', 'TEXT', Fake('text')),
+            Column('is_remote_allowed', 'BOOLEAN', draw('booleans')),
+        ], rows=20),
+        Table('employees', 'emp_id', [
+            Column('first_name', 'VARCHAR(100)', Fake('first_name')),
+            Column('last_name', 'VARCHAR(100)', Fake('last_name')),
+            Column('email', 'VARCHAR(255)', UniqueEmail('first_name', 'last_name'), unique=True),
+            Column('phone', 'VARCHAR(50)', Fake('phone_number')),
+            Column('ssn', 'VARCHAR(50)', Fake('ssn')),
+            Column('dob', 'DATE', draw('date_of_birth', minimum_age=20)),
+            Column('gender', 'VARCHAR(20)', Choice(['M', 'F', 'X'])),
+            Column('marital_status', 'VARCHAR(50)', Choice(['Single', 'Married'])),
+            Column('hire_date', 'DATE', draw('date_this_decade')),
+            Column('dept_id', 'INT', references='departments'),
+            Column('job_id', 'INT', references='jobs'),
+            Column('manager_id', 'INT', draw('constant', 0)),
+            Column('employment_status', 'VARCHAR(50)', Choice(['FullTime', 'PartTime'])),
+            Column('salary', 'DECIMAL(10,2)', draw('uniform', 50000, 100000, decimals=2)),
+            Column('currency', 'VARCHAR(10)', draw('constant', 'USD')),
+            Column('address', 'TEXT', Fake('address')),
+        ]),
+        Table('attendance', 'att_id', [
+            Column('emp_id', 'INT', references='employees'),
+            Column('date', 'DATE', draw('date_this_year')),
+            Column('check_in', 'TIME', draw('constant', "09:00:00")),
+            Column('check_out', 'TIME', draw('constant', "17:00:00")),
+            Column('hours_worked', 'DECIMAL(4,2)', draw('constant', 8.0)),
+            Column('status', 'VARCHAR(50)', draw('constant', 'Present')),
+            Column('location_ip', 'VARCHAR(50)', Fake('ipv4')),
+        ]),
+    ],
+}
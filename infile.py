@@ -0,0 +1,44 @@
+import os
+import tempfile
+from datetime import datetime
+from decimal import Decimal
+
+# MySQL errors meaning LOAD DATA LOCAL is refused by the server or the client
+LOCAL_INFILE_REFUSED = {1148, 2068, 3948}
+
+_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+
+
+def tsv_field(value):
+    """Encode one value for LOAD DATA's default tab-separated, backslash-escaped format"""
+    if value is None:
+        return '\\N'
+    if value is True:
+        return '1'
+    if value is False:
+        return '0'
+    if isinstance(value, str):
+        return value.translate(_ESCAPES)
+    if isinstance(value, float):
+        # Shortest round-tripping digits, written out in full rather than in exponent form
+        text = repr(value)
+        return text if 'e' not in text else format(Decimal(text), 'f')
+    if isinstance(value, datetime):
+        return value.isoformat(' ')
+    # int, Decimal, date and time all render as MySQL literals via str()
+    return str(value)
+
+
+def write_tsv(fh, rows):
+    fh.writelines('\t'.join([tsv_field(v) for v in row]) + '\n' for row in rows)
+
+
+def open_tsv():
+    """Temporary TSV file that the caller loads and then removes with os.remove"""
+    return tempfile.NamedTemporaryFile('w', suffix='.tsv', encoding='utf-8', newline='', delete=False)
+
+
+def load_data_sql(path, table, columns):
+    path = os.path.abspath(path).replace('\\', '/').replace("'", "\\'")
+    return (f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table} CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' ({columns})")
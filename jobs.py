@@ -0,0 +1,125 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from summaries import RunCancelled
+
+
+class Job:
+    """One generation run on a JobRegistry thread: its state, progress, messages and results.
+
+    The work reports through the job instead of the UI, which may have moved
+    on to another rerun or session by then: log() collects messages, track()
+    makes a RunSummary the job's progress and ties it to cancel(), and
+    `result` holds what the session should pick up once the job is done.
+    """
+
+    def __init__(self, name, target, expected=None):
+        self.id = uuid.uuid4().hex[:8]
+        self.name = name
+        # What the job writes to; two active jobs never share one
+        self.target = target
+        # Rows each table should end up with, for progress
+        self.expected = expected or {}
+        self.state = "queued"
+        self.phase = "Waiting for a free worker"
+        self.summary = None
+        self.messages = []
+        self.result = {}
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.cancelled = threading.Event()
+
+    @property
+    def active(self):
+        return self.state in ("queued", "running")
+
+    def log(self, level, text):
+        """Record a message for the UI; `level` is info, success, warning or error"""
+        self.messages.append((level, text))
+
+    def track(self, summary, phase):
+        summary.cancelled = self.cancelled
+        self.summary, self.phase = summary, phase
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def progress(self):
+        """Rows so far, rows expected and rows per second of each table, in generation order"""
+        tables = self.summary.tables if self.summary is not None else {}
+        names = list(self.expected) + [name for name in tables if name not in self.expected]
+        result = []
+        for name in names:
+            table = tables.get(name)
+            result.append({"table": name, "rows": table.rows if table else 0, "expected": self.expected.get(name),
+                           "rows/s": round(table.rate) if table else 0})
+        return result
+
+    def fraction(self):
+        """Share of the expected rows generated so far, 0..1"""
+        expected = sum(self.expected.values())
+        if not expected:
+            return 1.0 if self.state == "done" else 0.0
+        tables = self.summary.tables if self.summary is not None else {}
+        done = sum(min(tables[name].rows, rows) for name, rows in self.expected.items() if name in tables)
+        return min(done / expected, 1.0)
+
+
+class JobRegistry:
+    """Generation jobs shared by every session, run `workers` at a time on background threads.
+
+    Jobs outlive the script run and the session that submitted them, so a
+    rerun or a reload finds them here by ID. Finished jobs are forgotten
+    once more than `keep` of them accumulate.
+    """
+
+    def __init__(self, workers=2, keep=50):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="generation")
+        self.keep = keep
+        self.jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job, work):
+        """Queue work(job); refused with ValueError while another active job writes to the same target"""
+        with self._lock:
+            busy = next((j for j in self.jobs.values() if j.active and j.target == job.target), None)
+            if busy is not None:
+                raise ValueError(f"{job.target} is in use by job {busy.id} ({busy.name}); wait for it or cancel it")
+            self.jobs[job.id] = job
+            finished = [j.id for j in self.jobs.values() if not j.active]
+            for job_id in finished[:max(len(finished) - self.keep, 0)]:
+                del self.jobs[job_id]
+        self.executor.submit(self._run, job, work)
+        return job
+
+    def _run(self, job, work):
+        job.started = time.time()
+        try:
+            if job.cancelled.is_set():
+                raise RunCancelled(f"job {job.id} was cancelled before it started")
+            job.state = "running"
+            work(job)
+            job.state = "failed" if any(level == "error" for level, _ in job.messages) else "done"
+        except RunCancelled:
+            job.state = "cancelled"
+            job.log("warning", "Cancelled; rows committed before that are kept")
+        except Exception as e:
+            job.state = "failed"
+            job.log("error", f"{type(e).__name__}: {e}")
+        finally:
+            job.finished = time.time()
+            job.phase = job.state.capitalize()
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def list(self):
+        return list(self.jobs.values())
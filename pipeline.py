@@ -0,0 +1,89 @@
+import queue
+import threading
+import time
+
+
+class InsertPipeline:
+    """Bounded hand-off between the generating thread and writer threads.
+
+    The producer ``put()``s the rows of each statement while ``writers`` threads
+    take them off the queue and run ``write(slot, rows)``; ``slot`` is the
+    writer's index, so each writer can own one connection. The queue holds at
+    most ``depth`` statements: when the database falls behind the producer
+    blocks instead of piling generated rows up in memory. Queue depth is sampled
+    on every put, and the time each side spends waiting for the other shows
+    which one limits the run.
+    """
+
+    def __init__(self, write, writers=1, depth=4):
+        self.write = write
+        self.depth = depth
+        self.queue = queue.Queue(maxsize=depth)
+        self.error = None
+        self.puts = 0
+        self.depth_total = 0
+        self.depth_max = 0
+        self.producer_wait = 0.0
+        self.writer_wait = 0.0
+        self.started = time.perf_counter()
+        self.wall = 0.0
+        self._lock = threading.Lock()
+        self._closed = False
+        self.threads = [threading.Thread(target=self._run, args=(slot,), daemon=True) for slot in range(writers)]
+        for thread in self.threads:
+            thread.start()
+
+    def put(self, rows):
+        """Queue one statement's rows; blocks while the queue is full and raises a writer's error"""
+        depth = self.queue.qsize()
+        self.puts += 1
+        self.depth_total += depth
+        self.depth_max = max(self.depth_max, depth)
+        started = time.perf_counter()
+        while True:
+            if self.error is not None:
+                raise self.error
+            try:
+                self.queue.put(rows, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self.producer_wait += time.perf_counter() - started
+
+    def _run(self, slot):
+        while True:
+            started = time.perf_counter()
+            rows = self.queue.get()
+            with self._lock:
+                self.writer_wait += time.perf_counter() - started
+            if rows is None:
+                return
+            # After a failure keep draining so the producer never blocks on a full queue
+            if self.error is None:
+                try:
+                    self.write(slot, rows)
+                except BaseException as e:
+                    self.error = e
+
+    def close(self):
+        """Wait until every queued statement is written; raises the first writer error"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.wall = time.perf_counter() - self.started
+        if self.error is not None:
+            raise self.error
+
+    def summary(self):
+        return {
+            "queued": self.puts,
+            "queue_depth": self.depth_total,
+            "queue_max": self.depth_max,
+            "producer_wait": self.producer_wait,
+            "writer_wait": self.writer_wait,
+            "pipeline_seconds": self.wall,
+        }
@@ -0,0 +1,52 @@
+import threading
+
+import numpy as np
+
+
+class FakerPool:
+    """Distinct Faker values built once per run and sampled by index.
+
+    Each provider (plus its arguments) is called until ``size`` distinct values
+    are collected, or until it is clear the provider cannot produce that many.
+    Callers fill columns by drawing integer indexes into the pool, so the
+    cost per row is an array lookup instead of a Faker call. Pools are keyed
+    by provider only, so one ``city`` pool serves every table in the run;
+    truncated copies are cached per column width. With a seed the pools are
+    reproducible, which sharded runs rely on. Tables loaded concurrently share
+    one pool, so each provider's pool is built under a lock.
+    """
+
+    def __init__(self, faker, size, seed=None):
+        self.faker = faker
+        self.size = size
+        self.seed = seed
+        self._values = {}
+        self._truncated = {}
+        self._lock = threading.Lock()
+
+    def values(self, provider, *args):
+        key = (provider, args)
+        if key in self._values:
+            return self._values[key]
+        with self._lock:
+            if key not in self._values:
+                self._build(key, provider, args)
+        return self._values[key]
+
+    def _build(self, key, provider, args):
+        make = getattr(self.faker, provider)
+        if self.seed is not None:
+            # Seed per provider so a pool's contents do not depend on build order
+            self.faker.seed_instance(f"{self.seed}:{provider}:{args}")
+        seen = {}
+        for _ in range(self.size * 3):
+            seen[make(*args)] = None
+            if len(seen) == self.size:
+                break
+        self._values[key] = np.array(list(seen), dtype=object)
+
+    def truncated(self, provider, width, *args):
+        key = (provider, args, width)
+        if key not in self._truncated:
+            self._truncated[key] = np.array([v[:width] for v in self.values(provider, *args)], dtype=object)
+        return self._truncated[key]
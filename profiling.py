@@ -0,0 +1,148 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+
+
+class Profiler:
+    """Where a generation run spends its time, accumulated by section and name.
+
+    Sections are ``table`` (a whole table load), ``column`` (one column
+    generator, ``table.column``), ``assemble`` (zipping columns into tuples),
+    ``ids`` (``_get_ids`` queries), ``batch_insert`` (one ``_batch_insert``
+    call), ``statement`` (one executemany or LOAD DATA) and ``commit``, or
+    ``generate`` for a table built without per-column timings. Callers
+    only touch the profiler when one is configured, so an unprofiled run pays
+    for an ``is None`` check per statement and nothing per value.
+
+    With ``cprofile`` every thread run under ``thread()`` gets its own
+    cProfile.Profile, merged into one pstats.Stats at the end; with ``memory``
+    tracemalloc runs between ``start()`` and ``stop()`` and leaves a snapshot.
+    """
+
+    def __init__(self, cprofile=False, memory=False):
+        self.cprofile = cprofile
+        self.memory = memory
+        self.timings = {}  # (section, name): [calls, seconds, rows]
+        self.profiles = []
+        self.snapshot = None
+        self._lock = threading.Lock()
+
+    def add(self, section, name, seconds, rows=0):
+        with self._lock:
+            entry = self.timings.setdefault((section, name), [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += rows
+
+    def merge(self, timings):
+        """Add the timings of another profiler, such as a shard worker's"""
+        with self._lock:
+            for key, (calls, seconds, rows) in timings.items():
+                entry = self.timings.setdefault(key, [0, 0.0, 0])
+                entry[0] += calls
+                entry[1] += seconds
+                entry[2] += rows
+
+    def timed(self, section, name, fn):
+        """Wrap fn so every call is recorded; the length of its result counts as rows"""
+        def timed(*args):
+            started = time.perf_counter()
+            result = fn(*args)
+            self.add(section, name, time.perf_counter() - started, len(result))
+            return result
+        return timed
+
+    def thread(self, fn):
+        """Wrap fn so each call runs under its own cProfile.Profile when cProfile is on"""
+        if not self.cprofile:
+            return fn
+
+        def profiled(*args):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Python 3.12+ allows one active profiler; this thread goes unprofiled
+                return fn(*args)
+            try:
+                return fn(*args)
+            finally:
+                profile.disable()
+                with self._lock:
+                    self.profiles.append(profile)
+        return profiled
+
+    def start(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self):
+        if self.memory and tracemalloc.is_tracing():
+            self.snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+    def stats(self):
+        """The merged cProfile statistics, or None without cProfile"""
+        if not self.profiles:
+            return None
+        stats = pstats.Stats(self.profiles[0], stream=io.StringIO())
+        for profile in self.profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def rows(self):
+        """One dict per (section, name), by section and slowest first"""
+        result = [{"section": section, "name": name, "calls": calls, "seconds": round(seconds, 4), "rows": rows,
+                   "ms_per_call": round(seconds / calls * 1000, 3) if calls else 0.0,
+                   "rows_per_s": round(rows / seconds) if seconds and rows else 0}
+                  for (section, name), (calls, seconds, rows) in self.timings.items()]
+        return sorted(result, key=lambda r: (r["section"], -r["seconds"]))
+
+    def functions(self, top=15):
+        """The functions with the most time of their own under cProfile"""
+        stats = self.stats()
+        if stats is None:
+            return []
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+        return [{"function": pstats.func_std_string(func), "calls": nc, "tottime": round(tt, 4), "cumtime": round(ct, 4)}
+                for func, (cc, nc, tt, ct, callers) in entries]
+
+    def allocations(self, top=10):
+        """Source lines holding the most memory when the snapshot was taken"""
+        if self.snapshot is None:
+            return []
+        # Modules imported lazily during the run are not the generator's memory
+        snapshot = self.snapshot.filter_traces([tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                                                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>")])
+        return [{"line": str(stat.traceback[0]), "size_kib": round(stat.size / 1024, 1), "blocks": stat.count}
+                for stat in snapshot.statistics("lineno")[:top]]
+
+    def dump(self, stats_path=None, snapshot_path=None):
+        """Write the cProfile statistics (for pstats/snakeviz) and the tracemalloc snapshot"""
+        stats = self.stats()
+        if stats_path and stats is not None:
+            stats.dump_stats(stats_path)
+        if snapshot_path and self.snapshot is not None:
+            self.snapshot.dump(snapshot_path)
+
+    def report(self, top=15):
+        """Print the timings per section, then the top cProfile functions and allocation sites"""
+        if not self.timings:
+            return
+        print(f"{'section':<14}{'name':<32}{'calls':>8}{'seconds':>10}{'ms/call':>10}{'rows':>10}{'rows/s':>11}")
+        for r in self.rows():
+            print(f"{r['section']:<14}{r['name']:<32}{r['calls']:>8}{r['seconds']:>10.3f}{r['ms_per_call']:>10.3f}"
+                  f"{r['rows']:>10}{r['rows_per_s']:>11}")
+        functions = self.functions(top)
+        if functions:
+            print(f"\n{'tottime':>9}{'cumtime':>9}{'calls':>10}  function")
+            for f in functions:
+                print(f"{f['tottime']:>9.3f}{f['cumtime']:>9.3f}{f['calls']:>10}  {f['function']}")
+        allocations = self.allocations()
+        if allocations:
+            print(f"\n{'KiB':>10}{'blocks':>9}  allocated at")
+            for a in allocations:
+                print(f"{a['size_kib']:>10}{a['blocks']:>9}  {a['line']}")
@@ -0,0 +1,108 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+
+class TableScheduler:
+    """Loads tables in foreign-key order, several at a time when they are independent.
+
+    ``dependencies`` maps each table to the tables it references. A table is
+    ready once all of those (among the tables being loaded) are done, and ready
+    tables start in declaration order on up to ``concurrency`` threads. Each
+    load is recorded in ``timeline`` as seconds since the run started: when its
+    parents were done (``ready``), when it started and when it ended.
+
+    With ``early``, a table is ready as soon as each parent's step has called
+    keyed(), announcing that the parent's keys are reserved, so a child can be
+    generated while its parent is still being written. That suits targets
+    that do not check foreign keys as rows arrive.
+    """
+
+    def __init__(self, dependencies, concurrency=1, early=False):
+        self.dependencies = dependencies
+        self.concurrency = max(1, concurrency)
+        self.early = early
+        self.timeline = {}
+        self._started = None
+        # Tables whose keys are reserved, with when that happened
+        self._keyed = {}
+        self._lock = threading.Lock()
+        self._wake = Future()
+
+    def keyed(self, table):
+        """Called from a running step once `table`'s keys are reserved; with `early` its children may start"""
+        with self._lock:
+            self._keyed[table] = time.perf_counter() - self._started
+            if not self._wake.done():
+                self._wake.set_result(table)
+
+    def _available(self, parent, done):
+        """When `parent` stopped holding back its children, or None while it still does"""
+        keyed = self._keyed.get(parent) if self.early else None
+        if parent in done:
+            end = self.timeline[parent]["end"]
+            return end if keyed is None else min(end, keyed)
+        return keyed
+
+    def run(self, steps):
+        """Run {table: step()} and return the timeline; the first failing step's error is raised"""
+        self._started = time.perf_counter()
+        self.timeline, self._keyed = {}, {}
+        pending, running, done = list(steps), {}, set()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="table") as executor:
+            while pending or running:
+                # Re-armed before looking at the keyed tables, so a keyed() from now on wakes the wait below
+                with self._lock:
+                    if self._wake.done():
+                        self._wake = Future()
+                for table in list(pending):
+                    if len(running) >= self.concurrency:
+                        break
+                    parents = self.dependencies.get(table, set()) & set(steps)
+                    available = [self._available(p, done) for p in parents]
+                    if None not in available:
+                        pending.remove(table)
+                        ready = max(available, default=0.0)
+                        running[executor.submit(self._timed, table, steps[table], ready)] = table
+                if not running:
+                    raise ValueError(f"Foreign keys form a cycle between {', '.join(pending)}")
+                finished, _ = wait([*running, self._wake], return_when=FIRST_COMPLETED)
+                for future in finished:
+                    if future in running:
+                        done.add(running.pop(future))
+                        future.result()
+        return self.timeline
+
+    def _timed(self, table, step, ready):
+        start = time.perf_counter() - self._started
+        try:
+            step()
+        finally:
+            self.timeline[table] = {"ready": ready, "start": start, "end": time.perf_counter() - self._started,
+                                    "thread": threading.current_thread().name}
+
+    def critical_path(self):
+        """The chain of tables, each waiting on the previous one, that ends with the last table to finish"""
+        if not self.timeline:
+            return []
+        table = max(self.timeline, key=lambda t: self.timeline[t]["end"])
+        path = [table]
+        while True:
+            parents = self.dependencies.get(table, set()) & set(self.timeline)
+            if not parents:
+                return path[::-1]
+            table = max(parents, key=lambda t: self.timeline[t]["end"])
+            path.append(table)
+
+    def report(self, width=40):
+        """Print the timeline as a bar chart with the critical path"""
+        if not self.timeline:
+            return
+        total = max(t["end"] for t in self.timeline.values()) or 1e-9
+        path = self.critical_path()
+        print(f"{'table':<16}{'ready s':>9}{'start s':>9}{'end s':>9}  timeline")
+        for table, t in sorted(self.timeline.items(), key=lambda item: item[1]["start"]):
+            first, last = int(t["start"] / total * width), max(int(t["end"] / total * width), int(t["start"] / total * width) + 1)
+            bar = " " * first + ("#" if table in path else "=") * (last - first)
+            print(f"{table:<16}{t['ready']:>9.2f}{t['start']:>9.2f}{t['end']:>9.2f}  |{bar:<{width}}|")
+        print(f"Critical path ({total:.2f}s): {' -> '.join(path)}")
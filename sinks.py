@@ -0,0 +1,271 @@
+import glob
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+COLUMN_DEF = re.compile(r"^\s*(\w+)\s+([A-Z]+)(?:\((\d+)(?:,\s*(\d+))?\))?", re.M)
+TABLE_NAME = re.compile(r"CREATE TABLE IF NOT EXISTS (\w+)")
+DDL_LINE = re.compile(r"(\w+)\s+([A-Z]+)(?:\([\d,\s]+\))?(.*)")
+FOREIGN_KEY = re.compile(r"FOREIGN KEY \((\w+)\)")
+
+
+def arrow_type(sql_type, precision=None, scale=None):
+    """Arrow type for a MySQL column type from the domain DDL"""
+    if sql_type in ('INT', 'INTEGER', 'MEDIUMINT', 'SMALLINT', 'TINYINT'):
+        return pa.int32()
+    if sql_type == 'BIGINT':
+        return pa.int64()
+    if sql_type == 'DECIMAL':
+        return pa.decimal128(int(precision or 10), int(scale or 0))
+    if sql_type == 'DATE':
+        return pa.date32()
+    if sql_type in ('DATETIME', 'TIMESTAMP'):
+        return pa.timestamp('s')
+    if sql_type == 'TIME':
+        return pa.time32('s')
+    if sql_type == 'BOOLEAN':
+        return pa.bool_()
+    return pa.string()
+
+
+def ddl_types(schema):
+    """{table: {column: arrow type}} for every CREATE TABLE statement of a domain"""
+    tables = {}
+    for ddl in schema:
+        columns = {}
+        for name, sql_type, precision, scale in COLUMN_DEF.findall(ddl):
+            if name not in ('CREATE', 'FOREIGN', 'PRIMARY', 'UNIQUE', 'INDEX', 'KEY'):
+                columns[name] = arrow_type(sql_type, precision, scale)
+        tables[TABLE_NAME.search(ddl).group(1)] = columns
+    return tables
+
+
+def _time(value):
+    if isinstance(value, str):
+        return time.fromisoformat(value)
+    if isinstance(value, timedelta):
+        # MySQL drivers return TIME columns as a duration since midnight
+        return (datetime.min + value).time()
+    return value
+
+
+def arrow_column(values, arrow_t):
+    """Arrow array of one column, from generated Python values or values read back from MySQL"""
+    if pa.types.is_time(arrow_t):
+        values = [_time(v) for v in values]
+    if pa.types.is_decimal(arrow_t) and not isinstance(next((v for v in values if v is not None), None), Decimal):
+        # Floats are not exact in binary; round to the column's scale the way MySQL stores them
+        return pc.cast(pc.round(pa.array(values, pa.float64()), arrow_t.scale), arrow_t, safe=False)
+    return pa.array(values).cast(arrow_t)
+
+
+class NullSink:
+    """Consumes the generated rows and keeps nothing, to measure generation on its own"""
+
+    def prepare(self, table):
+        pass
+
+    def write(self, table, shard, columns, batches):
+        return sum(len(batch) for batch in batches)
+
+
+class ParquetSink:
+    """Writes each table as Parquet files under ``output_dir/<table>/``.
+
+    Every shard becomes one ``part-NNNNN.parquet`` file, so worker processes
+    write in parallel without coordination. Rows are buffered only up to
+    ``row_group_rows`` and flushed as one row group, so tables larger than
+    memory stream straight to disk. Column types come from the DDL; string
+    columns that look low-cardinality in the first row group (``status``,
+    ``currency`` and the like) are dictionary-encoded.
+    """
+
+    def __init__(self, output_dir, schema, row_group_rows=50000, compression='snappy'):
+        self.output_dir = output_dir
+        self.types = ddl_types(schema)
+        self.row_group_rows = row_group_rows
+        self.compression = compression
+
+    def prepare(self, table):
+        """Clear the part files of a previous run before a table's shards are written"""
+        path = os.path.join(self.output_dir, table)
+        os.makedirs(path, exist_ok=True)
+        for part in glob.glob(os.path.join(path, 'part-*.parquet')):
+            os.remove(part)
+
+    def write(self, table, shard, columns, batches):
+        """Write one shard of row tuples; returns the number of rows written"""
+        schema = pa.schema([(c, self.types[table].get(c, pa.string())) for c in columns])
+        path = os.path.join(self.output_dir, table, f"part-{shard:05d}.parquet")
+        writer, pending, written = None, [], 0
+        for batch in batches:
+            pending.extend(batch)
+            if len(pending) >= self.row_group_rows:
+                writer = self._flush(writer, path, schema, pending)
+                written += len(pending)
+                pending = []
+        if pending or writer is None:
+            writer = self._flush(writer, path, schema, pending)
+            written += len(pending)
+        writer.close()
+        return written
+
+    def _flush(self, writer, path, schema, rows):
+        values = list(zip(*rows)) if rows else [[] for _ in schema]
+        group = pa.Table.from_arrays([arrow_column(v, f.type) for v, f in zip(values, schema)], schema=schema)
+        if writer is None:
+            writer = pq.ParquetWriter(path, schema, compression=self.compression,
+                                      use_dictionary=self._dictionary_columns(schema, values))
+        writer.write_table(group, row_group_size=max(len(rows), 1))
+        return writer
+
+    @staticmethod
+    def _dictionary_columns(schema, values):
+        # Few distinct values relative to the rows: dictionary pages beat plain encoding
+        return [f.name for f, v in zip(schema, values)
+                if pa.types.is_string(f.type) and len(v) and len(set(v)) <= max(16, len(v) // 10)]
+
+
+def sqlite_type(sql_type):
+    """SQLite column type for a MySQL type; dates and times are stored as ISO 8601 text"""
+    if sql_type in ('INT', 'INTEGER', 'BIGINT', 'MEDIUMINT', 'SMALLINT', 'TINYINT', 'BOOLEAN'):
+        return 'INTEGER'
+    if sql_type in ('DECIMAL', 'NUMERIC'):
+        return 'NUMERIC'
+    if sql_type in ('FLOAT', 'DOUBLE', 'REAL'):
+        return 'REAL'
+    return 'TEXT'
+
+
+def sqlite_schema(ddl):
+    """SQLite CREATE TABLE for one statement of the domain DDL, and the CREATE INDEX statements to run after the load.
+
+    AUTO_INCREMENT keys become INTEGER PRIMARY KEY (the rowid). UNIQUE
+    constraints become unique indexes and each foreign key column gets an
+    index, as InnoDB would create, so no index is maintained row by row
+    during the load.
+    """
+    table = TABLE_NAME.search(ddl).group(1)
+    lines, indexes = [], []
+    for line in ddl.splitlines()[1:-1]:
+        line = line.strip().rstrip(',')
+        foreign = FOREIGN_KEY.match(line)
+        if foreign:
+            lines.append(line)
+            indexes.append(f"CREATE INDEX IF NOT EXISTS ix_{table}_{foreign.group(1)} ON {table} ({foreign.group(1)})")
+            continue
+        name, sql_type, rest = DDL_LINE.match(line).groups()
+        if 'AUTO_INCREMENT' in rest:
+            lines.append(f"{name} INTEGER PRIMARY KEY")
+            continue
+        if ' UNIQUE' in rest:
+            rest = rest.replace(' UNIQUE', '')
+            indexes.append(f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{table}_{name} ON {table} ({name})")
+        rest = rest.replace('DEFAULT TRUE', 'DEFAULT 1').replace('DEFAULT FALSE', 'DEFAULT 0')
+        lines.append(f"{name} {sqlite_type(sql_type)}{rest}")
+    body = ",\n    ".join(lines)
+    return f"CREATE TABLE IF NOT EXISTS {table} (\n    {body}\n)", indexes
+
+
+# Explicit adapters: the sqlite3 defaults for dates are deprecated, and Decimal has none
+sqlite3.register_adapter(datetime, lambda v: v.isoformat(' '))
+sqlite3.register_adapter(date, lambda v: v.isoformat())
+sqlite3.register_adapter(time, lambda v: v.isoformat())
+sqlite3.register_adapter(Decimal, str)
+
+
+class SQLiteSink:
+    """Writes a domain into one SQLite database file, set up for a bulk load.
+
+    The tables are created from the translated DDL without their indexes.
+    While loading, the database runs in WAL mode with ``synchronous=OFF`` and
+    rows go in one transaction per ``chunk_rows``. ``finish()`` then builds
+    the indexes, runs ANALYZE and switches back to a rollback journal, which
+    leaves a single self-contained ``.db`` file. Worker processes and table
+    threads share the file; each process opens its own connection on first
+    use, and writes are serialized by a lock within a process and by SQLite's
+    busy timeout across processes.
+    """
+
+    def __init__(self, path, schema, chunk_rows=50000):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.tables = {TABLE_NAME.search(ddl).group(1): sqlite_schema(ddl) for ddl in schema}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Every run starts a fresh file
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Worker processes get the settings, not this process's connection
+        state = dict(self.__dict__)
+        state['_conn'] = state['_lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-65536")  # KiB
+            self._conn = conn
+        return self._conn
+
+    def prepare(self, table):
+        with self._lock:
+            self._connection().execute(self.tables[table][0])
+
+    def write(self, table, shard, columns, batches):
+        """Insert one shard of row tuples, a transaction per chunk; returns the number of rows written"""
+        statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        pending, written = [], 0
+        for batch in batches:
+            pending.extend(batch)
+            if len(pending) >= self.chunk_rows:
+                self._insert(statement, pending)
+                written += len(pending)
+                pending = []
+        if pending:
+            self._insert(statement, pending)
+            written += len(pending)
+        return written
+
+    def _insert(self, statement, rows):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(statement, rows)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def finish(self):
+        """Build the indexes and fold the write-ahead log back into the database file"""
+        with self._lock:
+            conn = self._connection()
+            for _, indexes in self.tables.values():
+                for sql in indexes:
+                    conn.execute(sql)
+            conn.execute("ANALYZE")
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.close()
+            self._conn = None
@@ -0,0 +1,223 @@
+import re
+
+import numpy as np
+
+from columns import to_rows
+
+_WIDTH = re.compile(r"(?:VAR)?CHAR\((\d+)\)")
+
+
+class Generator:
+    """Column generator spec; ``bind`` resolves it to ``make(start, n, parent_keys, row)``"""
+    sources = ()  # columns it reads from the row being built
+
+
+class Draw(Generator):
+    """A column drawn from the ColumnEngine: ``fn(cols, n)`` returns ``n`` values"""
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def bind(self, gen, table, column):
+        fn = self.fn
+        return lambda start, n, parents, row: fn(gen.cols, n)
+
+
+def draw(method, *args, **kwargs):
+    """Shorthand for a ColumnEngine method called as ``method(*args, n, **kwargs)``"""
+    return Draw(lambda cols, n: getattr(cols, method)(*args, n, **kwargs))
+
+
+class Choice(Generator):
+    """A category from a fixed list, uniform unless the run's skew weights ``table.column``"""
+
+    def __init__(self, values):
+        self.values = values
+
+    def bind(self, gen, table, column):
+        values, skew = self.values, gen.skew.get(f"{table.name}.{column.name}")
+        if skew is None:
+            return lambda start, n, parents, row: gen.cols.choice(values, n)
+        skew = skew.over(values)
+        return lambda start, n, parents, row: gen.cols.skewed(values, skew, n)
+
+
+class Fake(Generator):
+    """Faker provider values, cut to the column width; ``map`` reshapes each value first"""
+
+    def __init__(self, provider, *args, map=None):
+        self.provider = provider
+        self.args = args
+        self.map = map
+
+    def bind(self, gen, table, column):
+        provider, args, fn, width = self.provider, self.args, self.map, column.width
+        if fn is None:
+            return lambda start, n, parents, row: gen._faker_column(provider, n, width, *args)
+        if width is None:
+            return lambda start, n, parents, row: [fn(v) for v in gen._faker_column(provider, n, None, *args)]
+        return lambda start, n, parents, row: [fn(v)[:width] for v in gen._faker_column(provider, n, None, *args)]
+
+
+class Sequence(Generator):
+    """Fixed values taken in row order, for small lookup tables"""
+
+    def __init__(self, values):
+        self.values = values
+
+    def bind(self, gen, table, column):
+        values = self.values
+        return lambda start, n, parents, row: values[start:start + n]
+
+
+class Derived(Generator):
+    """Computed from columns listed before it: ``fn(*those columns)``"""
+
+    def __init__(self, fn, *sources):
+        self.fn = fn
+        self.sources = sources
+
+    def bind(self, gen, table, column):
+        fn, sources = self.fn, self.sources
+        return lambda start, n, parents, row: fn(*[row[s] for s in sources])
+
+
+class Unique(Generator):
+    """A UniqueValues format (``code``, ``iban``, ``vin``...) keyed by ``table.column``.
+
+    Values encode the row's index in the whole table (``gen.row_base`` plus the
+    batch offset), so rows added to an existing table do not repeat its values.
+    """
+
+    def __init__(self, kind, *args):
+        self.kind = kind
+        self.args = args
+
+    def bind(self, gen, table, column):
+        stream, kind, args = f"{table.name}.{column.name}", self.kind, self.args
+        return lambda start, n, parents, row: getattr(gen.uniques, kind)(stream, gen.row_base + start, n, *args)
+
+
+class UniqueEmail(Generator):
+    """Collision-free emails built from the first and last name columns"""
+
+    def __init__(self, first, last):
+        self.sources = (first, last)
+
+    def bind(self, gen, table, column):
+        stream, (first, last) = f"{table.name}.{column.name}", self.sources
+        return lambda start, n, parents, row: gen.uniques.email(stream, gen.row_base + start, row[first], row[last])
+
+
+class Column:
+    def __init__(self, name, sql_type, gen=None, unique=False, default=None, references=None):
+        self.name = name
+        self.sql_type = sql_type
+        self.gen = gen
+        self.unique = unique
+        self.default = default
+        # "table" or "table.column"; without a generator the column samples the parent's keys
+        self.references = references
+        match = _WIDTH.fullmatch(sql_type)
+        self.width = int(match.group(1)) if match else None
+
+    @property
+    def parent(self):
+        return self.references.split(".")[0] if self.references else None
+
+    def ddl(self):
+        parts = [self.name, self.sql_type]
+        if self.unique:
+            parts.append("UNIQUE")
+        if self.default is not None:
+            parts.append(f"DEFAULT {self.default}")
+        return " ".join(parts)
+
+
+class Table:
+    """One table: its columns in INSERT order, how many rows to make and how they relate to parents.
+
+    ``rows`` fixes the row count, otherwise it is ``scale`` times the run's row
+    limit. ``fanout=(parent, low, high)`` builds the table per parent row
+    instead, with low..high rows each (order items per order).
+    """
+
+    def __init__(self, name, pk, columns, rows=None, scale=1, fanout=None):
+        self.name = name
+        self.pk = pk
+        self.columns = columns
+        self.rows = rows
+        self.scale = scale
+        self.fanout = fanout
+        self.parents = list(dict.fromkeys(c.parent for c in columns if c.parent))
+
+    def row_count(self, row_limit):
+        return self.rows if self.rows is not None else row_limit * self.scale
+
+    def ddl(self, keys):
+        """CREATE TABLE statement; `keys` maps table names to primary keys for REFERENCES clauses"""
+        lines = [f"{self.pk} INT AUTO_INCREMENT PRIMARY KEY"] + [c.ddl() for c in self.columns]
+        for c in self.columns:
+            if c.references:
+                parent, _, key = c.references.partition(".")
+                lines.append(f"FOREIGN KEY ({c.name}) REFERENCES {parent}({key or keys[parent]})")
+        body = ",\n    ".join(lines)
+        return f"CREATE TABLE IF NOT EXISTS {self.name} (\n    {body}\n)"
+
+    def insert(self):
+        names = ", ".join(c.name for c in self.columns)
+        return f"INSERT INTO {self.name} ({names}) VALUES ({', '.join(['%s'] * len(self.columns))})"
+
+
+def compile_builder(table, gen, assemble=to_rows):
+    """Batch builder ``build(start, n, *parent_keys[, sizes])`` for a table, bound to a DataGenerator.
+
+    Each column's generator is resolved to a closure once, with its width,
+    provider and arguments fixed, so building a batch is one vectorized call
+    per column and no per-value dispatch. Parent keys arrive in
+    ``table.parents`` order; fanout tables also get the per-parent row counts,
+    and ``start``/``n`` then count parent rows. ``assemble`` turns the finished
+    columns into row tuples.
+    """
+    seen, makers = set(), []
+    for column in table.columns:
+        spec = column.gen
+        missing = [s for s in getattr(spec, "sources", ()) if s not in seen]
+        if missing:
+            raise ValueError(f"{table.name}.{column.name} uses {', '.join(missing)} before it is generated")
+        if table.fanout and isinstance(spec, (Unique, UniqueEmail, Sequence)):
+            raise ValueError(f"{table.name}.{column.name}: row-indexed generators need a table built per row")
+        makers.append(_parent_keys(gen, table, column) if spec is None else spec.bind(gen, table, column))
+        seen.add(column.name)
+    names = [c.name for c in table.columns]
+    if gen.profiler is not None:
+        # Decided once here, so unprofiled builders carry no timing code at all
+        makers = [gen.profiler.timed("column", f"{table.name}.{name}", make) for name, make in zip(names, makers)]
+        assemble = gen.profiler.timed("assemble", table.name, assemble)
+    expand = None
+    if table.fanout:
+        expand = next(i for i, c in enumerate(table.columns) if c.parent == table.fanout[0])
+
+    def build(start, n, *parents):
+        # For fanout tables start and n count parent rows and m the child rows they expand to
+        m = n if expand is None else int(parents[-1][start:start + n].sum())
+        row = {}
+        for i, (name, make) in enumerate(zip(names, makers)):
+            row[name] = make(start, n if i == expand else m, parents, row)
+        return assemble(*row.values())
+
+    build.__name__ = table.name
+    return build
+
+
+def _parent_keys(gen, table, column):
+    index = table.parents.index(column.parent)
+    skew = gen.skew.get(f"{table.name}.{column.name}")
+    if table.fanout and column.parent == table.fanout[0]:
+        if skew is not None:
+            raise ValueError(f"{table.name}.{column.name} follows its parent rows one by one and cannot be skewed")
+        # Every parent row in the batch gets its share of child rows
+        return lambda start, n, parents, row: np.repeat(parents[index][start:start + n], parents[-1][start:start + n])
+    if skew is not None:
+        return lambda start, n, parents, row: gen.cols.skewed(parents[index], skew, n)
+    return lambda start, n, parents, row: gen.cols.choice(parents[index], n)
@@ -0,0 +1,487 @@
+import json
+import os
+import re
+import socket
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+from faker import Faker
+from mysql.connector import Error
+
+from domains import DOMAINS
+from pools import FakerPool
+
+RATE = re.compile(r"(\d+(?:\.\d+)?)(?:/([smh]))?")
+BURST = re.compile(r"(\d+(?:\.\d+)?)x(\d+(?:\.\d+)?)s?/(\d+(?:\.\d+)?)s?")
+PER = {"s": 1, "m": 60, "h": 3600}
+
+
+def parse_rate(text):
+    """Events per second from '5000', '5000/s', '300/m' or '10000/h'"""
+    match = RATE.fullmatch(text.strip())
+    if match is None or not float(match.group(1)):
+        raise ValueError(f"invalid rate {text!r}; use N/s, N/m or N/h with N > 0")
+    return float(match.group(1)) / PER[match.group(2) or "s"]
+
+
+def parse_burst(text):
+    """(factor, seconds, period) from 'FACTORxSECONDS/PERIOD', such as '5x2s/30s'"""
+    match = BURST.fullmatch(text.strip())
+    if match is None:
+        raise ValueError(f"invalid burst {text!r}; use FACTORxSECONDS/PERIOD, e.g. 5x2s/30s")
+    factor, seconds, period = (float(g) for g in match.groups())
+    if not 0 < seconds <= period:
+        raise ValueError(f"invalid burst {text!r}: the burst must fit in its period")
+    return factor, seconds, period
+
+
+class RateProfile:
+    """Target events per second at `t` seconds into a stream.
+
+    A constant `rate`, reached linearly from zero over the first `ramp`
+    seconds; with `burst=(factor, seconds, period)` the last `seconds` of every
+    `period` run at `factor` times the rate.
+    """
+
+    def __init__(self, rate, ramp=0.0, burst=None):
+        self.base = rate
+        self.ramp = ramp
+        self.burst = burst
+
+    def rate(self, t):
+        rate = self.base if t >= self.ramp else self.base * t / self.ramp
+        if self.burst is not None:
+            factor, seconds, period = self.burst
+            if t % period >= period - seconds:
+                rate *= factor
+        return rate
+
+    @property
+    def peak(self):
+        return self.base * (self.burst[0] if self.burst else 1)
+
+
+class TokenBucket:
+    """Paces a stream to a RateProfile.
+
+    Tokens accrue with the clock at the profile's current rate and each event
+    spends one. take() sleeps until about a tick's worth is due and hands them
+    out together, so thousands of events per second cost a hundred wakeups,
+    and since tokens follow the clock rather than the sleeps, oversleeping
+    does not make the rate drift. The bucket holds `backlog` seconds of
+    events; what a slow sink leaves beyond that is dropped, not made up
+    later in one burst. `due` counts every event the profile has called for
+    so far, dropped or not, so a stream that falls behind shows it.
+    """
+
+    def __init__(self, profile, backlog=1.0, tick=0.01, clock=time.perf_counter):
+        self.profile = profile
+        self.backlog = max(backlog, tick)
+        self.tick = tick
+        self.clock = clock
+        self.started = self.last = clock()
+        self.tokens = 0.0
+        self.due = 0.0
+
+    def elapsed(self):
+        return self.clock() - self.started
+
+    def _refill(self):
+        now = self.clock()
+        t0, t1 = self.last - self.started, now - self.started
+        # Midpoint rule: exact for a constant rate, and ticks are short next to ramps and bursts
+        accrued = self.profile.rate((t0 + t1) / 2) * (t1 - t0)
+        self.tokens += accrued
+        self.due += accrued
+        self.last = now
+        self.tokens = min(self.tokens, max(self.profile.rate(t1) * self.backlog, 1.0))
+        return t1
+
+    def missed(self, sent):
+        """Events due by now that `sent` falls short of"""
+        self._refill()
+        return max(int(self.due - sent), 0)
+
+    def take(self, limit):
+        """Wait for due events and take up to `limit`: (count, seconds the oldest of them has been due)"""
+        while True:
+            rate = self.profile.rate(self._refill())
+            want = min(limit, max(1.0, rate * self.tick))
+            if self.tokens >= want:
+                n = int(min(self.tokens, limit))
+                waited = self.tokens / rate if rate else 0.0
+                self.tokens -= n
+                return n, waited
+            # At most a tick, so a ramp's rising rate is picked up
+            time.sleep(min((want - self.tokens) / rate, self.tick) if rate else self.tick)
+
+
+def _second(now):
+    return now.replace(microsecond=0)
+
+
+class InsertStream:
+    """New rows of `table`, one per event, with the `clock` columns set from the time they are sent.
+
+    With `child`, a table built per row of this one (order items per order),
+    each event also carries that row's child rows.
+    """
+
+    def __init__(self, table, clock, child=None):
+        self.table = table
+        self.clock = clock
+        self.child = child
+
+    def events(self, source, n, now):
+        table = source.tables[self.table]
+        keys = source.keys(table, n)
+        rows = source.rows(table, keys, n, *[source.spans[p] for p in table.parents])
+        batches = [("insert", table.name, source.columns(table), _stamp(rows, source.columns(table), self.clock, now))]
+        if self.child is not None:
+            child = source.tables[self.child]
+            parent, low, high = child.fanout
+            engine = source.gen._engine(child.name, 'fanout')
+            if source.gen.seed is not None:
+                engine = engine.at(keys.start - 1)
+            sizes = engine.integers(low, high, n).astype(np.min_scalar_type(high))
+            parents = [keys if p == parent else source.spans[p] for p in child.parents]
+            rows = source.rows(child, source.keys(child, int(sizes.sum())), n, *parents, sizes)
+            batches.append(("insert", child.name, source.columns(child), rows))
+        return batches
+
+
+class StatusStream:
+    """Changes of `column` on existing rows of `table` to one of `values`;
+    `stamps` maps a value to a column set to the time it is sent (delivered shipments)"""
+
+    def __init__(self, table, column, values, stamps=None):
+        self.table = table
+        self.column = column
+        self.values = values
+        self.stamps = stamps or {}
+
+    def events(self, source, n, now):
+        table = source.tables[self.table]
+        cols = source.gen._engine(self.table, self.column, 'stream')
+        if source.gen.seed is not None:
+            cols = cols.at(source.sent)
+        keys = cols.choice(source.spans[self.table], n).tolist()
+        values = cols.choice(self.values, n).tolist()
+        batches = []
+        for value in self.values:
+            rows = [(key, v) for key, v in zip(keys, values) if v == value]
+            columns = [table.pk, self.column]
+            if value in self.stamps:
+                columns.append(self.stamps[value])
+                rows = [(*row, _second(now)) for row in rows]
+            batches.append(("update", table.name, columns, rows))
+        return batches
+
+
+STREAMS = {
+    'fintech': InsertStream('transactions', {'txn_date': _second}),
+    'ecommerce': InsertStream('orders', {'order_date': _second}, child='order_items'),
+    'logistics': StatusStream('shipments', 'status', ['In-Transit', 'Delivered'], {'Delivered': 'actual_delivery'}),
+    'hr': InsertStream('attendance', {'date': lambda now: now.date(),
+                                      'check_in': lambda now: now.time().replace(microsecond=0)}),
+}
+
+
+def _stamp(rows, columns, clock, now):
+    """Rows with the clock columns replaced by the send time"""
+    stamps = [(columns.index(name), fn(now)) for name, fn in clock.items()]
+    result = []
+    for row in rows:
+        row = list(row)
+        for index, value in stamps:
+            row[index] = value
+        result.append(tuple(row))
+    return result
+
+
+class EventSource:
+    """Builds a domain's stream events with a DataGenerator's compiled table builders.
+
+    Foreign keys reference the key ranges of the dataset the events belong
+    to: the tables of the generator's database, read as MIN/MAX like
+    --append, or without a connection the dataset of ``gen.row_limit`` rows
+    that the same seed generates. New rows take the keys after it, reserved
+    `block` at a time in MySQL. With a seed, a row's values follow from its
+    key, so streamed rows continue the seeded dataset and its UNIQUE columns.
+    A generator without a Faker pool gets one of `pool_size` values per
+    provider: reseeding Faker for every row caps a stream at about 1500
+    events per second.
+    """
+
+    def __init__(self, gen, domain, block=10000, pool_size=1000):
+        if domain not in STREAMS:
+            raise ValueError(f"no event stream for {domain}; streams exist for {', '.join(STREAMS)}")
+        gen.domain = domain
+        if gen.pool is None and pool_size:
+            gen.pool_size, gen.pool = pool_size, FakerPool(Faker(), pool_size, gen.seed)
+        self.gen = gen
+        self.stream = STREAMS[domain]
+        self.tables = {table.name: table for table in DOMAINS[domain]}
+        self.block = block
+        self.spans = self._spans() if gen.conn is not None else self._virtual_spans()
+        self.free = {}
+        self.sent = 0
+        stream = self.tables[self.stream.table]
+        needed = stream.parents if isinstance(self.stream, InsertStream) else [stream.name]
+        empty = [name for name in needed if not len(self.spans[name])]
+        if empty:
+            raise ValueError(f"no rows in {', '.join(empty)}; generate the {domain} dataset first")
+
+    def _spans(self):
+        return {name: self.gen._key_span(name, table.pk) for name, table in self.tables.items()}
+
+    def _virtual_spans(self):
+        spans = {}
+        for name, table in self.tables.items():
+            if table.fanout is None:
+                spans[name] = range(1, table.row_count(self.gen.row_limit) + 1)
+                continue
+            # Same per-parent sizes as the generator draws, so new keys start after the last one
+            parent, low, high = table.fanout
+            sizes = self.gen._engine(name, 'fanout').integers(low, high, len(spans[parent]))
+            spans[name] = range(1, int(sizes.sum()) + 1)
+        return spans
+
+    def columns(self, table):
+        return [table.pk] + [c.name for c in table.columns]
+
+    def keys(self, table, n):
+        """The next `n` primary keys of a table"""
+        free = self.free.get(table.name)
+        if free is None and self.gen.conn is None:
+            free = range(self.spans[table.name].stop, 2 ** 31)
+        elif free is None or len(free) < n:
+            # Reserved from MAX + 1, which is where the unused end of the last block starts
+            size = max(self.block, n)
+            first = self.gen._reserve_keys(table.name, table.pk, size)
+            free = range(first, first + size)
+        self.free[table.name] = free[n:]
+        return free[:n]
+
+    def rows(self, table, keys, n, *parents):
+        """`n` units of a table built with its keys; a row's index in the table is its key - 1"""
+        gen = self.gen
+        if gen.seed is not None:
+            gen._seed_table(table.name)
+            gen.cols = gen.cols.at(keys.start - 1)
+        gen.row_base = keys.start - 1
+        return [(pk, *row) for pk, row in zip(keys, gen._builder(table.name)(0, n, *parents))]
+
+    def warm(self):
+        """Build one event and drop it, so compiling builders and building Faker pools happen before the clock starts"""
+        free, sent = dict(self.free), self.sent
+        self.stream.events(self, 1, datetime.now())
+        self.free, self.sent = free, sent
+
+    def events(self, n, now):
+        """Batches of (op, table, columns, rows) for the next `n` events"""
+        batches = self.stream.events(self, n, now)
+        self.sent += n
+        return batches
+
+
+class MySQLEventSink:
+    """Inserts and updates on the generator's connection, one transaction per chunk of events"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+
+    def send(self, batches):
+        try:
+            for op, table, columns, rows in batches:
+                if not rows:
+                    continue
+                if op == "insert":
+                    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+                else:
+                    query = f"UPDATE {table} SET {', '.join(f'{c} = %s' for c in columns[1:])} WHERE {columns[0]} = %s"
+                    rows = [(*row[1:], row[0]) for row in rows]
+                self.cursor.executemany(query, rows)
+            self.conn.commit()
+        except Error as e:
+            self.conn.rollback()
+            print(f"Error sending events: {e}", file=sys.stderr)
+            return False
+        return True
+
+    def close(self):
+        self.cursor.close()
+
+
+def _json_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+class NDJSONSink:
+    """One JSON object per event and line, flushed per chunk: op, table, send time `ts` and the row's columns"""
+
+    def __init__(self, fh, closing=()):
+        self.fh = fh
+        self.closing = closing
+
+    @staticmethod
+    def encode(batches):
+        ts = round(time.time(), 6)
+        lines = []
+        for op, table, columns, rows in batches:
+            for row in rows:
+                lines.append(json.dumps({"op": op, "table": table, "ts": ts, **dict(zip(columns, row))},
+                                        default=_json_value))
+        return "".join(line + "\n" for line in lines)
+
+    def send(self, batches):
+        self.fh.write(self.encode(batches))
+        self.fh.flush()
+        return True
+
+    def close(self):
+        for resource in self.closing:
+            resource.close()
+
+
+class RotatingFileSink:
+    """NDJSON files in `directory`, a new one every `max_bytes` or `max_seconds`.
+
+    The file being written ends in ``.part`` and is renamed when it is
+    closed, so readers picking up ``*.ndjson`` only see complete files.
+    """
+
+    def __init__(self, directory, prefix, max_bytes=64 * 2 ** 20, max_seconds=60.0):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.fh = None
+        self.path = None
+        self.size = 0
+        self.opened = 0.0
+        self.sequence = 0
+        self.files = []
+
+    def _rotate(self):
+        self.close()
+        self.sequence += 1
+        name = f"{self.prefix}-{time.strftime('%Y%m%d-%H%M%S')}-{self.sequence:05d}.ndjson"
+        self.path = os.path.join(self.directory, name)
+        self.fh = open(self.path + ".part", "wb")
+        self.size, self.opened = 0, time.monotonic()
+
+    def send(self, batches):
+        if self.fh is None or self.size >= self.max_bytes or time.monotonic() - self.opened >= self.max_seconds:
+            self._rotate()
+        data = NDJSONSink.encode(batches).encode()
+        self.fh.write(data)
+        self.size += len(data)
+        return True
+
+    def close(self):
+        if self.fh is None:
+            return
+        self.fh.close()
+        os.replace(self.path + ".part", self.path)
+        self.files.append(self.path)
+        self.fh = None
+
+
+def open_sink(target, gen, domain, rotate_bytes=64 * 2 ** 20, rotate_seconds=60.0):
+    """Event sink for a --stream-to target: mysql, stdout, socket:PATH, tcp:HOST:PORT or files:DIR"""
+    kind, _, where = target.partition(":")
+    if kind == "mysql":
+        return MySQLEventSink(gen.conn)
+    if kind == "stdout":
+        return NDJSONSink(sys.stdout)
+    if kind == "socket":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(where)
+    elif kind == "tcp":
+        host, _, port = where.rpartition(":")
+        sock = socket.create_connection((host or "localhost", int(port)))
+    elif kind == "files":
+        return RotatingFileSink(where, domain, rotate_bytes, rotate_seconds)
+    else:
+        raise ValueError(f"unknown stream target {target!r}; use mysql, stdout, socket:PATH, tcp:HOST:PORT or files:DIR")
+    fh = sock.makefile("w", encoding="utf-8")
+    return NDJSONSink(fh, closing=(fh, sock))
+
+
+class StreamMeter:
+    """Events sent, and every `every` seconds a line with the target and achieved rate, the lag and
+    the events missed: those due by then that have not been sent"""
+
+    def __init__(self, bucket, every=5.0, out=sys.stderr):
+        self.bucket = bucket
+        self.every = every
+        self.out = out
+        self.sent = 0
+        self.failed = 0
+        # Seconds spent building and sending events, for how many fit in the time left
+        self.busy = 0.0
+        self.max_lag = 0.0
+        self.window = (0.0, 0, 0.0)  # start, events sent before it, its max lag
+
+    def record(self, n, ok, lag, busy):
+        self.sent += n
+        self.busy += busy
+        if not ok:
+            self.failed += n
+        self.max_lag = max(self.max_lag, lag)
+        start, before, window_lag = self.window
+        self.window = (start, before, max(window_lag, lag))
+        now = self.bucket.elapsed()
+        if self.every and now - start >= self.every:
+            self.report(now)
+
+    def report(self, now):
+        start, before, lag = self.window
+        achieved = (self.sent - before) / (now - start) if now > start else 0.0
+        print(f"{now:>8.1f}s  target {self.bucket.profile.rate(now):>9.0f}/s  achieved {achieved:>9.0f}/s  "
+              f"sent {self.sent:>10}  max lag {lag * 1000:>8.1f} ms  missed {self.bucket.missed(self.sent):>8}",
+              file=self.out, flush=True)
+        self.window = (now, self.sent, 0.0)
+
+    def summary(self):
+        seconds = self.bucket.elapsed()
+        return {
+            "seconds": round(seconds, 3),
+            "sent": self.sent,
+            "failed": self.failed,
+            "missed": self.bucket.missed(self.sent),
+            "rate": round(self.sent / seconds, 1) if seconds else 0.0,
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+        }
+
+
+def run_stream(source, sink, profile, duration=None, limit=None, backlog=1.0, chunk=10000, report_every=5.0):
+    """Send events paced to `profile` until `duration` seconds or `limit` events, or an interrupt.
+
+    Lag is how long the oldest event of a chunk had been due when the sink
+    finished with it. Progress goes to stderr, which keeps stdout for events.
+    """
+    source.warm()
+    bucket = TokenBucket(profile, backlog)
+    meter = StreamMeter(bucket, report_every)
+    try:
+        while (duration is None or bucket.elapsed() < duration) and (limit is None or meter.sent < limit):
+            most = chunk if limit is None else min(chunk, limit - meter.sent)
+            if duration is not None and meter.busy:
+                # No more than the events sent so far say fit in the time left, so the last chunk ends on time
+                most = min(most, max(int((duration - bucket.elapsed()) * meter.sent / meter.busy), 1))
+            n, waited = bucket.take(most)
+            started = time.perf_counter()
+            ok = sink.send(source.events(n, datetime.now()))
+            busy = time.perf_counter() - started
+            meter.record(n, ok, waited + busy, busy)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        sink.close()
+    return meter.summary()
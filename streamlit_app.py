@@ -2,12 +2,25 @@ import streamlit as st
 import pandas as pd
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.pooling import MySQLConnectionPool, PoolError, CNX_POOL_MAXSIZE
 from faker import Faker
 import random
 import io
+import csv
+import tempfile
+import zipfile
 from datetime import datetime, timedelta
 import os
+import time
+import pyarrow as pa
+import pyarrow.parquet as pq
 from dotenv import load_dotenv
+from sinks import arrow_type, arrow_column, SQLiteSink
+from profiling import Profiler
+from cache import DatasetCache, table_batches, table_columns, table_parts
+from summaries import RunSummary
+from jobs import Job, JobRegistry
+import data_generation
 
 load_dotenv()
 
@@ -17,30 +30,93 @@ DB_CONFIG = {
     "host": os.getenv("DB_HOST", "localhost"),
     "user": os.getenv("DB_USER", "root"),
     "password": os.getenv("DB_PASSWORD", "Mysql123"),
-    "port": int(os.getenv("DB_PORT", 3306))
+    "port": int(os.getenv("DB_PORT", 3306)),
+    "pool_size": int(os.getenv("DB_POOL_SIZE", 5))
 }
 
+# Seconds to wait for a free pooled connection before giving up
+POOL_CHECKOUT_TIMEOUT = 10
+
 DOMAINS = ['ecommerce', 'fintech', 'healthcare', 'education', 'logistics', 'hr']
 
+# Rows per fetch when exporting; only one chunk of a table is in memory at a time
+EXPORT_CHUNK_ROWS = 20000
+
+# Export archives and SQLite databases are written here on the server
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "analytics_exports")
+
+# Generation runs whose previews a session keeps, newest last
+RUNS_KEPT = 5
+
+# Generation jobs running at once on this server; more wait in a queue
+GENERATION_JOBS = int(os.getenv("GENERATION_JOBS", 2))
+
+def show(level, text):
+    """Show a message on the page; work running in a background job passes Job.log instead"""
+    getattr(st, level)(text)
+
+@st.cache_resource(show_spinner=False)
+def get_pool(host, port, user, password, database=None, pool_size=DB_CONFIG["pool_size"]):
+    """Connection pool shared by every session of the app, one per server, user and database.
+
+    The password is part of the cache key, so a session can only reuse a pool
+    it could have opened itself. A failed connect raises and is not cached.
+    """
+    config = {"host": host, "port": port, "user": user, "password": password}
+    if database:
+        config["database"] = database
+    return MySQLConnectionPool(pool_size=min(pool_size, CNX_POOL_MAXSIZE), pool_reset_session=True, **config)
+
 class DatabaseManager:
-    def __init__(self, config):
+    def __init__(self, config, notify=show):
         self.config = config
+        self.notify = notify
         self.conn = None
         self.cursor = None
     
     def connect(self):
         try:
-            self.conn = mysql.connector.connect(**self.config)
+            pool = get_pool(self.config["host"], self.config.get("port", DB_CONFIG["port"]), self.config["user"],
+                            self.config["password"], self.config.get("database"),
+                            self.config.get("pool_size", DB_CONFIG["pool_size"]))
+            self.conn = self._checkout(pool)
             self.cursor = self.conn.cursor()
             return True
         except Error as e:
-            st.error(f"Database connection error: {e}")
+            self.notify("error", f"Database connection error: {e}")
             return False
+
+    @staticmethod
+    def _checkout(pool):
+        # get_connection pings the connection it hands out and reconnects it if the server
+        # dropped it while idle; it fails at once when all are in use, so wait for one to return
+        deadline = time.monotonic() + POOL_CHECKOUT_TIMEOUT
+        while True:
+            try:
+                return pool.get_connection()
+            except PoolError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
     
     def disconnect(self):
-        if self.conn and self.conn.is_connected():
-            self.cursor.close()
+        """Return the connection to its pool"""
+        if self.conn is None:
+            return
+        try:
+            if self.cursor:
+                self.cursor.close()
+            if self.conn.unread_result:
+                self.conn.consume_results()
+        except Error:
+            pass
+        try:
             self.conn.close()
+        except Error:
+            # The session reset failed on a dead connection; it is back in the pool and reconnected on checkout
+            pass
+        self.conn = None
+        self.cursor = None
     
     def create_database(self, db_name):
         try:
@@ -49,7 +125,7 @@ class DatabaseManager:
             self.conn.commit()
             return True
         except Error as e:
-            st.error(f"Error creating database: {e}")
+            self.notify("error", f"Error creating database: {e}")
             return False
     
     def execute_query(self, query):
@@ -58,7 +134,7 @@ class DatabaseManager:
             self.conn.commit()
             return True
         except Error as e:
-            st.error(f"Query execution error: {e}")
+            self.notify("error", f"Query execution error: {e}")
             return False
     
     def fetch_data(self, query):
@@ -68,9 +144,39 @@ class DatabaseManager:
             data = self.cursor.fetchall()
             return pd.DataFrame(data, columns=columns)
         except Error as e:
-            st.error(f"Fetch error: {e}")
+            self.notify("error", f"Fetch error: {e}")
             return None
 
+    def list_tables(self):
+        """Data tables of the current database, without the generator's _-prefixed bookkeeping tables"""
+        try:
+            self.cursor.execute("SHOW TABLES")
+            return [t for (t,) in self.cursor.fetchall() if not t.startswith('_')]
+        except Error as e:
+            self.notify("error", f"Error listing tables: {e}")
+            return []
+
+    def column_types(self, db_name, table):
+        """(column, Arrow type) pairs for a table, from information_schema"""
+        self.cursor.execute(
+            "SELECT COLUMN_NAME, DATA_TYPE, COLUMN_TYPE, NUMERIC_PRECISION, NUMERIC_SCALE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION", (db_name, table))
+        return [(name, arrow_type('BOOLEAN' if column_type == 'tinyint(1)' else data_type.upper(), precision, scale))
+                for name, data_type, column_type, precision, scale in self.cursor.fetchall()]
+
+    def iter_chunks(self, query, size):
+        """Yield lists of up to `size` rows from an unbuffered cursor"""
+        cursor = self.conn.cursor(buffered=False)
+        try:
+            cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+
 class SchemaManager:
     @staticmethod
     def get_schema(domain):
@@ -155,10 +261,16 @@ class SchemaManager:
         return schemas.get(domain, [])
 
 class DataGenerator:
-    def __init__(self, db_manager, row_limit):
+    def __init__(self, db_manager, row_limit, profiler=None, summary=None, notify=show):
         self.db = db_manager
+        self.notify = notify
         self.row_limit = row_limit
         self.batch_size = 500
+        self.profiler = profiler
+        # RunSummary of the rows as they are inserted, for previews that need no queries
+        self.summary = summary
+        # A table's rows are built between the previous database call and its _batch_insert
+        self._mark = time.perf_counter()
     
     def _truncate(self, value, length):
         if isinstance(value, str) and len(value) > length:
@@ -166,26 +278,49 @@ class DataGenerator:
         return value
     
     def _batch_insert(self, query, data):
+        table = query.split()[2]
+        started = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.add("generate", table, started - self._mark, len(data))
         if not data:
             return
-        for i in range(0, len(data), self.batch_size):
+        chunks = (data[i:i + self.batch_size] for i in range(0, len(data), self.batch_size))
+        if self.summary is not None:
+            columns = [c.strip() for c in data_generation.INSERT_TARGET.match(query).group(2).split(',')]
+            # The rows were built since the previous database call, so that is when the table started
+            self.summary.table(table, columns).started = self._mark
+            chunks = self.summary.observe(table, columns, chunks)
+        for rows in chunks:
             try:
-                self.db.cursor.executemany(query, data[i:i + self.batch_size])
+                inserting = time.perf_counter()
+                self.db.cursor.executemany(query, rows)
+                committing = time.perf_counter()
                 self.db.conn.commit()
+                if self.profiler is not None:
+                    self.profiler.add("statement", table, committing - inserting, len(rows))
+                    self.profiler.add("commit", table, time.perf_counter() - committing)
             except Error as e:
-                st.error(f"Batch insert error: {e}")
+                self.notify("error", f"Batch insert error: {e}")
+        self._mark = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.add("batch_insert", table, self._mark - started, len(data))
     
     def _get_ids(self, table, col):
+        started = time.perf_counter()
         try:
             self.db.cursor.execute(f"SELECT {col} FROM {table}")
             result = [x[0] for x in self.db.cursor.fetchall()]
             return result
         except Error as e:
-            st.error(f"Error fetching IDs: {e}")
+            self.notify("error", f"Error fetching IDs: {e}")
             return []
+        finally:
+            self._mark = time.perf_counter()
+            if self.profiler is not None:
+                self.profiler.add("ids", table, self._mark - started)
     
     def generate_ecommerce(self):
-        st.info("Generating ecommerce data...")
+        self.notify("info", "Generating ecommerce data...")
         
         cats = []
         for _ in range(20):
@@ -199,7 +334,7 @@ class DataGenerator:
         cat_ids = self._get_ids('categories', 'category_id')
         
         if not cat_ids:
-            st.error("Failed to generate categories")
+            self.notify("error", "Failed to generate categories")
             return
         
         prods = []
@@ -234,7 +369,7 @@ class DataGenerator:
         cust_ids = self._get_ids('customers', 'customer_id')
         
         if not cust_ids:
-            st.error("Failed to generate customers")
+            self.notify("error", "Failed to generate customers")
             return
         
         orders = []
@@ -255,7 +390,7 @@ class DataGenerator:
         
         order_ids = self._get_ids('orders', 'order_id')
         if not order_ids or not prod_ids:
-            st.error("Failed to generate orders")
+            self.notify("error", "Failed to generate orders")
             return
         
         items = []
@@ -267,17 +402,350 @@ class DataGenerator:
                 items.append((oid, pid, qty, u_price, qty * u_price, 0, 'None'))
         self._batch_insert("INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price, discount_applied, return_status) VALUES (%s, %s, %s, %s, %s, %s, %s)", items)
         
-        st.success("Ecommerce data generated successfully!")
+        self.notify("success", "Ecommerce data generated successfully!")
+
+def _export_csv(db, table, columns, entry):
+    text = io.TextIOWrapper(entry, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(columns)
+    for rows in db.iter_chunks(f"SELECT * FROM {table}", EXPORT_CHUNK_ROWS):
+        writer.writerows(rows)
+    text.flush()
+    text.detach()
+
+def _export_parquet(db, table, schema, entry):
+    with pq.ParquetWriter(entry, schema) as writer:
+        for rows in db.iter_chunks(f"SELECT * FROM {table}", EXPORT_CHUNK_ROWS):
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays([arrow_column(c, f.type) for c, f in zip(columns, schema)], schema=schema))
+
+def export_domain(db, db_name, fmt, progress=None):
+    """Stream every table of a domain database into a zip archive on disk and return its path.
+
+    Each table is read in chunks from an unbuffered cursor and written straight
+    into its archive entry (deflated CSV, or Parquet with one row group per chunk),
+    so memory stays flat however large the tables are.
+    """
+    tables = db.list_tables()
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    path = os.path.join(EXPORT_DIR, f"{db_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{fmt}.zip")
+    # Parquet pages are already compressed, so only CSV entries are deflated
+    compression = zipfile.ZIP_DEFLATED if fmt == "csv" else zipfile.ZIP_STORED
+    with zipfile.ZipFile(path, "w", compression=compression, allowZip64=True) as archive:
+        for idx, table in enumerate(tables):
+            types = db.column_types(db_name, table)
+            with archive.open(f"{table}.{fmt}", "w", force_zip64=True) as entry:
+                if fmt == "csv":
+                    _export_csv(db, table, [name for name, _ in types], entry)
+                else:
+                    _export_parquet(db, table, pa.schema(types), entry)
+            if progress:
+                progress((idx + 1) / len(tables), table)
+    return path
+
+def export_cached(directory, tables, fmt, progress=None):
+    """Zip a cached dataset's tables straight from its Parquet files, without reading the database"""
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    path = os.path.join(EXPORT_DIR, f"{os.path.basename(directory)[:12]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{fmt}.zip")
+    compression = zipfile.ZIP_DEFLATED if fmt == "csv" else zipfile.ZIP_STORED
+    with zipfile.ZipFile(path, "w", compression=compression, allowZip64=True) as archive:
+        for idx, table in enumerate(tables):
+            parts = table_parts(directory, table)
+            with archive.open(f"{table}.{fmt}", "w", force_zip64=True) as entry:
+                if fmt == "csv":
+                    text = io.TextIOWrapper(entry, encoding="utf-8", newline="")
+                    writer = csv.writer(text)
+                    writer.writerow(pq.read_schema(parts[0]).names)
+                    for rows in table_batches(directory, table, EXPORT_CHUNK_ROWS):
+                        writer.writerows(rows)
+                    text.flush()
+                    text.detach()
+                else:
+                    # One shard file at a time, each a row group of the exported table
+                    with pq.ParquetWriter(entry, pq.read_schema(parts[0])) as writer:
+                        for part in parts:
+                            writer.write_table(pq.read_table(part))
+            if progress:
+                progress((idx + 1) / len(tables), table)
+    return path
+
+def summarize_cached(domain, directory):
+    """RunSummary of a cached dataset, read from its Parquet files for a database that already holds it"""
+    summary = RunSummary(domain, f"analytics_{domain} (already loaded)")
+    for table in data_generation.SchemaManager.get_tables(domain):
+        for batch in summary.observe(table.name, table_columns(directory, table.name), table_batches(directory, table.name)):
+            pass
+    return summary
+
+def store_run(summary):
+    """Keep a run's summary in the session under its ID, so reruns show it without touching the database"""
+    runs = st.session_state.setdefault("runs", {})
+    runs[summary.id] = summary
+    for run_id in list(runs)[:-RUNS_KEPT]:
+        del runs[run_id]
+    st.session_state["run"] = summary.id
+
+def show_run(summary):
+    """Row counts, sampled rows and column statistics recorded while the run generated its tables"""
+    st.header(f"Data Preview - {summary.domain.capitalize()}")
+    st.caption(f"Run {summary.id}: {summary.target}, {summary.created.strftime('%Y-%m-%d %H:%M:%S')}. "
+               f"Rows are a random sample of each table, kept during generation.")
+    if not summary.tables:
+        st.info("This run generated no rows")
+        return
+    st.dataframe(pd.DataFrame(summary.row_counts()), hide_index=True)
+    for name, table in summary.tables.items():
+        st.subheader(name.replace("_", " ").title())
+        columns, rows = table.preview()
+        st.dataframe(pd.DataFrame(rows, columns=columns), hide_index=True)
+        with st.expander(f"Column statistics ({table.rows} rows)"):
+            st.dataframe(pd.DataFrame(table.stats()), hide_index=True)
+
+def show_profile(profiler):
+    """Timings per table, statement, commit and ID query, plus cProfile hot spots and allocations when collected"""
+    with st.expander("Generation profile", expanded=True):
+        st.dataframe(pd.DataFrame(profiler.rows()), hide_index=True)
+        functions = profiler.functions()
+        if functions:
+            st.subheader("Hot functions (cProfile)")
+            st.dataframe(pd.DataFrame(functions), hide_index=True)
+        allocations = profiler.allocations()
+        if allocations:
+            st.subheader("Allocations (tracemalloc)")
+            st.dataframe(pd.DataFrame(allocations), hide_index=True)
+
+def expected_rows(domain, row_count):
+    """Rows each table of a domain should get, for job progress; fanout tables at their average fanout"""
+    rows = {}
+    for table in data_generation.SchemaManager.get_tables(domain):
+        if table.fanout:
+            parent, low, high = table.fanout
+            rows[table.name] = int(rows[parent] * (low + high) / 2)
+        else:
+            rows[table.name] = table.row_count(row_count)
+    return rows
+
+def read_file(path):
+    """The file's bytes, for a download button that reads its file only when clicked"""
+    with open(path, "rb") as fh:
+        return fh.read()
+
+def sqlite_path(domain):
+    return os.path.join(EXPORT_DIR, f"analytics_{domain}.db")
+
+def run_generation(job, db_config, domain, row_count, profiler=None):
+    """Job: create the domain database and tables and generate fresh random rows into them"""
+    db_name = f"analytics_{domain}"
+    db = DatabaseManager(db_config, job.log)
+    if not db.connect():
+        return
+    try:
+        if not db.create_database(db_name):
+            return
+        job.phase = "Creating tables"
+        for sql in SchemaManager.get_schema(domain):
+            if not db.execute_query(sql):
+                job.log("error", "Failed to create table")
+                return
+
+        summary = RunSummary(domain, db_name)
+        job.track(summary, "Generating data")
+        gen = DataGenerator(db, row_count, profiler, summary, job.log)
+
+        if domain == 'ecommerce':
+            if profiler is None:
+                gen.generate_ecommerce()
+            else:
+                profiler.start()
+                try:
+                    profiler.thread(gen.generate_ecommerce)()
+                finally:
+                    profiler.stop()
+                job.result["profile"] = profiler
+
+        job.log("success", f"Data generation completed for {domain}!")
+        job.result.update(run=summary, cached_dataset=None)
+    finally:
+        db.disconnect()
+
+def run_cached_generation(job, db_config, domain, row_count, seed, profiler=None):
+    """Job: fill analytics_<domain> with a seeded dataset from the dataset cache, generating it into the cache on a miss"""
+    db_name = f"analytics_{domain}"
+    db = DatabaseManager(db_config, job.log)
+    if not db.connect():
+        return
+    try:
+        if not db.create_database(db_name):
+            return
+        job.phase = "Creating tables"
+        for sql in data_generation.SchemaManager.get_schema(domain):
+            if not db.execute_query(sql):
+                return
+        summary = RunSummary(domain, f"{db_name}, seed {seed}")
+        gen = data_generation.DataGenerator(db.conn, row_count, seed=seed, profiler=profiler, summary=summary)
+        cache = DatasetCache()
+        directory = cache.path(data_generation.cache_key(domain, row_count, seed))
+        if not gen.is_empty(domain) and cache.get(os.path.basename(directory)) is not None and gen.holds(domain, directory):
+            job.log("success", f"{db_name} already holds the {domain} dataset for seed {seed}")
+            job.result.update(run=summarize_cached(domain, directory), cached_dataset=(domain, directory))
+            return
+        if not gen.is_empty(domain):
+            job.log("error", f"{db_name} already has rows, and cached rows come with their own keys. "
+                             f"Drop the database first, or set the seed to 0 to add fresh random rows.")
+            return
+        if profiler is not None:
+            profiler.start()
+        try:
+            # On a miss the dataset is generated into the cache first, then loaded from there
+            building = RunSummary(domain, f"dataset cache, seed {seed}")
+            job.track(building, "Generating into the dataset cache")
+            directory, hit = data_generation.cached_dataset(cache, domain, row_count, seed, profiler=profiler,
+                                                            summary=building)
+            job.track(summary, f"Loading into {db_name}")
+            gen.restore(domain, directory)
+        except Error as e:
+            job.log("error", f"Error loading the cached dataset: {e}")
+            return
+        finally:
+            if profiler is not None:
+                profiler.stop()
+                job.result["profile"] = profiler
+        job.log("success", f"Loaded {domain} for seed {seed} from the dataset cache" if hit else
+                           f"Data generation completed for {domain}; seed {seed} is now cached")
+        job.result.update(run=summary, cached_dataset=(domain, directory))
+    finally:
+        db.disconnect()
+
+def run_sqlite_generation(job, domain, row_count, seed=0, profiler=None):
+    """Job: generate a domain into a SQLite database file on the server, with no MySQL server involved;
+    a seeded dataset comes from the dataset cache"""
+    path = sqlite_path(domain)
+    sink = SQLiteSink(path, data_generation.SchemaManager.get_schema(domain))
+    summary = RunSummary(domain, os.path.basename(path) + (f", seed {seed}" if seed else ""))
+    gen = data_generation.DataGenerator(None, row_count, seed=seed or None, sink=sink, profiler=profiler, summary=summary)
+    directory = None
+    if profiler is not None:
+        profiler.start()
+    try:
+        if seed:
+            building = RunSummary(domain, f"dataset cache, seed {seed}")
+            job.track(building, "Generating into the dataset cache")
+            directory, _ = data_generation.cached_dataset(DatasetCache(), domain, row_count, seed, profiler=profiler,
+                                                          summary=building)
+            job.track(summary, f"Loading into {os.path.basename(path)}")
+            gen.restore(domain, directory)
+        else:
+            job.track(summary, f"Generating into {os.path.basename(path)}")
+            gen.generate(domain)
+        sink.finish()
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            job.result["profile"] = profiler
+    job.log("success", f"Data generation completed for {domain}!")
+    job.result.update(run=summary, sqlite_db=path, cached_dataset=(domain, directory) if directory else None)
+
+@st.cache_resource(show_spinner=False)
+def get_jobs():
+    """The job registry of this server process, shared by every session"""
+    return JobRegistry(GENERATION_JOBS)
+
+def submit_generation(registry, target, db_config, domain, row_count, seed, profiler=None):
+    """Queue a generation job and remember it in the session and in the page URL, which survives a reload"""
+    if target == "SQLite file":
+        path = sqlite_path(domain)
+        job = Job(f"{domain} into {os.path.basename(path)}", f"sqlite:{path}", expected_rows(domain, row_count))
+        work = lambda job: run_sqlite_generation(job, domain, row_count, seed, profiler)
+    else:
+        db_name = f"analytics_{domain}"
+        job = Job(f"{domain} into {db_name}", f"mysql://{db_config['host']}:{db_config['port']}/{db_name}",
+                  expected_rows(domain, row_count) if seed or SchemaManager.get_schema(domain) else {})
+        if seed:
+            work = lambda job: run_cached_generation(job, db_config, domain, row_count, seed, profiler)
+        else:
+            work = lambda job: run_generation(job, db_config, domain, row_count, profiler)
+    if seed:
+        job.name += f", seed {seed}"
+    try:
+        registry.submit(job, work)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    ids = session_jobs(registry)
+    ids.append(job.id)
+    st.query_params["jobs"] = ",".join(ids)
+
+def session_jobs(registry):
+    """IDs of this session's jobs still in the registry, oldest first, including those named in the URL"""
+    ids = st.session_state.setdefault("jobs", [])
+    for job_id in st.query_params.get("jobs", "").split(","):
+        if job_id and job_id not in ids:
+            ids.append(job_id)
+    ids[:] = [job_id for job_id in ids if registry.get(job_id) is not None]
+    return ids
+
+def adopt_finished(registry):
+    """Take over the results of this session's jobs that finished since the last run"""
+    adopted = st.session_state.setdefault("adopted", set())
+    for job_id in session_jobs(registry):
+        job = registry.get(job_id)
+        if job.active or job_id in adopted:
+            continue
+        adopted.add(job_id)
+        for key, value in job.result.items():
+            if key == "run":
+                store_run(value)
+            else:
+                st.session_state[key] = value
+
+def show_jobs(registry):
+    """This session's generation jobs, refreshed every second while any of them is queued or running"""
+    ids = session_jobs(registry)
+    if not ids:
+        return
+    active = any(registry.get(job_id).active for job_id in ids)
+    st.fragment(run_every=1.0 if active else None)(_job_panel)(registry, list(ids))
+
+def _job_panel(registry, ids):
+    st.header("Generation Jobs")
+    jobs = registry.list()
+    st.caption(f"{sum(j.state == 'running' for j in jobs)} running and {sum(j.state == 'queued' for j in jobs)} "
+               f"queued on this server, across all sessions")
+    adopted = st.session_state.get("adopted", set())
+    for job_id in reversed(ids):
+        job = registry.get(job_id)
+        if job is None:
+            continue
+        if not job.active and job_id not in adopted:
+            # Rerun the whole page so it picks up the finished job's previews, profile and files
+            st.rerun()
+        with st.container(border=True):
+            st.markdown(f"**{job.name}** · `{job.id}` · {job.phase} · {job.elapsed():.0f}s")
+            st.progress(job.fraction())
+            progress = job.progress()
+            if progress:
+                st.dataframe(pd.DataFrame(progress), hide_index=True)
+            for level, text in job.messages:
+                show(level, text)
+            if job.active and st.button("Cancel", key=f"cancel-{job.id}"):
+                job.cancel()
 
 def main():
     st.set_page_config(page_title="Data Generation Platform", layout="wide")
     st.title("Data Generation & Analytics Platform")
     
     st.sidebar.header("Database Configuration")
+
+    target = st.sidebar.radio("Target", ["MySQL server", "SQLite file"], horizontal=True,
+                              help="SQLite writes each domain to one .db file on this machine; no server needed")
     
-    host = st.sidebar.text_input("Database Host", value=os.getenv("DB_HOST", "localhost"))
-    user = st.sidebar.text_input("Database User", value=os.getenv("DB_USER", "root"))
-    password = st.sidebar.text_input("Database Password", value=os.getenv("DB_PASSWORD", "Mysql123"), type="password")
+    host = st.sidebar.text_input("Database Host", value=DB_CONFIG["host"])
+    port = st.sidebar.number_input("Database Port", min_value=1, max_value=65535, value=DB_CONFIG["port"])
+    user = st.sidebar.text_input("Database User", value=DB_CONFIG["user"])
+    password = st.sidebar.text_input("Database Password", value=DB_CONFIG["password"], type="password")
+    pool_size = st.sidebar.number_input("Connection Pool Size", min_value=1, max_value=CNX_POOL_MAXSIZE,
+                                        value=min(DB_CONFIG["pool_size"], CNX_POOL_MAXSIZE))
+    db_config = {"host": host, "port": int(port), "user": user, "password": password, "pool_size": int(pool_size)}
     
     domain = st.sidebar.selectbox(
         "Select Domain",
@@ -293,6 +761,16 @@ def main():
         step=10
     )
     
+    seed = st.sidebar.number_input(
+        "Seed", min_value=0, value=0, step=1,
+        help="0 makes fresh random data. Any other seed makes the same dataset every time: it is generated once "
+             "into the dataset cache and loaded from there afterwards"
+    )
+
+    profile = st.sidebar.checkbox("Profile generation", help="Time each table, INSERT statement, commit and ID query")
+    deep_profile = st.sidebar.checkbox("Include cProfile and allocations", disabled=not profile,
+                                       help="Slower: also runs cProfile and tracemalloc during generation")
+
     col1, col2 = st.sidebar.columns(2)
     
     with col1:
@@ -302,7 +780,6 @@ def main():
         generate_button = st.sidebar.button("Generate Data")
     
     if test_conn:
-        db_config = {"host": host, "user": user, "password": password}
         db = DatabaseManager(db_config)
         if db.connect():
             st.sidebar.success("Database connection successful!")
@@ -310,72 +787,79 @@ def main():
         else:
             st.sidebar.error("Failed to connect to database")
     
+    # Generation runs on background threads, so it goes on through reruns, reloads and other sessions' work
+    registry = get_jobs()
     if generate_button:
-        db_config = {"host": host, "user": user, "password": password}
-        db = DatabaseManager(db_config)
-        
-        if db.connect():
-            db_name = f"analytics_{domain}"
-            
-            if db.create_database(db_name):
-                schema = SchemaManager.get_schema(domain)
-                
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                for idx, sql in enumerate(schema):
-                    status_text.text(f"Creating tables... {idx + 1}/{len(schema)}")
-                    if not db.execute_query(sql):
-                        st.error(f"Failed to create table")
-                        db.disconnect()
-                        return
-                    progress_bar.progress((idx + 1) / len(schema))
-                
-                status_text.text("Generating data...")
-                gen = DataGenerator(db, row_count)
-                
-                if domain == 'ecommerce':
-                    gen.generate_ecommerce()
-                
-                st.success(f"Data generation completed for {domain}!")
-                
-                st.header(f"Data Preview - {domain.capitalize()}")
-                
-                if domain == 'ecommerce':
-                    df_products = db.fetch_data("SELECT * FROM products LIMIT 10")
-                    if df_products is not None:
-                        st.subheader("Products")
-                        st.dataframe(df_products)
-                    
-                    df_customers = db.fetch_data("SELECT * FROM customers LIMIT 10")
-                    if df_customers is not None:
-                        st.subheader("Customers")
-                        st.dataframe(df_customers)
-                    
-                    df_orders = db.fetch_data("SELECT * FROM orders LIMIT 10")
-                    if df_orders is not None:
-                        st.subheader("Orders")
-                        st.dataframe(df_orders)
-                
-                st.header("Export Data")
-                
-                if domain == 'ecommerce':
-                    df_export = db.fetch_data("SELECT * FROM products")
-                    if df_export is not None:
-                        csv_buffer = io.StringIO()
-                        df_export.to_csv(csv_buffer, index=False)
-                        csv_data = csv_buffer.getvalue()
-                        
-                        st.download_button(
-                            label="Download Products CSV",
-                            data=csv_data,
-                            file_name=f"products_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                            mime="text/csv"
-                        )
-                
+        profiler = Profiler(cprofile=deep_profile, memory=deep_profile) if profile else None
+        submit_generation(registry, target, db_config, domain, row_count, seed, profiler)
+    adopt_finished(registry)
+    show_jobs(registry)
+
+    if profile and "profile" in st.session_state:
+        show_profile(st.session_state["profile"])
+
+    runs = st.session_state.get("runs", {})
+    if runs:
+        ids = list(runs)
+        run_id = st.selectbox("Run", ids[::-1], index=ids[::-1].index(st.session_state["run"]),
+                              format_func=lambda i: f"{i} - {runs[i].domain} - {runs[i].target}") if len(ids) > 1 else ids[0]
+        show_run(runs[run_id])
+
+    sqlite_db = st.session_state.get("sqlite_db")
+    if target == "SQLite file" and sqlite_db and os.path.exists(sqlite_db):
+        st.download_button(
+            label=f"Download {os.path.basename(sqlite_db)}",
+            data=lambda: read_file(sqlite_db),
+            file_name=os.path.basename(sqlite_db),
+            mime="application/vnd.sqlite3",
+            on_click="ignore"
+        )
+        st.caption(f"Database on the server: {sqlite_db}")
+
+    st.header("Export Data")
+    export_format = st.radio("Export format", ["CSV", "Parquet"], horizontal=True)
+
+    cached = st.session_state.get("cached_dataset")
+    from_cache = bool(cached) and cached[0] == domain and os.path.isdir(cached[1])
+    if from_cache:
+        st.caption("The last generated dataset is exported from the dataset cache, without reading the database")
+
+    if st.button(f"Export all {domain.capitalize()} tables"):
+        db_name = f"analytics_{domain}"
+        db = DatabaseManager({**db_config, "database": db_name})
+        if from_cache or db.connect():
+            previous = st.session_state.get("export_archive")
+            if previous and os.path.exists(previous):
+                os.remove(previous)
+            progress_bar = st.progress(0)
+            status_text = st.empty()
+
+            def report(done, table):
+                progress_bar.progress(done)
+                status_text.text(f"Exported {table}")
+
+            try:
+                if from_cache:
+                    tables = [table.name for table in data_generation.SchemaManager.get_tables(domain)]
+                    st.session_state["export_archive"] = export_cached(cached[1], tables, export_format.lower(), report)
+                else:
+                    st.session_state["export_archive"] = export_domain(db, db_name, export_format.lower(), report)
+            except Error as e:
+                st.error(f"Export error: {e}")
+            finally:
                 db.disconnect()
-        else:
-            st.error("Failed to connect to database")
+
+    archive = st.session_state.get("export_archive")
+    if archive and os.path.exists(archive):
+        # Deferred: the archive is only read when the button is clicked, not on every rerun
+        st.download_button(
+            label=f"Download {os.path.basename(archive)}",
+            data=lambda: read_file(archive),
+            file_name=os.path.basename(archive),
+            mime="application/zip",
+            on_click="ignore"
+        )
+        st.caption(f"Archive on the server: {archive}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,152 @@
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+
+
+class RunCancelled(Exception):
+    """Raised into a run from its next batch once its RunSummary is cancelled"""
+
+
+class TableSummary:
+    """What a table's generated rows look like, recorded batch by batch as they go to the database.
+
+    Keeps the row count, a uniform reservoir sample of ``sample_rows`` rows
+    (Algorithm L, which draws random numbers only for the rows that enter
+    the sample), the min and max of every column, and value counts for the
+    string and boolean columns with at most ``max_categories`` distinct
+    values. Everything else in a batch is looked at once and dropped.
+    """
+
+    def __init__(self, columns, sample_rows=10, max_categories=50, rng=None):
+        self.columns = list(columns)
+        self.rows = 0
+        self.sample = []
+        self.sample_rows = sample_rows
+        self.max_categories = max_categories
+        self.minimum = [None] * len(self.columns)
+        self.maximum = [None] * len(self.columns)
+        # A column's counts become None once it has too many distinct values or is not categorical
+        self.counts = [Counter() for _ in self.columns]
+        self.rng = rng or random.Random()
+        # When the table started and when its last batch arrived, for rows per second
+        self.started = time.perf_counter()
+        self.updated = None
+        self._weight = None
+        self._next = None
+
+    def observe(self, batch):
+        if not batch:
+            return
+        self._sample(batch)
+        for i, values in enumerate(zip(*batch)):
+            self._extremes(i, values)
+            counts = self.counts[i]
+            if counts is not None:
+                if not isinstance(values[0], (str, bool)):
+                    self.counts[i] = None
+                    continue
+                counts.update(values)
+                if len(counts) > self.max_categories:
+                    self.counts[i] = None
+        self.rows += len(batch)
+        self.updated = time.perf_counter()
+
+    @property
+    def rate(self):
+        """Rows per second from the table's start to its latest batch"""
+        if self.updated is None or self.updated <= self.started:
+            return 0.0
+        return self.rows / (self.updated - self.started)
+
+    def _extremes(self, i, values):
+        try:
+            low, high = min(values), max(values)
+        except TypeError:
+            present = [v for v in values if v is not None]
+            if not present:
+                return
+            low, high = min(present), max(present)
+        if self.minimum[i] is None or low < self.minimum[i]:
+            self.minimum[i] = low
+        if self.maximum[i] is None or high > self.maximum[i]:
+            self.maximum[i] = high
+
+    def _skip(self):
+        # Rows to pass over before the next one that replaces a sampled row
+        return math.floor(math.log(1.0 - self.rng.random()) / math.log(1.0 - self._weight))
+
+    def _sample(self, batch):
+        k, start = self.sample_rows, self.rows
+        if len(self.sample) < k:
+            self.sample.extend(batch[:k - len(self.sample)])
+            if len(self.sample) < k:
+                return
+            self._weight = math.exp(math.log(1.0 - self.rng.random()) / k)
+            self._next = start + min(len(batch), k) + self._skip()
+        stop = start + len(batch)
+        while self._next < stop:
+            self.sample[self.rng.randrange(k)] = batch[self._next - start]
+            self._weight *= math.exp(math.log(1.0 - self.rng.random()) / k)
+            self._next += self._skip() + 1
+
+    def preview(self):
+        """The sampled rows in key order, as (columns, rows)"""
+        return self.columns, sorted(self.sample, key=lambda row: (row[0] is None, row[0]))
+
+    def stats(self, top=5):
+        """One dict per column: min, max and, for categorical columns, distinct values and the most common ones"""
+        result = []
+        for name, low, high, counts in zip(self.columns, self.minimum, self.maximum, self.counts):
+            # Display strings, so a column of mixed types still renders as one table column
+            entry = {"column": name, "min": "" if low is None else str(low), "max": "" if high is None else str(high),
+                     "distinct": "", "top values": ""}
+            # A column with no repeated value is a key or an identifier, not a category
+            if counts and len(counts) < self.rows:
+                entry["distinct"] = str(len(counts))
+                entry["top values"] = ", ".join(f"{value} {count / self.rows:.0%}" for value, count in counts.most_common(top))
+            result.append(entry)
+        return result
+
+
+class RunSummary:
+    """TableSummary of every table of one generation run, identified by `id`, in the order tables started.
+
+    Every batch of the run passes through it, so setting `cancelled` (a
+    threading.Event) stops the run with RunCancelled at its next batch.
+    """
+
+    def __init__(self, domain, target, sample_rows=10, max_categories=50, cancelled=None):
+        self.id = uuid.uuid4().hex[:8]
+        self.domain = domain
+        self.target = target
+        self.created = datetime.now()
+        self.sample_rows = sample_rows
+        self.max_categories = max_categories
+        self.tables = {}
+        self.cancelled = cancelled
+        self._lock = threading.Lock()
+
+    def table(self, name, columns):
+        with self._lock:
+            if name not in self.tables:
+                self.tables[name] = TableSummary(columns, self.sample_rows, self.max_categories)
+            return self.tables[name]
+
+    def observe(self, name, columns, batches):
+        """Pass `batches` through unchanged, recording each one in the table's summary"""
+        summary = self.table(name, columns)
+        for batch in batches:
+            self.check()
+            summary.observe(batch)
+            yield batch
+
+    def check(self):
+        if self.cancelled is not None and self.cancelled.is_set():
+            raise RunCancelled(f"{self.domain} run {self.id} was cancelled")
+
+    def row_counts(self):
+        return [{"table": name, "rows": summary.rows} for name, summary in self.tables.items()]
@@ -0,0 +1,142 @@
+"""An in-memory stand-in for a MySQL database, enough for DataGenerator and JobManifest.
+
+It understands the handful of statements they issue: INSERTs with explicit
+keys, the MIN/MAX/COALESCE key queries, ID scans and the _generation_job and
+_generation_shards bookkeeping. Changes only become visible on commit, a
+duplicate key raises IntegrityError like InnoDB, and `fail_after` makes the
+INSERT after that many fail with a lost connection, for crash tests.
+"""
+import re
+
+from mysql.connector import errors
+
+INSERT = re.compile(r"INSERT INTO (\w+)\s*\(([^)]*)\)", re.IGNORECASE)
+MAX_KEY = re.compile(r"SELECT COALESCE\(MAX\((\w+)\), 0\) \+ 1 FROM (\w+)")
+KEY_SPAN = re.compile(r"SELECT MIN\((\w+)\), MAX\((\w+)\) FROM (\w+)")
+SCAN = re.compile(r"SELECT (\w+) FROM (\w+) ORDER BY (\w+)")
+
+
+class FakeDatabase:
+    def __init__(self):
+        # Committed rows per table, keyed by their first column (the primary key)
+        self.tables = {}
+        self.columns = {}
+        self.job = None
+        self.shards = {}
+        self.fail_after = None
+        self.inserts = 0
+        # Target table of every data INSERT, in order
+        self.statements = []
+
+    def connect(self, **config):
+        return FakeConnection(self)
+
+    def rows(self, table):
+        """A table's committed rows in key order"""
+        rows = self.tables.get(table, {})
+        return [rows[key] for key in sorted(rows)]
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+        self.pending = []
+
+    def cursor(self, **options):
+        return FakeCursor(self)
+
+    def commit(self):
+        pending, self.pending = self.pending, []
+        for change in pending:
+            change()
+
+    def rollback(self):
+        self.pending = []
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        self.pending = []
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.db = conn.db
+        self.result = []
+
+    def execute(self, query, params=None):
+        db, query = self.db, " ".join(query.split())
+        self.result = []
+        if query.startswith("SELECT @@max_allowed_packet"):
+            self.result = [(64 * 2 ** 20,)]
+        elif query.startswith(("CREATE ", "ALTER ", "USE ", "SET ")):
+            pass
+        elif query.startswith("SHOW COLUMNS FROM _generation_job"):
+            self.result = [("skew",)]
+        elif query.startswith("SELECT domain, seed"):
+            self.result = [tuple(db.job)] if db.job is not None else []
+        elif query.startswith("DELETE FROM _generation_shards"):
+            self.conn.pending.append(db.shards.clear)
+        elif query.startswith("REPLACE INTO _generation_job"):
+            self.conn.pending.append(lambda: setattr(db, "job", [*params, "running"]))
+        elif query.startswith("SELECT shard, first_id, rows_done"):
+            shards = db.shards.get(params[0], {})
+            self.result = [(shard, first, done) for shard, (first, total, done) in sorted(shards.items())]
+        elif query.startswith("UPDATE _generation_shards"):
+            done, table, shard = params
+            self.conn.pending.append(lambda: db.shards[table].__setitem__(shard, (*db.shards[table][shard][:2], done)))
+        elif query.startswith("UPDATE _generation_job"):
+            self.conn.pending.append(lambda: db.job.__setitem__(-1, "done"))
+        elif MAX_KEY.match(query):
+            table = MAX_KEY.match(query).group(2)
+            self.result = [(max(db.tables.get(table, {}), default=0) + 1,)]
+        elif KEY_SPAN.match(query):
+            keys = db.tables.get(KEY_SPAN.match(query).group(3), {})
+            self.result = [(min(keys), max(keys)) if keys else (None, None)]
+        elif SCAN.match(query):
+            self.result = [(key,) for key in sorted(db.tables.get(SCAN.match(query).group(2), {}))]
+        else:
+            raise NotImplementedError(f"fake database cannot run {query[:80]!r}")
+
+    def executemany(self, query, rows):
+        db, rows = self.db, [tuple(row) for row in rows]
+        match = INSERT.match(query.strip())
+        if match is None:
+            raise NotImplementedError(f"fake database cannot run {query[:80]!r}")
+        table = match.group(1)
+        if table == "_generation_shards":
+            def add():
+                for name, shard, first, total in rows:
+                    db.shards.setdefault(name, {})[shard] = (first, total, 0)
+            self.conn.pending.append(add)
+            return
+        db.inserts += 1
+        db.statements.append(table)
+        if db.fail_after is not None and db.inserts > db.fail_after:
+            raise errors.OperationalError(msg="Lost connection (injected)", errno=2013)
+        columns = [c.strip() for c in match.group(2).split(",")]
+        existing = db.tables.setdefault(table, {})
+        duplicate = next((row[0] for row in rows if row[0] in existing), None)
+        if duplicate is not None:
+            raise errors.IntegrityError(msg=f"Duplicate entry '{duplicate}' for key '{table}.PRIMARY'", errno=1062)
+
+        def insert():
+            db.columns.setdefault(table, columns)
+            existing.update((row[0], row) for row in rows)
+        self.conn.pending.append(insert)
+
+    def fetchone(self):
+        return self.result.pop(0) if self.result else None
+
+    def fetchall(self):
+        result, self.result = self.result, []
+        return result
+
+    def fetchmany(self, size=1):
+        result, self.result = self.result[:size], self.result[size:]
+        return result
+
+    def close(self):
+        pass
@@ -0,0 +1,90 @@
+import pytest
+
+import data_generation
+from data_generation import DOMAINS, DataGenerator, _append_targets
+from fakedb import FakeDatabase
+
+SEED = 9
+
+
+@pytest.fixture(autouse=True)
+def commit_every_statement(monkeypatch):
+    monkeypatch.setitem(data_generation.DATA_GENERATION_CONFIG, "commit_seconds", 0)
+
+
+@pytest.fixture
+def db():
+    db = FakeDatabase()
+    DataGenerator(db.connect(), 200, seed=SEED).generate("ecommerce")
+    return db
+
+
+def keys(db, table):
+    return [row[0] for row in db.rows(table)]
+
+
+def column(db, table, name):
+    index = db.columns[table].index(name)
+    return [row[index] for row in db.rows(table)]
+
+
+def test_append_targets():
+    assert _append_targets("ecommerce") == ["orders"]
+    for domain in DOMAINS:
+        assert _append_targets(domain)
+
+
+def test_key_span(db):
+    gen = DataGenerator(db.connect(), 0, seed=SEED)
+    assert gen._key_span("customers", "customer_id") == range(1, 201)
+    assert gen._key_span("missing", "missing_id") == range(0)
+
+
+def test_append_continues_keys_and_references_old_rows(db):
+    before = {table.name: keys(db, table.name) for table in DOMAINS["ecommerce"]}
+    old_items = set(db.rows("order_items"))
+    gen = DataGenerator(db.connect(), 100, seed=SEED, client_keys=True)
+    gen.append("ecommerce", ["orders"], 100)
+
+    assert keys(db, "orders") == list(range(1, 301))
+    assert gen.added["orders"] == range(201, 301)
+    # Only the new orders get items, numbered on from the last item
+    items = db.rows("order_items")
+    assert old_items <= set(items)
+    new_items = [row for row in items if row not in old_items]
+    assert [row[0] for row in new_items] == list(range(len(before["order_items"]) + 1, len(items) + 1))
+    assert {row[1] for row in new_items} == set(range(201, 301))
+    # Untouched tables keep their rows, and new orders reference the existing customers
+    for table in ("categories", "products", "customers"):
+        assert keys(db, table) == before[table]
+    assert set(column(db, "orders", "customer_id")[200:]) <= set(before["customers"])
+
+
+def test_append_with_grow_parents_draws_from_old_and_new_parents(db):
+    gen = DataGenerator(db.connect(), 100, seed=SEED, client_keys=True)
+    gen.append("ecommerce", ["orders"], 100, grow_parents=True)
+
+    # customers grow with orders in their current ratio; products only feed order_items, so they stay
+    assert keys(db, "customers") == list(range(1, 301))
+    assert gen.added["customers"] == range(201, 301)
+    assert keys(db, "products") == list(range(1, 201))
+    assert "products" not in gen.added
+    new_customers = column(db, "orders", "customer_id")[200:]
+    assert min(new_customers) <= 200 < max(new_customers)
+    assert set(new_customers) <= set(range(1, 301))
+    assert {row[2] for row in db.rows("order_items") if row[1] > 200} <= set(range(1, 201))
+
+
+def test_append_twice_keeps_keys_dense(db):
+    for _ in range(2):
+        DataGenerator(db.connect(), 50, seed=SEED, client_keys=True).append("ecommerce", ["orders"], 50)
+    assert keys(db, "orders") == list(range(1, 301))
+    items = keys(db, "order_items")
+    assert items == list(range(1, len(items) + 1))
+    assert len(set(db.rows("order_items"))) == len(items)
+
+
+@pytest.mark.parametrize("table, message", [("order_items", "append to orders"), ("categories", "lookup table")])
+def test_append_refuses_derived_tables(db, table, message):
+    with pytest.raises(ValueError, match=message):
+        DataGenerator(db.connect(), 10, seed=SEED, client_keys=True).append("ecommerce", [table], 10)
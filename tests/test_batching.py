@@ -0,0 +1,99 @@
+import pytest
+
+from batching import BatchController, estimate_row_bytes, merge_summaries
+
+
+def controller(**options):
+    settings = dict(rows=1000, max_bytes=10 ** 9, target_seconds=0.2, commit_seconds=1.0, min_rows=50, max_rows=5000)
+    settings.update(options)
+    return BatchController(**settings)
+
+
+@pytest.mark.parametrize("seconds, rows", [
+    (0.05, [1500, 2250, 3375, 5000, 5000]),  # fast: grow by half up to max_rows
+    (0.2, [1000] * 5),                       # near the target: keep the size
+    (0.5, [500, 250, 125, 62, 50]),          # slow: halve down to min_rows
+])
+def test_statement_size_follows_latency(seconds, rows):
+    batches = controller()
+    sizes = []
+    for _ in rows:
+        batches.observe(batches.limit(), seconds)
+        sizes.append(batches.limit())
+    assert sizes == rows
+
+
+def test_short_tail_batches_do_not_resize():
+    batches = controller()
+    batches.observe(10, 0.001)
+    batches.observe(10, 5.0)
+    assert batches.limit() == 1000
+    assert batches.statements == 2 and batches.total_rows == 20
+
+
+def test_byte_cap_limits_rows():
+    batches = controller(max_bytes=100000)
+    batches.sample([("x" * 97,)] * 20)  # 100 bytes a row
+    assert batches.row_bytes == 100
+    assert batches.limit() == 1000
+    batches.observe(1000, 0.01)
+    assert batches.rows == 1500 and batches.limit() == 1000
+    # The width estimate is a moving average, so one wide batch only moves it part of the way
+    batches.sample([("x" * 497,)] * 20)
+    assert batches.row_bytes == pytest.approx(180)
+    assert batches.limit() == 555
+    batches.sample([("x" * 10 ** 6,)])
+    assert batches.limit() == 50  # never below min_rows, even past the byte budget
+
+
+def test_estimate_row_bytes():
+    assert estimate_row_bytes([]) == 0
+    assert estimate_row_bytes([(1, "ab", None)]) == (1 + 3) + (2 + 3) + (4 + 3)
+
+
+def test_commits_after_commit_seconds_of_inserts():
+    batches = controller(commit_seconds=1.0)
+    commits = 0
+    for seconds in [0.3, 0.3, 0.3, 0.2, 0.5, 0.6, 0.1]:
+        batches.observe(batches.limit(), seconds)
+        if batches.should_commit():
+            batches.committed()
+            commits += 1
+            assert batches.pending == 0
+    assert commits == batches.commits == 2
+    assert batches.pending == 1 and not batches.should_commit()
+
+
+def test_commit_seconds_zero_commits_every_statement():
+    batches = controller(commit_seconds=0)
+    for _ in range(3):
+        batches.observe(batches.limit(), 0.01)
+        assert batches.should_commit()
+        batches.committed()
+    assert batches.commits == 3
+
+
+def test_summary_and_reset():
+    batches = controller(rows=200)
+    batches.sample([(1, "abc")] * 4)
+    batches.observe(200, 0.5)
+    batches.observe(100, 0.25)
+    batches.committed()
+    assert batches.summary() == {"statements": 2, "commits": 1, "rows": 300, "insert_seconds": 0.75,
+                                 "batch_rows": 100, "row_bytes": 10, "latency_ms": 450.0}
+    batches.reset_counters()
+    assert batches.summary()["statements"] == batches.summary()["rows"] == 0
+    assert batches.summary()["batch_rows"] == 100
+
+
+def test_merge_summaries():
+    a = {"statements": 3, "commits": 1, "rows": 300, "insert_seconds": 0.5, "batch_rows": 100, "row_bytes": 40,
+         "latency_ms": 20.0}
+    b = {"statements": 2, "commits": 2, "rows": 150, "insert_seconds": 0.25, "batch_rows": 150, "row_bytes": 30,
+         "latency_ms": 10.0}
+    assert merge_summaries({}, a) == a and merge_summaries({}, a) is not a
+    assert merge_summaries(a, b) == {"statements": 5, "commits": 3, "rows": 450, "insert_seconds": 0.75,
+                                     "batch_rows": 150, "row_bytes": 40, "latency_ms": 20.0}
+    piped = dict(b, queued=4, queue_depth=6, producer_wait=0.5, writer_wait=0.25, pipeline_seconds=1.0, queue_max=2)
+    merged = merge_summaries(a, piped)
+    assert (merged["queued"], merged["queue_depth"], merged["producer_wait"], merged["queue_max"]) == (4, 6, 0.5, 2)
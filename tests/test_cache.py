@@ -0,0 +1,88 @@
+import os
+import time
+from datetime import date
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cache import ENTRY_FILE, DatasetCache, dataset_key, table_batches
+
+
+def fill(rows):
+    def write(directory):
+        os.makedirs(os.path.join(directory, "customers"))
+        table = pa.table({"customer_id": list(range(1, rows + 1)), "name": [f"c{i}" for i in range(rows)]})
+        pq.write_table(table, os.path.join(directory, "customers", "part-00000.parquet"))
+    return write
+
+
+def add(cache, key, rows=100, used=None):
+    """An entry of `rows` customers, last used `used` seconds ago"""
+    entry = cache.build(key, {"domain": "ecommerce"}, fill(rows))
+    if used is not None:
+        stamp = time.time() - used
+        os.utime(os.path.join(cache.path(key), ENTRY_FILE), (stamp, stamp))
+    return entry
+
+
+def keys(cache):
+    return [entry["key"] for entry in cache.entries()]
+
+
+def test_build_and_get(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=2 ** 30)
+    entry = add(cache, "a", rows=25)
+    assert entry["tables"] == {"customers": 25}
+    assert cache.get("a")["bytes"] == entry["bytes"] > 0
+    assert cache.get("missing") is None
+    assert sum(len(batch) for batch in table_batches(cache.path("a"), "customers", batch_rows=10)) == 25
+
+
+def test_prune_evicts_least_recently_used_first(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=2 ** 30)
+    size = [add(cache, key, used=used) for key, used in [("old", 300), ("mid", 200), ("new", 100)]][0]["bytes"]
+    # get() marks an entry as used, so "mid" is now the most recent
+    cache.get("mid")
+    removed = cache.prune(max_bytes=2 * size)
+    assert [entry["key"] for entry in removed] == ["old"]
+    assert keys(cache) == ["mid", "new"]
+
+
+def test_prune_does_not_skip_over_an_entry_that_does_not_fit(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=2 ** 30)
+    add(cache, "small-old", rows=10, used=300)
+    large = add(cache, "large", rows=5000, used=200)
+    add(cache, "small-new", rows=10, used=100)
+    removed = cache.prune(max_bytes=large["bytes"])
+    assert sorted(entry["key"] for entry in removed) == ["large", "small-old"]
+    assert keys(cache) == ["small-new"]
+
+
+def test_prune_by_age_and_keep(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=2 ** 30)
+    add(cache, "stale", used=3 * 86400)
+    add(cache, "kept", used=3 * 86400)
+    add(cache, "fresh", used=60)
+    removed = cache.prune(older_than=86400, keep="kept")
+    assert [entry["key"] for entry in removed] == ["stale"]
+    assert sorted(keys(cache)) == ["fresh", "kept"]
+    assert cache.prune(max_bytes=0, keep="kept") and keys(cache) == ["kept"]
+
+
+def test_build_prunes_to_max_bytes_but_keeps_the_new_entry(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=1)
+    add(cache, "first")
+    add(cache, "second")
+    assert keys(cache) == ["second"]
+
+
+def test_dataset_key_covers_what_the_rows_depend_on():
+    base = dict(domain="ecommerce", rows=100, seed=1, schema=["CREATE TABLE t (a INT)"], version="v1")
+    key = dataset_key(**base)
+    assert key == dataset_key(**base)
+    for change in [dict(rows=101), dict(seed=2), dict(domain="hr"), dict(schema=["CREATE TABLE t (b INT)"]),
+                   dict(version="v2"), dict(pool_size=50), dict(anchor=date(2026, 1, 1)),
+                   dict(skew="orders.customer_id=zipf:1")]:
+        assert dataset_key(**{**base, **change}) != key, change
+    # No pool and an empty skew are the defaults, not distinct datasets
+    assert dataset_key(**base, pool_size=None, skew=None) == key
@@ -0,0 +1,118 @@
+from datetime import datetime
+
+import pytest
+from mysql.connector import Error
+
+import data_generation
+from checkpoints import JobManifest
+from data_generation import DOMAINS, DataGenerator
+from fakedb import FakeDatabase
+from test_restore import tables
+
+DOMAIN, ROWS, SEED = "ecommerce", 250, 7
+ANCHOR = datetime(2024, 3, 1)
+
+
+@pytest.fixture(autouse=True)
+def commit_every_statement(monkeypatch):
+    monkeypatch.setitem(data_generation.DATA_GENERATION_CONFIG, "commit_seconds", 0)
+    monkeypatch.setitem(data_generation.DATA_GENERATION_CONFIG, "batch_size", 20)
+
+
+def generator(db, row_limit, seed, pool_size, now):
+    gen = DataGenerator(db.connect(), row_limit, pool_size=pool_size, seed=seed, now=now, resumable=True)
+    gen.shard_rows = 60
+    return gen
+
+
+def run(db, fail_after=None):
+    """A seeded run as main starts it, stopped by a lost connection after `fail_after` INSERTs"""
+    db.fail_after = fail_after
+    gen = generator(db, ROWS, SEED, 0, ANCHOR)
+    gen.manifest.create()
+    gen.manifest.start(DOMAIN, SEED, ROWS, 0, ANCHOR)
+    try:
+        gen.generate(DOMAIN)
+    except Error:
+        return db
+    gen.manifest.finish()
+    return db
+
+
+def resume(db):
+    """--resume: the recorded job rerun with its own settings"""
+    db.fail_after = None
+    job = JobManifest(db.connect()).job()
+    gen = generator(db, job["row_limit"], job["seed"], job["pool_size"], job["anchor"])
+    gen.generate(job["domain"])
+    gen.manifest.finish()
+    return db
+
+
+@pytest.fixture(scope="module")
+def uninterrupted():
+    db = FakeDatabase()
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setitem(data_generation.DATA_GENERATION_CONFIG, "commit_seconds", 0)
+        patch.setitem(data_generation.DATA_GENERATION_CONFIG, "batch_size", 20)
+        run(db)
+    return db
+
+
+def test_manifest_records_job_and_shards():
+    conn = FakeDatabase().connect()
+    manifest = JobManifest(conn)
+    manifest.create()
+    assert manifest.job() is None
+    manifest.start(DOMAIN, SEED, ROWS, 3, ANCHOR, "orders.customer_id=zipf:1.2")
+    assert manifest.job() == {"domain": DOMAIN, "seed": SEED, "row_limit": ROWS, "pool_size": 3, "anchor": ANCHOR,
+                              "skew": "orders.customer_id=zipf:1.2", "status": "running"}
+    manifest.add_shards("customers", [(0, 1, 60), (1, 61, 40)])
+    manifest.advance("customers", 1, 25)
+    assert manifest.shards("customers") == {0: (1, 0), 1: (61, 0)}
+    conn.commit()
+    assert manifest.shards("customers") == {0: (1, 0), 1: (61, 25)}
+    manifest.finish()
+    assert manifest.job()["status"] == "done"
+
+
+def test_uninterrupted_run_checkpoints_every_shard(uninterrupted):
+    db = uninterrupted
+    assert db.job[-1] == "done"
+    for table in DOMAINS[DOMAIN]:
+        rows = db.rows(table.name)
+        assert [row[0] for row in rows] == list(range(1, len(rows) + 1))
+        assert sum(done for _, total, done in db.shards[table.name].values()) == len(rows)
+
+
+@pytest.mark.parametrize("fraction", [0.1, 0.4, 0.7, 0.95])
+def test_resume_matches_an_uninterrupted_run(uninterrupted, fraction):
+    db = run(FakeDatabase(), int(uninterrupted.inserts * fraction))
+    assert db.job[-1] == "running"
+    assert tables(db) != tables(uninterrupted)
+    assert tables(resume(db)) == tables(uninterrupted)
+    assert db.job[-1] == "done"
+
+
+def test_resume_inside_fanout_children(uninterrupted):
+    # order_items rows are built per order, so a crash after any of its statements must resume
+    # its shard part way through an order, dropping the items of that order already committed
+    items = uninterrupted.rows("order_items")
+    first = uninterrupted.statements.index("order_items")
+    inside_an_order = False
+    for into in range(1, uninterrupted.statements.count("order_items")):
+        db = run(FakeDatabase(), first + into)
+        for first_id, total, done in db.shards["order_items"].values():
+            if 0 < done < total:
+                inside_an_order |= items[first_id + done - 2][1] == items[first_id + done - 1][1]
+        assert tables(resume(db)) == tables(uninterrupted)
+    assert inside_an_order
+
+
+def test_resume_twice(uninterrupted):
+    db = run(FakeDatabase(), uninterrupted.inserts // 3)
+    db.fail_after = db.inserts + uninterrupted.inserts // 3
+    job = JobManifest(db.connect()).job()
+    with pytest.raises(Error):
+        generator(db, job["row_limit"], job["seed"], job["pool_size"], job["anchor"]).generate(DOMAIN)
+    assert tables(resume(db)) == tables(uninterrupted)
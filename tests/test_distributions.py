@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from columns import ColumnEngine, CounterEngine
+from distributions import AliasTable, PowerLaw, Skew, Weights, Zipf, format_skew, parse_skew, parse_spec
+
+
+def outcome_probabilities(table):
+    """What each outcome gets from the table: its own column's share plus what other columns alias to it"""
+    k = len(table)
+    own = np.bincount(np.arange(k), weights=table.prob, minlength=k)
+    aliased = np.bincount(table.alias, weights=1.0 - table.prob, minlength=k)
+    return (own + aliased) / k
+
+
+@pytest.mark.parametrize("weights", [
+    [1.0, 1.0, 1.0],
+    [5.0, 3.0, 1.0, 1.0],
+    [0.0, 0.0, 1.0],
+    [7.0],
+    [1000.0] + [1.0] * 10000,
+    np.arange(1, 100001, dtype=np.float64) ** -1.1,
+    np.random.default_rng(3).pareto(0.5, 20000),
+])
+def test_alias_table_reproduces_the_weights_exactly(weights):
+    weights = np.asarray(weights, dtype=np.float64)
+    table = AliasTable(weights)
+    np.testing.assert_allclose(outcome_probabilities(table), weights / weights.sum(), atol=1e-12)
+    assert ((table.prob >= 0) & (table.prob <= 1)).all()
+
+
+@pytest.mark.parametrize("weights", [[], [0.0, 0.0], [1.0, -1.0], [[1.0, 2.0]]])
+def test_alias_table_refuses_bad_weights(weights):
+    with pytest.raises(ValueError):
+        AliasTable(weights)
+
+
+def test_alias_table_draws_follow_the_weights():
+    table = AliasTable([5.0, 3.0, 1.0, 1.0])
+    units = np.random.default_rng(0).random((2, 200000))
+    counts = np.bincount(table.pick(units[0], units[1]), minlength=4) / 200000
+    np.testing.assert_allclose(counts, [0.5, 0.3, 0.1, 0.1], atol=0.01)
+
+
+def test_zipf_positions_rank_candidates_and_are_seeded():
+    positions = Zipf(1.2).positions(CounterEngine((1, "orders")), 1000, 50000)
+    assert positions.min() >= 0 and positions.max() < 1000
+    counts = np.bincount(positions, minlength=1000)
+    assert counts[0] > counts[1] > counts[10] > counts[500]
+    np.testing.assert_array_equal(positions, Zipf(1.2).positions(CounterEngine((1, "orders")), 1000, 50000))
+
+
+def test_power_law_stays_within_the_candidates():
+    positions = PowerLaw(1.5).positions(ColumnEngine(seed=1), 10, 10000)
+    assert positions.min() == 0 and positions.max() <= 9
+    assert np.bincount(positions)[0] > 0.5 * 10000
+
+
+def test_weights_by_name_follow_the_category_order():
+    weights = parse_spec("weights:Web=3,Mobile=1").over(["Mobile", "Web"])
+    assert weights.weights == [1.0, 3.0]
+    with pytest.raises(ValueError, match="must name each"):
+        parse_spec("weights:Web=3").over(["Mobile", "Web"])
+    with pytest.raises(ValueError, match="2 weights for 3"):
+        parse_spec("weights:1,2").over(["a", "b", "c"])
+
+
+def test_weights_must_match_the_parent_keys():
+    with pytest.raises(ValueError, match="3 weights for 5"):
+        Weights([1, 2, 3]).positions(ColumnEngine(seed=1), 5, 10)
+
+
+def test_parse_skew_round_trips_through_format_skew():
+    skew = parse_skew(["orders.customer_id=zipf:1.1", "orders.status=weights:Delivered=8,Cancelled=1",
+                       "order_items.product_id=powerlaw:0.8"])
+    assert {column: type(dist) for column, dist in skew.items()} == {
+        "orders.customer_id": Zipf, "orders.status": Weights, "order_items.product_id": PowerLaw}
+    text = format_skew(skew)
+    assert text == ("order_items.product_id=powerlaw:0.8;orders.customer_id=zipf:1.1;"
+                    "orders.status=weights:Delivered=8,Cancelled=1")
+    assert format_skew(parse_skew(text)) == text
+    assert parse_skew("") == {} and format_skew(None) == ""
+
+
+@pytest.mark.parametrize("item", ["orders.customer_id", "customer_id=zipf:1", "orders.customer_id=zipf:0",
+                                  "orders.customer_id=zipf:x", "orders.customer_id=normal:1",
+                                  "orders.customer_id=powerlaw:-1"])
+def test_parse_skew_refuses_bad_items(item):
+    with pytest.raises(ValueError, match="bad skew"):
+        parse_skew([item])
+
+
+def test_skew_is_abstract():
+    with pytest.raises(TypeError):
+        Skew()
+
+
+def test_check_skew_validates_columns_against_the_domain():
+    from data_generation import SchemaManager
+    check = SchemaManager.check_skew
+    check("ecommerce", parse_skew("orders.customer_id=zipf:1;orders.payment_method=weights:1,1,1,1"), 100)
+    for item, message in [("orders.nope=zipf:1", "no such"), ("orders.total_amount=zipf:1", "neither"),
+                          ("order_items.order_id=zipf:1", "cannot be skewed"),
+                          ("orders.customer_id=weights:a=1", "by name"),
+                          ("orders.customer_id=weights:1,2,3", "3 weights for 100 rows of customers")]:
+        with pytest.raises(ValueError, match=message):
+            check("ecommerce", parse_skew([item]), 100)
+    # Appends and streams grow the parents, so weights per parent key cannot be checked up front
+    with pytest.raises(ValueError, match="not known up front"):
+        check("ecommerce", parse_skew(["orders.customer_id=weights:" + ",".join(["1"] * 100)]))
@@ -0,0 +1,52 @@
+import io
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import pytest
+
+from infile import load_data_sql, tsv_field, write_tsv
+
+
+@pytest.mark.parametrize("value, field", [
+    (None, "\\N"),
+    ("None", "None"),
+    ("", ""),
+    ("plain text", "plain text"),
+    ("tab\there", "tab\\there"),
+    ("two\nlines", "two\\nlines"),
+    ("carriage\rreturn", "carriage\\rreturn"),
+    ("back\\slash", "back\\\\slash"),
+    ("nul\0byte", "nul\\0byte"),
+    ("\\N", "\\\\N"),
+    ("ünïcødé", "ünïcødé"),
+    (True, "1"),
+    (False, "0"),
+    (0, "0"),
+    (-42, "-42"),
+    (12.5, "12.5"),
+    (0.1, "0.1"),
+    (1e-07, "0.0000001"),
+    (-2.5e-10, "-0.00000000025"),
+    (3e20, "300000000000000000000"),
+    (1.2345e+21, "1234500000000000000000"),
+    (Decimal("19.90"), "19.90"),
+    (datetime(2024, 2, 29, 13, 5, 9), "2024-02-29 13:05:09"),
+    (datetime(2024, 2, 29, 13, 5, 9, 250000), "2024-02-29 13:05:09.250000"),
+    (date(2024, 2, 29), "2024-02-29"),
+    (time(7, 30), "07:30:00"),
+])
+def test_tsv_field(value, field):
+    assert tsv_field(value) == field
+
+
+def test_write_tsv_keeps_one_line_per_row():
+    fh = io.StringIO()
+    write_tsv(fh, [(1, "a\tb", None, True), (2, "line\nbreak", 1.5, datetime(2024, 1, 2, 3, 4, 5))])
+    assert fh.getvalue() == "1\ta\\tb\t\\N\t1\n2\tline\\nbreak\t1.5\t2024-01-02 03:04:05\n"
+    assert [len(line.split("\t")) for line in fh.getvalue().splitlines()] == [4, 4]
+
+
+def test_load_data_sql_escapes_the_path():
+    sql = load_data_sql("/tmp/it's.tsv", "orders", "order_id, status")
+    assert "INFILE '/tmp/it\\'s.tsv' INTO TABLE orders" in sql
+    assert sql.endswith("(order_id, status)")
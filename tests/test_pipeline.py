@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from pipeline import InsertPipeline
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_writes_every_statement_in_order():
+    written = []
+    pipeline = InsertPipeline(lambda slot, rows: written.append((slot, rows)), writers=1, depth=2)
+    for i in range(20):
+        pipeline.put([i])
+    pipeline.close()
+    assert written == [(0, [i]) for i in range(20)]
+    assert pipeline.summary()["queued"] == 20
+    pipeline.close()  # closing twice is a no-op
+
+
+def test_writers_share_the_queue():
+    written, lock = [], threading.Lock()
+
+    def write(slot, rows):
+        with lock:
+            written.append(rows[0])
+        time.sleep(0.001)
+    pipeline = InsertPipeline(write, writers=3, depth=4)
+    for i in range(30):
+        pipeline.put([i])
+    pipeline.close()
+    assert sorted(written) == list(range(30))
+
+
+def test_close_reraises_the_writer_error():
+    class Lost(Exception):
+        pass
+    written = []
+
+    def write(slot, rows):
+        if rows == [3]:
+            raise Lost("connection lost")
+        written.append(rows)
+    pipeline = InsertPipeline(write, writers=1, depth=2)
+    # Once the writer has failed, a later put raises its error instead of queueing more rows
+    with pytest.raises(Lost):
+        for i in range(200):
+            pipeline.put([i])
+            time.sleep(0.001)
+    # and close() still raises it, after the writer has drained the queue
+    with pytest.raises(Lost, match="connection lost"):
+        pipeline.close()
+    assert written == [[0], [1], [2]]
+
+
+def test_close_raises_an_error_from_the_last_statement():
+    pipeline = InsertPipeline(lambda slot, rows: 1 / 0, writers=2, depth=2)
+    pipeline.put([1])
+    with pytest.raises(ZeroDivisionError):
+        pipeline.close()
+
+
+def test_producer_blocks_while_the_queue_is_full():
+    release, taken = threading.Event(), []
+
+    def write(slot, rows):
+        taken.append(rows)
+        release.wait()
+    depth = 3
+    pipeline = InsertPipeline(write, writers=1, depth=depth)
+    producer = threading.Thread(target=lambda: [pipeline.put([i]) for i in range(20)])
+    producer.start()
+    # The writer holds one statement and the queue the next `depth`; the producer waits on the one after
+    wait_for(lambda: pipeline.queue.qsize() == depth)
+    time.sleep(0.05)
+    assert producer.is_alive()
+    assert len(taken) == 1 and pipeline.puts == depth + 2
+    assert pipeline.depth_max <= depth
+
+    release.set()
+    producer.join(5)
+    pipeline.close()
+    assert taken == [[i] for i in range(20)]
+    summary = pipeline.summary()
+    assert summary["queue_max"] <= depth
+    assert summary["producer_wait"] >= 0.05
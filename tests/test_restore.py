@@ -0,0 +1,103 @@
+import sys
+from decimal import Decimal
+
+import pytest
+from mysql.connector import Error
+
+import data_generation
+from cache import DatasetCache
+from checkpoints import JobManifest
+from data_generation import DOMAINS, DataGenerator, cached_dataset
+from fakedb import FakeDatabase
+
+DOMAIN, ROWS, SEED = "ecommerce", 300, 5
+
+
+@pytest.fixture(autouse=True)
+def commit_every_statement(monkeypatch):
+    monkeypatch.setitem(data_generation.DATA_GENERATION_CONFIG, "commit_seconds", 0)
+
+
+@pytest.fixture
+def entry(tmp_path):
+    directory, _ = cached_dataset(DatasetCache(str(tmp_path / "cache")), DOMAIN, ROWS, SEED)
+    return directory
+
+
+def restored(directory, fail_after=None):
+    db = FakeDatabase()
+    db.fail_after = fail_after
+    gen = DataGenerator(db.connect(), ROWS, seed=SEED)
+    try:
+        gen.restore(DOMAIN, directory)
+    except Error:
+        pass
+    return db
+
+
+def tables(db):
+    """Every table's rows, with DECIMAL columns compared by value as MySQL stores them"""
+    return {table.name: [tuple(round(float(v), 6) if isinstance(v, (Decimal, float)) else v for v in row)
+                         for row in db.rows(table.name)]
+            for table in DOMAINS[DOMAIN]}
+
+
+def test_restore_records_a_finished_job(entry):
+    db = restored(entry)
+    assert db.job[1] == SEED and db.job[-1] == "done"
+    assert all(rows for rows in tables(db).values())
+    assert DataGenerator(db.connect(), ROWS, seed=SEED).holds(DOMAIN, entry)
+
+
+@pytest.mark.parametrize("fail_after", [1, 3, 5])
+def test_interrupted_restore_is_finished_by_resume(entry, fail_after):
+    expected = tables(restored(entry))
+    db = restored(entry, fail_after)
+    assert db.job[-1] == "running" and db.shards
+    assert tables(db) != expected
+
+    db.fail_after = None
+    job = JobManifest(db.connect()).job()
+    gen = DataGenerator(db.connect(), job["row_limit"], pool_size=job["pool_size"], seed=job["seed"],
+                        now=job["anchor"], resumable=True)
+    gen.generate(DOMAIN)
+    gen.manifest.finish()
+    assert db.job[-1] == "done"
+    assert tables(db) == expected
+
+
+def run_main(monkeypatch, db, cache_dir, *options):
+    monkeypatch.setattr(data_generation.mysql.connector, "connect", lambda **config: db.connect())
+    monkeypatch.setattr(sys, "argv", ["data_generation.py", "--domain", DOMAIN, "--rows", str(ROWS),
+                                      "--seed", str(SEED), "--cache-dir", cache_dir, *options])
+    data_generation.main()
+
+
+def test_rerun_refuses_a_database_that_has_rows(monkeypatch, tmp_path, capsys):
+    db, cache_dir = FakeDatabase(), str(tmp_path / "cache")
+    run_main(monkeypatch, db, cache_dir)
+    loaded = tables(db)
+    with pytest.raises(SystemExit) as exit:
+        run_main(monkeypatch, db, cache_dir)
+    assert exit.value.code == 1
+    assert "--append" in capsys.readouterr().out
+    assert tables(db) == loaded
+
+
+def test_rerun_after_a_crash_points_to_resume(monkeypatch, tmp_path, capsys):
+    db, cache_dir = FakeDatabase(), str(tmp_path / "cache")
+    db.fail_after = 3
+    run_main(monkeypatch, db, cache_dir)
+    db.fail_after = None
+    with pytest.raises(SystemExit):
+        run_main(monkeypatch, db, cache_dir)
+    assert "--resume" in capsys.readouterr().out
+
+    run_main(monkeypatch, db, cache_dir, "--resume")
+    assert db.job[-1] == "done"
+    assert tables(db) == tables(restored(DatasetCache(cache_dir).path(db_key(cache_dir))))
+
+
+def db_key(cache_dir):
+    [entry] = DatasetCache(cache_dir).entries()
+    return entry["key"]
@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+from scheduler import TableScheduler
+
+DEPENDENCIES = {"customers": set(), "products": set(), "orders": {"customers"}, "order_items": {"orders", "products"}}
+
+
+def steps(log, scheduler=None, hold=None):
+    """Steps that log their start and end; with `scheduler` each one announces its keys right away,
+    and `hold` keeps a table running until the event is set"""
+    def step(table):
+        def run():
+            log.append(("start", table))
+            if scheduler is not None:
+                scheduler.keyed(table)
+            if hold is not None and table in hold:
+                assert hold[table].wait(5)
+            time.sleep(0.01)
+            log.append(("end", table))
+        return run
+    return {table: step(table) for table in DEPENDENCIES}
+
+
+def test_children_wait_for_their_parents():
+    log = []
+    scheduler = TableScheduler(DEPENDENCIES, concurrency=4)
+    timeline = scheduler.run(steps(log))
+    assert log.index(("end", "customers")) < log.index(("start", "orders"))
+    assert log.index(("end", "orders")) < log.index(("start", "order_items"))
+    assert log.index(("end", "products")) < log.index(("start", "order_items"))
+    assert timeline["orders"]["ready"] == timeline["customers"]["end"]
+    assert scheduler.critical_path()[-1] == "order_items"
+
+
+def test_early_children_start_once_their_parents_are_keyed():
+    log, release = [], threading.Event()
+    scheduler = TableScheduler(DEPENDENCIES, concurrency=4, early=True)
+    # customers only finishes once orders has started, which needs early start
+    started = threading.Thread(target=lambda: (_wait_for(log, ("start", "order_items")), release.set()))
+    started.start()
+    timeline = scheduler.run(steps(log, scheduler, hold={"customers": release}))
+    started.join()
+    assert log.index(("start", "order_items")) < log.index(("end", "customers"))
+    assert timeline["orders"]["ready"] <= timeline["customers"]["end"]
+
+
+def test_early_without_keyed_waits_for_parents():
+    log = []
+    TableScheduler(DEPENDENCIES, concurrency=4, early=True).run(steps(log))
+    assert log.index(("end", "orders")) < log.index(("start", "order_items"))
+
+
+def test_one_at_a_time_follows_declaration_order():
+    log = []
+    TableScheduler(DEPENDENCIES).run(steps(log))
+    assert [table for event, table in log if event == "start"] == ["customers", "products", "orders", "order_items"]
+
+
+def test_failures_and_cycles_are_raised():
+    def fail():
+        raise RuntimeError("boom")
+    with pytest.raises(RuntimeError, match="boom"):
+        TableScheduler({"a": set()}).run({"a": fail})
+    with pytest.raises(ValueError, match="cycle"):
+        TableScheduler({"a": {"b"}, "b": {"a"}}).run({"a": lambda: None, "b": lambda: None})
+
+
+def _wait_for(log, event, timeout=5):
+    deadline = time.monotonic() + timeout
+    while event not in log and time.monotonic() < deadline:
+        time.sleep(0.001)
@@ -0,0 +1,31 @@
+import json
+import os
+import re
+
+import pytest
+
+from data_generation import DOMAINS, SchemaManager
+
+# The DDL of every domain as it was written out by hand before the table specs, one list of lines per
+# CREATE TABLE with whitespace collapsed
+with open(os.path.join(os.path.dirname(__file__), "fixtures", "schemas.json")) as fh:
+    BASELINE = json.load(fh)
+
+
+def lines(ddl):
+    return [re.sub(r"\s+", " ", line.strip()) for line in ddl.strip().splitlines() if line.strip()]
+
+
+def test_every_domain_has_a_baseline():
+    assert SchemaManager.get_available_domains() == list(BASELINE)
+
+
+@pytest.mark.parametrize("domain", list(BASELINE))
+def test_generated_ddl_matches_the_baseline(domain):
+    assert [lines(ddl) for ddl in SchemaManager.get_schema(domain)] == BASELINE[domain]
+
+
+@pytest.mark.parametrize("domain", list(BASELINE))
+def test_tables_load_in_ddl_order(domain):
+    names = [re.search(r"CREATE TABLE IF NOT EXISTS (\w+)", ddl[0]).group(1) for ddl in BASELINE[domain]]
+    assert [table.name for table in DOMAINS[domain]] == names
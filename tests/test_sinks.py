@@ -0,0 +1,140 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import os
+import sqlite3
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from data_generation import DOMAINS, DataGenerator, SchemaManager
+from sinks import ParquetSink, SQLiteSink, arrow_column, ddl_types, sqlite_schema
+
+SCHEMA = ["""
+CREATE TABLE IF NOT EXISTS payments (
+    payment_id INT AUTO_INCREMENT PRIMARY KEY,
+    account_id BIGINT,
+    amount DECIMAL(12, 2),
+    rate DECIMAL(6,4),
+    paid_on DATE,
+    created_at DATETIME,
+    cutoff TIME,
+    refunded BOOLEAN,
+    currency VARCHAR(3),
+    note TEXT,
+    UNIQUE KEY (account_id, paid_on),
+    FOREIGN KEY (account_id) REFERENCES accounts(account_id)
+)
+"""]
+
+
+def test_ddl_types_map_columns_to_arrow():
+    assert ddl_types(SCHEMA) == {"payments": {
+        "payment_id": pa.int32(),
+        "account_id": pa.int64(),
+        "amount": pa.decimal128(12, 2),
+        "rate": pa.decimal128(6, 4),
+        "paid_on": pa.date32(),
+        "created_at": pa.timestamp("s"),
+        "cutoff": pa.time32("s"),
+        "refunded": pa.bool_(),
+        "currency": pa.string(),
+        "note": pa.string(),
+    }}
+
+
+@pytest.mark.parametrize("values, arrow_t, expected", [
+    ([12.3456, 7.0, None, 0.1 + 0.2], pa.decimal128(12, 2),
+     [Decimal("12.35"), Decimal("7.00"), None, Decimal("0.30")]),
+    ([0.123456], pa.decimal128(6, 4), [Decimal("0.1235")]),
+    ([Decimal("3.50"), None], pa.decimal128(12, 2), [Decimal("3.50"), None]),
+    ([timedelta(hours=7, minutes=30), "18:00:05", time(1, 2, 3)], pa.time32("s"),
+     [time(7, 30), time(18, 0, 5), time(1, 2, 3)]),
+])
+def test_arrow_column(values, arrow_t, expected):
+    column = arrow_column(values, arrow_t)
+    assert column.type == arrow_t
+    assert column.to_pylist() == expected
+
+
+def test_parquet_sink_round_trip(tmp_path):
+    sink = ParquetSink(str(tmp_path), SCHEMA, row_group_rows=2)
+    sink.prepare("payments")
+    columns = ["payment_id", "account_id", "amount", "rate", "paid_on", "created_at", "cutoff", "refunded",
+               "currency", "note"]
+    rows = [(i, 10 ** 10 + i, 100 / 3 * i, 1 / (i + 2), date(2024, 1, i + 1), datetime(2024, 1, i + 1, 12, 0, i),
+             timedelta(seconds=60 * i), i % 2 == 0, "USD", None if i == 3 else f"note {i}") for i in range(1, 6)]
+    assert sink.write("payments", 0, columns, [rows[:3], rows[3:]]) == 5
+
+    path = tmp_path / "payments" / "part-00000.parquet"
+    table = pq.read_table(str(path))
+    # Parquet has no second unit, so DATETIME and TIME columns read back in milliseconds
+    assert table.schema == pa.schema([("payment_id", pa.int32()), ("account_id", pa.int64()),
+                                      ("amount", pa.decimal128(12, 2)), ("rate", pa.decimal128(6, 4)),
+                                      ("paid_on", pa.date32()), ("created_at", pa.timestamp("ms")),
+                                      ("cutoff", pa.time32("ms")), ("refunded", pa.bool_()),
+                                      ("currency", pa.string()), ("note", pa.string())])
+    # A row group is flushed once a batch brings the buffer to row_group_rows
+    assert pq.ParquetFile(str(path)).metadata.num_row_groups == 2
+    read = table.to_pylist()
+    assert [row["amount"] for row in read] == [Decimal(str(round(100 / 3 * i, 2))) for i in range(1, 6)]
+    assert [row["rate"] for row in read] == [Decimal("0.3333"), Decimal("0.2500"), Decimal("0.2000"),
+                                            Decimal("0.1667"), Decimal("0.1429")]
+    assert read[0] == {"payment_id": 1, "account_id": 10 ** 10 + 1, "amount": Decimal("33.33"),
+                       "rate": Decimal("0.3333"), "paid_on": date(2024, 1, 2),
+                       "created_at": datetime(2024, 1, 2, 12, 0, 1), "cutoff": time(0, 1), "refunded": False,
+                       "currency": "USD", "note": "note 1"}
+    assert read[2]["note"] is None
+
+
+def test_parquet_sink_prepare_clears_previous_parts(tmp_path):
+    sink = ParquetSink(str(tmp_path), SCHEMA)
+    sink.prepare("payments")
+    sink.write("payments", 3, ["payment_id"], [[(1,)]])
+    sink.prepare("payments")
+    assert list((tmp_path / "payments").iterdir()) == []
+    assert sink.write("payments", 0, ["payment_id"], []) == 0
+    assert pq.read_table(str(tmp_path / "payments")).num_rows == 0
+
+
+def test_sqlite_schema_moves_keys_to_indexes():
+    table, indexes = sqlite_schema(SchemaManager.get_schema("ecommerce")[4])
+    assert table.startswith("CREATE TABLE IF NOT EXISTS order_items (\n    item_id INTEGER PRIMARY KEY,\n")
+    assert "unit_price NUMERIC," in table and "return_status TEXT DEFAULT 'None'," in table
+    assert "FOREIGN KEY (order_id) REFERENCES orders(order_id)" in table
+    assert indexes == ["CREATE INDEX IF NOT EXISTS ix_order_items_order_id ON order_items (order_id)",
+                       "CREATE INDEX IF NOT EXISTS ix_order_items_product_id ON order_items (product_id)"]
+    table, indexes = sqlite_schema(SchemaManager.get_schema("ecommerce")[0])
+    assert "is_active INTEGER DEFAULT 1," in table and indexes == []
+
+
+def test_sqlite_sink_loads_a_domain(tmp_path):
+    path = str(tmp_path / "ecommerce.db")
+    sink = SQLiteSink(path, SchemaManager.get_schema("ecommerce"), chunk_rows=100)
+    gen = DataGenerator(None, 400, seed=3, sink=sink)
+    gen.shard_rows = 150
+    gen.generate("ecommerce")
+
+    # Indexes are only built once the load is done
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL").fetchall() == []
+    conn.close()
+    sink.finish()
+    assert not os.path.exists(path + "-wal")
+
+    conn = sqlite3.connect(path)
+    try:
+        tables = {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert {table.name for table in DOMAINS["ecommerce"]} <= tables
+        indexes = {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")}
+        assert indexes == {"ux_products_sku", "ux_customers_email", "ix_products_category_id", "ix_orders_customer_id",
+                           "ix_order_items_order_id", "ix_order_items_product_id"}
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+        for table in DOMAINS["ecommerce"]:
+            count, low, high = conn.execute(f"SELECT COUNT(*), MIN({table.pk}), MAX({table.pk}) FROM {table.name}").fetchone()
+            assert (count, low, high) == (len(gen.key_ranges[table.name]), 1, len(gen.key_ranges[table.name]))
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+        assert conn.execute("SELECT COUNT(DISTINCT email) FROM customers").fetchone() == (400,)
+    finally:
+        conn.close()
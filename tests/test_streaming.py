@@ -0,0 +1,101 @@
+import pytest
+
+import streaming
+from streaming import RateProfile, TokenBucket, parse_burst, parse_rate
+
+
+class FakeClock:
+    """A clock that only moves when the bucket sleeps or the test says so"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        # Like a real sleep, at least a little time passes
+        self.now += max(seconds, 1e-6)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(streaming.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_parse_rate_and_burst():
+    assert parse_rate("5000") == parse_rate("5000/s") == 5000
+    assert parse_rate("300/m") == 5
+    assert parse_rate("7200/h") == 2
+    assert parse_burst("5x2s/30s") == (5.0, 2.0, 30.0)
+    for text in ["0", "fast", "10/d"]:
+        with pytest.raises(ValueError):
+            parse_rate(text)
+    with pytest.raises(ValueError, match="must fit"):
+        parse_burst("2x40s/30s")
+
+
+def test_profile_ramps_and_bursts():
+    profile = RateProfile(100, ramp=10, burst=(3, 2, 30))
+    assert profile.rate(0) == 0 and profile.rate(5) == 50 and profile.rate(10) == 100
+    assert profile.rate(28.5) == 300 and profile.rate(58) == 300 and profile.rate(31) == 100
+    assert profile.peak == 300
+
+
+def test_bucket_holds_the_rate_and_wakes_about_once_a_tick(clock):
+    bucket = TokenBucket(RateProfile(1000), clock=clock)
+    sent, takes = 0, 0
+    while clock.now < 10:
+        n, waited = bucket.take(10000)
+        sent, takes = sent + n, takes + 1
+        assert waited < 0.02
+    assert abs(sent - 10000) <= 20
+    assert takes <= 10 / bucket.tick + 1
+    assert bucket.missed(sent) <= 20
+
+
+def test_bucket_follows_a_ramp(clock):
+    bucket = TokenBucket(RateProfile(1000, ramp=4), clock=clock)
+    sent = 0
+    while clock.now < 4:
+        sent += bucket.take(10000)[0]
+    # Half of 1000/s over the ramp
+    assert abs(sent - 2000) <= 20
+
+
+def test_a_slow_sink_is_not_made_up_in_one_burst_but_counted_as_missed(clock):
+    bucket = TokenBucket(RateProfile(1000), backlog=1.0, clock=clock)
+    sent = bucket.take(10000)[0]
+    # The sink stalls for 5 seconds: only a second's worth is still handed out
+    clock.now += 5
+    n, waited = bucket.take(100000)
+    sent += n
+    assert n == 1000 and waited == pytest.approx(1.0)
+    assert bucket.missed(sent) == pytest.approx(4000, abs=20)
+
+
+def test_take_respects_the_limit(clock):
+    bucket = TokenBucket(RateProfile(1000), clock=clock)
+    clock.now += 0.5
+    assert bucket.take(100)[0] == 100
+    assert bucket.take(10000)[0] == 400
+
+
+def test_run_stream_continues_the_seeded_dataset():
+    import io
+    import json
+
+    from data_generation import DataGenerator
+
+    out = io.StringIO()
+    gen = DataGenerator(None, 50, seed=7)
+    source = streaming.EventSource(gen, "fintech")
+    summary = streaming.run_stream(source, streaming.NDJSONSink(out), RateProfile(20000), limit=500, report_every=0)
+    events = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert summary["sent"] == len(events) == 500 and summary["failed"] == 0
+    keys = [event["txn_id"] for event in events]
+    assert keys == list(range(source.spans["transactions"].stop, source.spans["transactions"].stop + 500))
+    assert all(event["op"] == "insert" and 1 <= event["account_id"] <= len(source.spans["accounts"])
+               for event in events)
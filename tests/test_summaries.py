@@ -0,0 +1,81 @@
+import random
+import threading
+from collections import Counter
+
+import pytest
+
+from summaries import RunCancelled, RunSummary, TableSummary
+
+
+def batches(rows, size):
+    for start in range(0, rows, size):
+        yield [(i, f"name{i}", "Gold" if i % 4 == 0 else "Silver", i % 2 == 0, i * 1.5)
+               for i in range(start, min(start + size, rows))]
+
+
+COLUMNS = ["id", "name", "tier", "active", "amount"]
+
+
+def test_observe_passes_batches_through_and_counts_rows():
+    summary = RunSummary("ecommerce", "SQLite file")
+    passed = list(summary.observe("customers", COLUMNS, batches(1050, 100)))
+    assert passed == list(batches(1050, 100))
+    assert summary.row_counts() == [{"table": "customers", "rows": 1050}]
+    assert summary.table("customers", COLUMNS) is summary.tables["customers"]
+
+
+def test_stats_report_extremes_and_only_categorical_columns():
+    summary = RunSummary("ecommerce", "SQLite file")
+    list(summary.observe("customers", COLUMNS, batches(1000, 64)))
+    stats = {entry["column"]: entry for entry in summary.tables["customers"].stats()}
+    assert (stats["id"]["min"], stats["id"]["max"]) == ("0", "999")
+    assert stats["amount"]["max"] == "1498.5"
+    assert stats["tier"]["distinct"] == "2" and stats["tier"]["top values"] == "Silver 75%, Gold 25%"
+    assert stats["active"]["distinct"] == "2"
+    # Too many distinct values, or none repeated: not a category
+    assert stats["name"]["distinct"] == "" and stats["id"]["distinct"] == ""
+
+
+def test_extremes_skip_missing_values():
+    table = TableSummary(["a"])
+    table.observe([(None,), (3,), (1,)])
+    assert (table.minimum[0], table.maximum[0]) == (1, 3)
+
+
+def test_preview_is_a_reservoir_of_distinct_rows_in_key_order():
+    table = TableSummary(COLUMNS, sample_rows=10, rng=random.Random(1))
+    for batch in batches(5000, 333):
+        table.observe(batch)
+    columns, rows = table.preview()
+    assert columns == COLUMNS and len(rows) == 10
+    keys = [row[0] for row in rows]
+    assert keys == sorted(set(keys))
+
+
+def test_reservoir_is_uniform():
+    # Every row should end up in the sample equally often: 10 of 100 rows, 2000 times
+    hits = Counter()
+    rng = random.Random(7)
+    for _ in range(2000):
+        table = TableSummary(["id"], sample_rows=10, rng=rng)
+        for start in range(0, 100, 7):
+            table.observe([(i,) for i in range(start, min(start + 7, 100))])
+        hits.update(row[0] for row in table.sample)
+    assert min(hits.values()) > 120 and max(hits.values()) < 280
+
+
+def test_small_tables_are_sampled_whole():
+    table = TableSummary(["id"], sample_rows=10)
+    table.observe([(2,), (1,)])
+    assert table.preview()[1] == [(1,), (2,)]
+
+
+def test_cancelling_stops_at_the_next_batch():
+    cancelled = threading.Event()
+    summary = RunSummary("hr", "MySQL", cancelled=cancelled)
+    stream = summary.observe("employees", COLUMNS, batches(1000, 100))
+    next(stream)
+    cancelled.set()
+    with pytest.raises(RunCancelled):
+        next(stream)
+    assert summary.tables["employees"].rows == 100
@@ -0,0 +1,54 @@
+import re
+
+import numpy as np
+import pytest
+
+from uniques import UniqueValues
+
+
+def test_permute_is_one_to_one_over_the_whole_domain():
+    values = UniqueValues(1).permute("t.c", 0, 1000, 1000)
+    assert sorted(values.tolist()) == list(range(1000))
+
+
+def test_permute_depends_on_row_index_only():
+    uniques = UniqueValues(3)
+    whole = uniques.permute("t.c", 0, 500, 10 ** 6)
+    np.testing.assert_array_equal(UniqueValues(3).permute("t.c", 200, 100, 10 ** 6), whole[200:300])
+
+
+def test_keys_and_columns_give_different_permutations():
+    a = UniqueValues(1).permute("t.c", 0, 100, 10 ** 6)
+    assert not np.array_equal(a, UniqueValues(2).permute("t.c", 0, 100, 10 ** 6))
+    assert not np.array_equal(a, UniqueValues(1).permute("t.d", 0, 100, 10 ** 6))
+
+
+def test_shards_never_collide():
+    uniques = UniqueValues(5)
+    shards = [uniques.code("accounts.account_number", start, 2000, "AC", 6) for start in range(0, 10000, 2000)]
+    values = [v for shard in shards for v in shard]
+    assert len(set(values)) == len(values) == 10000
+
+
+def test_exhausted_format_is_refused():
+    with pytest.raises(ValueError, match="exceed"):
+        UniqueValues(1).permute("t.c", 90, 20, 100)
+
+
+def test_formats():
+    uniques = UniqueValues(9)
+    assert all(re.fullmatch(r"\d{3}-\d{2}-\d{4}", v) for v in uniques.ssn("c.ssn", 0, 100))
+    assert all(re.fullmatch(r"[0-9A-F]{8}", v) for v in uniques.hex_code("t.h", 0, 100))
+    for iban in uniques.iban("a.iban", 0, 100):
+        # ISO 13616: the rearranged number is 1 mod 97
+        rearranged = iban[4:] + iban[:4]
+        assert int("".join(str(int(ch, 36)) for ch in rearranged)) % 97 == 1
+    vins = uniques.vin("v.vin", 0, 100)
+    assert all(len(v) == 17 and not set(v) & set("IOQ") for v in vins)
+    assert len(set(uniques.uuid4("t.u", 0, 1000))) == 1000
+
+
+def test_emails_are_unique_for_repeated_names():
+    emails = UniqueValues(4).email("customers.email", 0, ["Ann"] * 500, ["O'Neil"] * 500)
+    assert len(set(emails)) == 500
+    assert all(e.startswith("aoneil.") for e in emails)
@@ -0,0 +1,128 @@
+import re
+import uuid
+import zlib
+import numpy as np
+
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+# VIN alphabet (no I, O, Q), model-year codes, transliteration values and position weights
+_VIN_CHARS = "0123456789ABCDEFGHJKLMNPRSTUVWXYZ"
+_VIN_YEARS = "ABCDEFGHJKLMNPRSTVWXY123456789"
+_VIN_VALUES = {**{str(d): d for d in range(10)},
+               **dict(zip("ABCDEFGHJKLMNPRSTUVWXYZ", [1, 2, 3, 4, 5, 6, 7, 8, 1, 2, 3, 4, 5, 7, 9, 2, 3, 4, 5, 6, 7, 8, 9]))}
+_VIN_WEIGHTS = [8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2]
+_VIN_WMI = ['1FA', '1G1', '1HG', '2T1', '3VW', '5YJ', 'JHM', 'JTD', 'KMH', 'WBA', 'WDD', 'YV1']
+
+_IBAN_BANKS = ['NWBK', 'BARC', 'LOYD', 'HBUK', 'MIDL', 'NAIA']
+_EMAIL_DOMAINS = ['example.com', 'example.org', 'example.net']
+
+# Valid SSN parts: area 001-899 except 666, group 01-99, serial 0001-9999
+_SSN_AREAS = np.array([a for a in range(1, 900) if a != 666])
+_SSN_DOMAIN = len(_SSN_AREAS) * 99 * 9999
+
+_NON_ALPHA = re.compile(r"[^a-z]")
+
+
+def _base36(value):
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    text = ""
+    while True:
+        value, r = divmod(value, 36)
+        text = digits[r] + text
+        if not value:
+            return text
+
+
+def _iban_check(country, bban):
+    """ISO 13616 check digits: 98 - (BBAN + country + '00') mod 97, letters as 10..35"""
+    number = int("".join(str(int(ch, 36)) for ch in bban + country + "00"))
+    return f"{98 - number % 97:02d}"
+
+
+def _vin_check(vin):
+    total = sum(_VIN_VALUES[ch] * w for ch, w in zip(vin, _VIN_WEIGHTS))
+    return "X" if total % 11 == 10 else str(total % 11)
+
+
+class UniqueValues:
+    """Collision-free values for UNIQUE columns, computed from the row index.
+
+    Each column passes its row indexes through a keyed permutation of the
+    format's value space (a Feistel network with cycle walking), so values look
+    random but are distinct by construction. Nothing is remembered between
+    calls, and shards sharing the key never collide because they cover
+    disjoint row indexes. ``column`` names the stream, e.g. ``"customers.email"``.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self._round_keys = {}
+
+    def permute(self, column, start, n, domain):
+        """Row indexes start..start+n mapped one-to-one into [0, domain)"""
+        if start + n > domain:
+            raise ValueError(f"{column}: {start + n} rows exceed the {domain} unique values of its format")
+        if column not in self._round_keys:
+            seq = np.random.SeedSequence(self.key, spawn_key=(zlib.crc32(column.encode()),))
+            self._round_keys[column] = seq.generate_state(4, np.uint64)
+        bits = max(int(domain - 1).bit_length(), 2)
+        bits += bits % 2
+        half = np.uint64(bits // 2)
+        mask = np.uint64((1 << (bits // 2)) - 1)
+        out = np.arange(start, start + n, dtype=np.uint64)
+        todo = np.ones(n, dtype=bool)
+        while todo.any():
+            left, right = out[todo] >> half, out[todo] & mask
+            for k in self._round_keys[column]:
+                h = (right ^ k) * _MIX1
+                h = (h ^ (h >> np.uint64(31))) * _MIX2
+                left, right = right, left ^ ((h ^ (h >> np.uint64(29))) & mask)
+            out[todo] = (left << half) | right
+            # Cycle walking: re-encrypt values that landed outside the domain
+            todo = out >= np.uint64(domain)
+        return out
+
+    def email(self, column, start, first_names, last_names):
+        suffixes = self.permute(column, start, len(first_names), 36 ** 7).tolist()
+        return [f"{_NON_ALPHA.sub('', f.lower())[:1]}{_NON_ALPHA.sub('', l.lower())[:30]}.{_base36(s)}"
+                f"@{_EMAIL_DOMAINS[s % len(_EMAIL_DOMAINS)]}"
+                for f, l, s in zip(first_names, last_names, suffixes)]
+
+    def ssn(self, column, start, n):
+        values = self.permute(column, start, n, _SSN_DOMAIN).astype(np.int64)
+        area, rest = np.divmod(values, 99 * 9999)
+        group, serial = np.divmod(rest, 9999)
+        return [f"{a:03d}-{g + 1:02d}-{s + 1:04d}" for a, g, s in zip(_SSN_AREAS[area].tolist(), group.tolist(), serial.tolist())]
+
+    def hex_code(self, column, start, n, width=8):
+        return [f"{v:0{width}X}" for v in self.permute(column, start, n, 16 ** width).tolist()]
+
+    def code(self, column, start, n, prefix, digits):
+        return [f"{prefix}{v:0{digits}d}" for v in self.permute(column, start, n, 10 ** digits).tolist()]
+
+    def iban(self, column, start, n, country='GB'):
+        # GB layout: 4-letter bank code, 6-digit sort code, 8-digit account number
+        result = []
+        for v in self.permute(column, start, n, 10 ** 14).tolist():
+            bban = f"{_IBAN_BANKS[v % len(_IBAN_BANKS)]}{v:014d}"
+            result.append(f"{country}{_iban_check(country, bban)}{bban}")
+        return result
+
+    def vin(self, column, start, n):
+        # Model year, plant and a 6-digit serial carry the unique value; the rest is derived from it
+        result = []
+        for v in self.permute(column, start, n, len(_VIN_YEARS) * len(_VIN_CHARS) * 10 ** 6).tolist():
+            rest, serial = divmod(v, 10 ** 6)
+            year, plant = divmod(rest, len(_VIN_CHARS))
+            mixed = v * 2654435761
+            vds = "".join(_VIN_CHARS[(mixed >> (5 * i)) % len(_VIN_CHARS)] for i in range(5))
+            vin = f"{_VIN_WMI[mixed % len(_VIN_WMI)]}{vds}0{_VIN_YEARS[year]}{_VIN_CHARS[plant]}{serial:06d}"
+            result.append(vin[:8] + _vin_check(vin) + vin[9:])
+        return result
+
+    def uuid4(self, column, start, n):
+        # 62 permuted bits in the low half keep it unique; the high half only adds entropy
+        low = self.permute(column, start, n, 1 << 62).tolist()
+        high = self.permute(column + ":high", start, n, 1 << 62).tolist()
+        return [str(uuid.UUID(int=((h << 64) & ~(0xF << 76)) | (4 << 76) | (2 << 62) | l)) for h, l in zip(high, low)]